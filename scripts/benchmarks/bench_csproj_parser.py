@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+"""
+Бенчмарк разбора файлов .csproj в DependencyAnalyzer (repotools.solution).
+
+Генерирует синтетическое решение из N проектов (по умолчанию 2000), каждый
+из которых ссылается на несколько предыдущих и содержит типичные для SDK-проектов
+PropertyGroup и ItemGroup, и сравнивает:
+  - прежний последовательный разбор (`ET.parse` + обход `root.iter()`);
+  - текущий `DependencyAnalyzer.analyze` при пустом кэше (потоковый разбор
+    expat без построения дерева);
+  - повторный `DependencyAnalyzer.analyze` (файлы не менялись, результат из кэша).
+
+ИСПОЛЬЗОВАНИЕ:
+  python scripts/benchmarks/bench_csproj_parser.py [--projects N] [--repeat R]
+"""
+
+import argparse
+import logging
+import random
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Set
+
+from bench_solution_parser import best_time, generate_solution, load_solution_module
+
+
+def write_projects(root: Path, count: int) -> None:
+    """Заполняет сгенерированные .csproj ссылками на другие проекты"""
+    rng = random.Random(42)
+    for i in range(count):
+        name = f"Project{i:05d}"
+        folder = "src" if i % 2 == 0 else "tests"
+        references = rng.sample(range(i), min(i, 5))
+        lines = ['<Project Sdk="Microsoft.NET.Sdk">', "  <PropertyGroup>"]
+        lines.append("    <TargetFramework>net9.0</TargetFramework>")
+        lines.append("    <Nullable>enable</Nullable>")
+        lines.append("  </PropertyGroup>")
+        lines.append("  <ItemGroup>")
+        for j in range(40):
+            lines.append(f'    <Compile Update="Generated/File{j}.cs" DependentUpon="File{j}.tt" />')
+        lines.append("  </ItemGroup>")
+        lines.append("  <ItemGroup>")
+        for reference in references:
+            ref_name = f"Project{reference:05d}"
+            ref_folder = "src" if reference % 2 == 0 else "tests"
+            lines.append(
+                f'    <ProjectReference Include="..\\..\\{ref_folder}\\{ref_name}\\{ref_name}.csproj" />'
+            )
+        lines.append("  </ItemGroup>")
+        lines.append("</Project>")
+        (root / folder / name / f"{name}.csproj").write_text("\n".join(lines), encoding="utf-8")
+
+
+def legacy_parse_dependencies(csproj_path: Path) -> Set[str]:
+    """Прежний алгоритм CsprojParser.parse_dependencies"""
+    root = ET.parse(csproj_path).getroot()
+    namespaces = {"ns": root.tag.split("}")[0].strip("{")} if "}" in root.tag else {}
+    if namespaces:
+        ref_elements = root.findall(".//ns:ProjectReference", namespaces)
+    else:
+        ref_elements = [elem for elem in root.iter() if "ProjectReference" in elem.tag]
+    return {
+        Path(ref.get("Include").replace("\\", "/")).stem
+        for ref in ref_elements
+        if ref.get("Include")
+    }
+
+
+def legacy_analyze(solution) -> Dict[str, List[str]]:
+    """Прежний последовательный DependencyAnalyzer.analyze (с тестовыми проектами)"""
+    dependencies: Dict[str, List[str]] = {}
+    for name, project in solution.projects.items():
+        deps = legacy_parse_dependencies(project.csproj_path)
+        dependencies[name] = [dep for dep in deps if dep in solution.projects]
+    return dependencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark .csproj dependency parsing")
+    parser.add_argument("--projects", type=int, default=2000, help="Number of synthetic projects")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs (best time is reported)")
+    args = parser.parse_args()
+
+    # Как в самом скрипте: без настроенного логирования каждый logging.debug
+    # вызывает basicConfig под глобальной блокировкой модуля
+    logging.basicConfig(level=logging.WARNING)
+    module = load_solution_module()
+    analyzer = module.DependencyAnalyzer
+    cache = module.CsprojParser._cache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        generate_solution(root, args.projects)
+        write_projects(root, args.projects)
+        solution = module.SolutionParser.parse(root / "bench.sln")
+
+        expected = {name: sorted(deps) for name, deps in legacy_analyze(solution).items() if deps}
+        assert analyzer.analyze(solution, include_tests=True) == expected
+
+        def cold() -> None:
+            cache.clear()
+            analyzer.analyze(solution, include_tests=True)
+
+        print(f"Synthetic solution: {args.projects} projects")
+        legacy = best_time(lambda: legacy_analyze(solution), args.repeat)
+        current = best_time(cold, args.repeat)
+        analyzer.analyze(solution, include_tests=True)
+        warm = best_time(lambda: analyzer.analyze(solution, include_tests=True), args.repeat)
+
+        print(f"  legacy sequential ET.parse : {legacy * 1000:8.1f} ms")
+        print(f"  streaming parse, cold cache: {current * 1000:8.1f} ms  (x{legacy / current:.2f})")
+        print(f"  memoized re-analysis       : {warm * 1000:8.1f} ms  (x{legacy / warm:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+"""
+Бенчмарк проверки сценариев Gherkin (repotools.gherkin, dushnila.py).
+
+Генерирует F файлов .feature (по умолчанию 500, по 10 сценариев из 6 шагов
+с блоками текста и таблицами) и B привязок шагов (по умолчанию 500; регулярные
+выражения и выражения Cucumber). Измеряет построчный разбор файлов и сравнивает
+сопоставление шагов с привязками:
+  - наивное: `re.fullmatch` каждой привязки по очереди до первого совпадения;
+  - StepMatcher: одно объединённое регулярное выражение на вид шага.
+
+ИСПОЛЬЗОВАНИЕ:
+  python scripts/benchmarks/bench_feature_steps.py [--features F] [--bindings B] [--repeat K]
+"""
+
+import argparse
+import importlib
+import random
+import re
+import sys
+from pathlib import Path
+
+from bench_solution_parser import best_time
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+
+def load_gherkin_module():
+    """Импортирует repotools.gherkin из каталога scripts/"""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    return importlib.import_module("repotools.gherkin")
+
+
+def generate_bindings(count: int) -> str:
+    lines = []
+    for i in range(count):
+        kind = ("Given", "When", "Then")[i % 3]
+        if i % 2:
+            lines.append(f'    [{kind}(@"шаг {i} со значением (\\d+) и текстом ""(.*)""")]')
+        else:
+            lines.append(f'    [{kind}("шаг {i} с числом {{int}} и словом {{word}}")]')
+    return "\n".join(lines) + "\n"
+
+
+def generate_feature(index: int, bindings: int, rng: random.Random) -> str:
+    lines = ["# language: ru-RU", f"Функциональность: Набор {index}", ""]
+    for scenario in range(10):
+        lines.append(f"    Сценарий: Сценарий {index}-{scenario}")
+        for step in range(6):
+            keyword = ("Дано", "Когда", "Тогда")[step // 2] if step % 2 == 0 else "И"
+            binding = rng.randrange(bindings // 3) * 3 + step // 2
+            if binding % 2:
+                lines.append(f'        {keyword} шаг {binding} со значением {step} и текстом "abc"')
+            else:
+                lines.append(f"        {keyword} шаг {binding} с числом {step} и словом слово")
+            if step == 0:
+                lines += ['            """', "            ВЫБРОС(1);", '            """']
+            elif step == 5:
+                lines += ["            | Результат |", "            | 1 |"]
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Gherkin feature and step checking")
+    parser.add_argument("--features", type=int, default=500, help="Number of .feature files")
+    parser.add_argument("--bindings", type=int, default=500, help="Number of step bindings")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs (best time is reported)")
+    args = parser.parse_args()
+
+    gherkin = load_gherkin_module()
+    rng = random.Random(42)
+    bindings = gherkin.parse_bindings("Steps.cs", generate_bindings(args.bindings))
+    texts = [generate_feature(i, args.bindings, rng).splitlines() for i in range(args.features)]
+
+    documents = [gherkin.parse_feature(f"{i}.feature", lines) for i, lines in enumerate(texts)]
+    steps = [step for document in documents for scenario in document.scenarios for step in scenario.steps]
+    assert not any(document.errors for document in documents)
+
+    naive_patterns = [
+        (binding, re.compile(gherkin.binding_regex(binding.pattern))) for binding in bindings
+    ]
+
+    def naive() -> int:
+        matched = 0
+        for step in steps:
+            for binding, pattern in naive_patterns:
+                if binding.kind in (step.kind, "any") and pattern.fullmatch(step.text):
+                    matched += 1
+                    break
+        return matched
+
+    def combined() -> int:
+        matcher = gherkin.StepMatcher(bindings)
+        return sum(1 for step in steps if matcher.match(step) is not None)
+
+    assert naive() == combined() == len(steps)
+    print(f"Synthetic specs: {args.features} features, {len(steps)} steps, {len(bindings)} bindings")
+
+    parse = best_time(lambda: [gherkin.parse_feature("x.feature", lines) for lines in texts], args.repeat)
+    slow = best_time(naive, 1)
+    fast = best_time(combined, args.repeat)
+    print(f"  line parser              : {parse * 1000:8.1f} ms")
+    print(f"  regex per binding        : {slow * 1000:8.1f} ms")
+    print(f"  combined regex           : {fast * 1000:8.1f} ms  (x{slow / fast:.1f})")
+
+
+if __name__ == "__main__":
+    main()
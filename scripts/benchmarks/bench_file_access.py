@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+"""
+Бенчмарк ограниченного доступа к файлам (repotools.file_access, dushnila.py).
+
+Измеряет:
+  - чтение LICENSE размером S МиБ (по умолчанию 256, разреженный файл во
+    временном каталоге) целиком и file_access.read_bytes с пределом
+    LicenseChecker.MAX_FILE_SIZE: ограниченное чтение останавливается после
+    первого блока сверх предела;
+  - разбор Directory.Build.props этого репозитория ET.fromstring и
+    file_access.parse_xml (expat без DTD) — цена защиты на обычном файле;
+  - отклонение «бомбы» из вложенных сущностей XML.
+
+ИСПОЛЬЗОВАНИЕ:
+  python scripts/benchmarks/bench_file_access.py [--size S] [--repeat K]
+"""
+
+import argparse
+import importlib
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from bench_solution_parser import best_time
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+REPO_DIR = SCRIPTS_DIR.parent
+
+BOMB = (
+    b'<?xml version="1.0"?><!DOCTYPE p ['
+    + b'<!ENTITY e0 "lol">'
+    + b"".join(b'<!ENTITY e%d "%s">' % (i, b"&e%d;" % (i - 1) * 10) for i in range(1, 10))
+    + b"]><Project><PropertyGroup><Bomb>&e9;</Bomb></PropertyGroup></Project>"
+)
+
+
+def load_repotools():
+    """Импортирует repotools.file_access и repotools.structure из каталога scripts/"""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    return importlib.import_module("repotools.file_access"), importlib.import_module("repotools.structure")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark bounded file reads and hardened XML parsing")
+    parser.add_argument("--size", type=int, default=256, help="Size of the oversized LICENSE, MiB")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs (best time is reported)")
+    args = parser.parse_args()
+
+    file_access, structure = load_repotools()
+    limit = structure.LicenseChecker.MAX_FILE_SIZE
+    props = (REPO_DIR / "Directory.Build.props").read_bytes()
+    with tempfile.TemporaryDirectory() as directory:
+        license_path = Path(directory) / "LICENSE"
+        with open(license_path, "wb") as f:
+            f.truncate(args.size * 1024 * 1024)
+
+        def bounded() -> None:
+            try:
+                file_access.read_bytes(license_path, limit)
+            except file_access.FileAccessError:
+                return
+            raise AssertionError("oversized file was read")
+
+        def rejected() -> None:
+            try:
+                file_access.parse_xml(BOMB)
+            except file_access.FileAccessError:
+                return
+            raise AssertionError("entity declarations were accepted")
+
+        assert ET.tostring(file_access.parse_xml(props)) == ET.tostring(ET.fromstring(props))
+        print(f"Oversized LICENSE: {args.size} MiB, limit {limit // 1024} KiB; Directory.Build.props: {len(props)} bytes")
+
+        whole = best_time(license_path.read_bytes, 1)
+        capped = best_time(bounded, args.repeat)
+        stock = best_time(lambda: [ET.fromstring(props) for _ in range(1000)], args.repeat)
+        hardened = best_time(lambda: [file_access.parse_xml(props) for _ in range(1000)], args.repeat)
+        bomb = best_time(rejected, args.repeat)
+        print(f"  read whole LICENSE       : {whole * 1000:8.1f} ms")
+        print(f"  bounded read             : {capped * 1000:8.3f} ms  (x{whole / capped:.0f})")
+        print(f"  ET.fromstring x1000      : {stock * 1000:8.1f} ms")
+        print(f"  parse_xml x1000          : {hardened * 1000:8.1f} ms  (x{hardened / stock:.1f} slower)")
+        print(f"  reject entity bomb       : {bomb * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
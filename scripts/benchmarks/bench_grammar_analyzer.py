@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+"""
+Бенчмарк статического анализа грамматик .g4 (repotools.grammar, dushnila.py).
+
+Генерирует пару грамматик: лексер из T токенов (по умолчанию 2000; ключевые
+слова-литералы, операторы и общие правила ID, INTEGER, STRING) и парсер из
+R правил (по умолчанию 5000; цепочки выражений с прямой левой рекурсией,
+альтернативы и необязательные элементы). Измеряет:
+  - лексемы: один проход tokenize по обоим файлам;
+  - холодный анализ: analyze_grammar и check_vocabularies;
+  - повторную проверку после правки парсера: лексер берётся из GrammarCache;
+  - повторную проверку без правок: обе сводки берутся из кэша по SHA.
+
+ИСПОЛЬЗОВАНИЕ:
+  python scripts/benchmarks/bench_grammar_analyzer.py [--tokens T] [--rules R] [--repeat K]
+"""
+
+import argparse
+import importlib
+import random
+import sys
+from pathlib import Path
+
+from bench_solution_parser import best_time
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+
+def load_grammar_module():
+    """Импортирует repotools.grammar из каталога scripts/"""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    return importlib.import_module("repotools.grammar")
+
+
+def generate_lexer(count: int) -> str:
+    lines = ["lexer grammar BenchLexer;", ""]
+    for i in range(count):
+        lines.append(f"KW{i:05d}: 'КЛЮЧ{i:05d}';  // ключевое слово")
+    lines += [
+        "PLUS: '+';",
+        "STAR: '*';",
+        "LPAREN: '(';",
+        "RPAREN: ')';",
+        "SEMI: ';';",
+        "ID: (LETTER | '_') (LETTER | DIGIT | '_')*;",
+        "INTEGER: DIGIT+;",
+        "STRING: '\"' (~[\"\\\\] | '\\\\' .)* '\"';",
+        "WS: [ \\t\\r\\n]+ -> skip;",
+        "fragment DIGIT: [0-9];",
+        "fragment LETTER: [a-zA-Z\\u0410-\\u044F];",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def generate_parser(rules: int, tokens: int, rng: random.Random) -> str:
+    lines = ["parser grammar BenchParser;", "", "options { tokenVocab=BenchLexer; }", ""]
+    lines.append(f"program: (statement{0:05d} | expr{0:05d})* EOF;")
+    for i in range(rules // 2):
+        following = f"statement{i + 1:05d}" if i + 1 < rules // 2 else "SEMI"
+        keyword = f"KW{rng.randrange(tokens):05d}"
+        lines.append(f"statement{i:05d}: {keyword} expr{i:05d}? {following} | LPAREN statement{i:05d} RPAREN;")
+        nested = f"expr{i + 1:05d}" if i + 1 < rules // 2 else "INTEGER"
+        lines.append(
+            f"expr{i:05d}: expr{i:05d} (PLUS | STAR) expr{i:05d}  # binary{i:05d}\n"
+            f"    | {nested} | ID | STRING  # atom{i:05d}\n    ;"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark .g4 grammar analysis")
+    parser.add_argument("--tokens", type=int, default=2000, help="Number of lexer keyword tokens")
+    parser.add_argument("--rules", type=int, default=5000, help="Number of parser rules")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs (best time is reported)")
+    args = parser.parse_args()
+
+    grammar = load_grammar_module()
+    rng = random.Random(42)
+    lexer = generate_lexer(args.tokens).encode("utf-8")
+    parser_text = generate_parser(args.rules, args.tokens, rng).encode("utf-8")
+
+    def cold() -> None:
+        summaries = {
+            "BenchLexer.g4": grammar.analyze_grammar(lexer.decode("utf-8")),
+            "BenchParser.g4": grammar.analyze_grammar(parser_text.decode("utf-8")),
+        }
+        grammar.check_vocabularies(summaries)
+
+    cache = grammar.GrammarCache()
+    cache.summary(lexer)
+    edits = iter(range(10 ** 9))
+
+    def edited() -> None:
+        # Правка парсера меняет SHA его содержимого, лексер остаётся в кэше
+        edited_parser = parser_text + f"// edit {next(edits)}\n".encode("utf-8")
+        summaries = {"BenchLexer.g4": cache.summary(lexer), "BenchParser.g4": cache.summary(edited_parser)}
+        grammar.check_vocabularies(summaries)
+
+    def unchanged() -> None:
+        summaries = {"BenchLexer.g4": cache.summary(lexer), "BenchParser.g4": cache.summary(parser_text)}
+        grammar.check_vocabularies(summaries)
+
+    token_count = sum(1 for _ in grammar.tokenize(lexer.decode("utf-8"))) + sum(
+        1 for _ in grammar.tokenize(parser_text.decode("utf-8"))
+    )
+    print(
+        f"Synthetic grammars: {args.tokens} tokens, {args.rules} parser rules, "
+        f"{(len(lexer) + len(parser_text)) // 1024} KiB, {token_count} lexemes"
+    )
+
+    tokenize = best_time(
+        lambda: (list(grammar.tokenize(lexer.decode("utf-8"))), list(grammar.tokenize(parser_text.decode("utf-8")))),
+        args.repeat,
+    )
+    full = best_time(cold, args.repeat)
+    incremental = best_time(edited, args.repeat)
+    cached = best_time(unchanged, args.repeat)
+    print(f"  tokenize                 : {tokenize * 1000:8.1f} ms  ({token_count / tokenize / 1e6:.1f} M lexemes/s)")
+    print(f"  cold analysis            : {full * 1000:8.1f} ms")
+    print(f"  re-check after edit      : {incremental * 1000:8.1f} ms  (x{full / incremental:.1f})")
+    print(f"  re-check, no changes     : {cached * 1000:8.1f} ms  (x{full / cached:.1f})")
+
+
+if __name__ == "__main__":
+    main()
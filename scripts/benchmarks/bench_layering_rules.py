@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+"""
+Бенчмарк проверки правил зависимостей (LayeringChecker из repotools.structure, dushnila.py).
+
+Генерирует слоистый граф из N проектов (по умолчанию 1000; проект зависит от
+нескольких проектов нижних слоёв) и R правил (по умолчанию 1000): запреты
+"нижний проект !-> верхний" с именами и шаблонами, часть разрешающих исключений.
+Сравнивает:
+  - наивную проверку: поиск в ширину для каждой пары (источник, цель) правила;
+  - LayeringChecker: битовые строки достижимости, посчитанные один раз.
+
+ИСПОЛЬЗОВАНИЕ:
+  python scripts/benchmarks/bench_layering_rules.py [--projects N] [--rules R] [--repeat K]
+"""
+
+import argparse
+import fnmatch
+import importlib
+import logging
+import posixpath
+import random
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+from bench_solution_parser import best_time
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+LAYERS = 10
+
+
+def load_structure_module():
+    """Импортирует repotools.structure (проверки dushnila.py) из каталога scripts/"""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    return importlib.import_module("repotools.structure")
+
+
+def generate_graph(count: int, rng: random.Random) -> Dict[str, List[str]]:
+    """Граф ProjectReference: путь .csproj -> пути зависимостей из нижних слоёв"""
+    paths = [f"src/L{i % LAYERS}/P{i:05d}/P{i:05d}.csproj" for i in range(count)]
+    graph: Dict[str, List[str]] = {}
+    for index, path in enumerate(paths):
+        layer = index % LAYERS
+        lower = [other for other in paths[:index] if int(other.split("/")[1][1:]) < layer]
+        graph[path] = rng.sample(lower, min(3, len(lower)))
+    return graph
+
+
+def generate_rules(count: int, projects: int, rng: random.Random) -> List[str]:
+    lines = []
+    for _ in range(count):
+        kind = rng.random()
+        source = f"P{rng.randrange(projects):05d}"
+        if kind < 0.1:
+            lines.append(f"{source} -> P{rng.randrange(projects):05d}")
+        elif kind < 0.2:
+            lines.append(f"src/L{rng.randrange(LAYERS)}/* !-> P{rng.randrange(projects):05d}")
+        else:
+            targets = " ".join(f"P{rng.randrange(projects):05d}" for _ in range(3))
+            lines.append(f"{source} !-> {targets}")
+    return lines
+
+
+def naive_check(graph: Dict[str, List[str]], lines: List[str]) -> int:
+    """Поиск в ширину для каждой пары источник-цель (шаблоны сопоставляются один раз)"""
+    cache: Dict[str, Set[str]] = {}
+
+    def matching(pattern: str) -> Set[str]:
+        if pattern not in cache:
+            cache[pattern] = {
+                path for path in graph
+                if fnmatch.fnmatchcase(posixpath.splitext(posixpath.basename(path))[0], pattern)
+                or fnmatch.fnmatchcase(posixpath.dirname(path), pattern)
+            }
+        return cache[pattern]
+
+    def reaches(source: str, target: str) -> bool:
+        seen = {source}
+        queue = deque(graph[source])
+        while queue:
+            node = queue.popleft()
+            if node == target:
+                return True
+            if node not in seen:
+                seen.add(node)
+                queue.extend(graph[node])
+        return False
+
+    rules = [line.split() for line in lines]
+    allowed: Set[Tuple[str, str]] = set()
+    for rule in rules:
+        if rule[1] == "->":
+            for source in matching(rule[0]):
+                allowed.update((source, target) for pattern in rule[2:] for target in matching(pattern))
+
+    violations = 0
+    for rule in rules:
+        if rule[1] != "!->":
+            continue
+        targets = set().union(*(matching(pattern) for pattern in rule[2:]))
+        for source in matching(rule[0]):
+            for target in targets:
+                if (source, target) not in allowed and reaches(source, target):
+                    violations += 1
+    return violations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark dependency rules checking")
+    parser.add_argument("--projects", type=int, default=1000, help="Number of synthetic projects")
+    parser.add_argument("--rules", type=int, default=1000, help="Number of rules")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs (best time is reported)")
+    args = parser.parse_args()
+
+    # Нарушения не печатаются, а только считаются
+    logging.basicConfig(level=logging.CRITICAL)
+    structure = load_structure_module()
+    rng = random.Random(42)
+    graph = generate_graph(args.projects, rng)
+    lines = generate_rules(args.rules, args.projects, rng)
+    checker = structure.LayeringChecker()
+
+    def current() -> int:
+        reporter = structure.ErrorReporter()
+        rules = checker._parse_rules(lines, reporter)
+        checker._check_rules(rules, graph, reporter)
+        return reporter.error_count
+
+    violations = current()
+    assert violations == naive_check(graph, lines)
+    print(f"Synthetic graph: {args.projects} projects, {args.rules} rules, {violations} violations")
+
+    naive = best_time(lambda: naive_check(graph, lines), 1)
+    bitsets = best_time(current, args.repeat)
+    print(f"  naive BFS per pair : {naive * 1000:8.1f} ms")
+    print(f"  reachability bits  : {bitsets * 1000:8.1f} ms  (x{naive / bitsets:.1f})")
+
+
+if __name__ == "__main__":
+    main()
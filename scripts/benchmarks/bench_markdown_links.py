@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+
+"""
+Бенчмарк индекса якорей и ссылок Markdown (repotools.markdown, dushnila.py).
+
+Генерирует D документов (по умолчанию 2000, по 40 заголовков и 80 ссылок на
+соседние документы и якоря, с блоками кода). Измеряет:
+  - холодный разбор: MarkdownCache без записей (пакеты в пуле процессов,
+    если ядер больше одного);
+  - повторную проверку после правки одного документа;
+  - повторную проверку без правок: все сводки берутся из кэша по SHA;
+  - разрешение всех ссылок по индексу якорей (поиск в множествах).
+
+ИСПОЛЬЗОВАНИЕ:
+  python scripts/benchmarks/bench_markdown_links.py [--documents D] [--repeat K]
+"""
+
+import argparse
+import importlib
+import posixpath
+import random
+import sys
+from pathlib import Path
+
+from bench_solution_parser import best_time
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+
+def load_markdown_module():
+    """Импортирует repotools.markdown из каталога scripts/"""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    return importlib.import_module("repotools.markdown")
+
+
+def generate_document(index: int, documents: int, rng: random.Random) -> bytes:
+    lines = [f"# Документ {index}", ""]
+    for section in range(40):
+        lines += [f"## {section}. Раздел `код` и [ссылка](#документ-{index})", ""]
+        for _ in range(2):
+            other = rng.randrange(documents)
+            lines.append(
+                f"См. [раздел](../part{other % 10}/doc{other}.md#{rng.randrange(40)}-раздел-код-и-ссылка) "
+                f"и [начало](#документ-{index})."
+            )
+        if section % 10 == 0:
+            lines += ["```", "## не заголовок", "[не ссылка](nope.md)", "```"]
+        lines.append("")
+    return "\n".join(lines).encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Markdown anchor index and link checking")
+    parser.add_argument("--documents", type=int, default=2000, help="Number of Markdown documents")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs (best time is reported)")
+    args = parser.parse_args()
+
+    markdown = load_markdown_module()
+    rng = random.Random(42)
+    paths = [f"docs/part{i % 10}/doc{i}.md" for i in range(args.documents)]
+    contents = [generate_document(i, args.documents, rng) for i in range(args.documents)]
+
+    cache = markdown.MarkdownCache()
+    summaries = cache.summaries(contents)
+    anchors = {path: set(summary.anchors) for path, summary in zip(paths, summaries)}
+    edits = iter(range(10 ** 9))
+
+    def cold() -> None:
+        markdown.MarkdownCache().summaries(contents)
+
+    def edited() -> None:
+        cache.summaries(contents[:-1] + [contents[-1] + f"\nправка {next(edits)}\n".encode("utf-8")])
+
+    def unchanged() -> None:
+        cache.summaries(contents)
+
+    def resolve() -> int:
+        broken = 0
+        for path, summary in zip(paths, summaries):
+            for _, target in summary.links:
+                file_part, _, fragment = target.partition("#")
+                resolved = posixpath.normpath(posixpath.join(posixpath.dirname(path), file_part)) if file_part else path
+                if resolved not in anchors or (fragment and fragment not in anchors[resolved]):
+                    broken += 1
+        return broken
+
+    links = sum(len(summary.links) for summary in summaries)
+    assert resolve() == 0
+    print(
+        f"Synthetic docs: {args.documents} documents, {sum(map(len, contents)) // 1024} KiB, "
+        f"{sum(len(summary.anchors) for summary in summaries)} anchors, {links} links"
+    )
+
+    full = best_time(cold, args.repeat)
+    incremental = best_time(edited, args.repeat)
+    cached = best_time(unchanged, args.repeat)
+    lookup = best_time(resolve, args.repeat)
+    print(f"  cold parse               : {full * 1000:8.1f} ms")
+    print(f"  re-check after edit      : {incremental * 1000:8.1f} ms  (x{full / incremental:.1f})")
+    print(f"  re-check, no changes     : {cached * 1000:8.1f} ms  (x{full / cached:.1f})")
+    print(f"  resolve links            : {lookup * 1000:8.1f} ms  ({links / lookup / 1e6:.1f} M links/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+"""
+Бенчмарк общего хранилища результатов проверок (repotools.results, dushnila.py).
+
+Моделирует группу студенческих репозиториев из одного шаблона: клонирует этот
+репозиторий N раз (по умолчанию 30) во временный каталог и в каждой пятой копии
+меняет LICENSE и .editorconfig. Измеряет проверку всех копий функцией
+check_project_structure:
+  - без общего хранилища: у каждого репозитория своя база в памяти;
+  - с общей базой SQLite: одинаковые файлы разбираются один раз;
+  - повторный прогон с заполненной базой.
+
+ИСПОЛЬЗОВАНИЕ:
+  python scripts/benchmarks/bench_result_store.py [--repos N]
+"""
+
+import argparse
+import importlib
+import logging
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+REPO_DIR = SCRIPTS_DIR.parent
+
+
+def load_repotools():
+    """Импортирует пакет repotools из каталога scripts/"""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    return importlib.import_module("repotools"), importlib.import_module("repotools.results")
+
+
+def make_cohort(directory: Path, count: int) -> list:
+    paths = []
+    for i in range(count):
+        path = directory / f"student{i:03d}"
+        subprocess.run(["git", "clone", "-q", "--shared", str(REPO_DIR), str(path)], check=True)
+        if i % 5 == 0:
+            license_path = path / "LICENSE"
+            license_path.write_text(license_path.read_text(encoding="utf-8") + f"\nStudent {i}\n", encoding="utf-8")
+            with open(path / ".editorconfig", "a", encoding="utf-8") as f:
+                f.write(f"\n# student {i}\n")
+        paths.append(path)
+    return paths
+
+
+def run(repotools, results, paths, shared=None) -> tuple:
+    """Проверяет все репозитории; shared — общее хранилище (иначе своё на каждый)"""
+    start = time.perf_counter()
+    hits = lookups = 0
+    for path in paths:
+        store = shared if shared is not None else results.ResultStore()
+        before = (store.hits, store.lookups)
+        repotools.check_project_structure(path, store)
+        hits += store.hits - before[0]
+        lookups += store.lookups - before[1]
+        if shared is None:
+            store.close()
+    return time.perf_counter() - start, hits, lookups
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the shared result store across a cohort of repositories")
+    parser.add_argument("--repos", type=int, default=30, help="Number of repository copies")
+    args = parser.parse_args()
+
+    repotools, results = load_repotools()
+    logging.disable(logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as directory:
+        paths = make_cohort(Path(directory), args.repos)
+        database = Path(directory) / "results.db"
+        print(f"Cohort: {args.repos} repositories cloned from {REPO_DIR.name}")
+
+        separate, _, lookups = run(repotools, results, paths)
+        with results.ResultStore(database) as store:
+            shared, hits, _ = run(repotools, results, paths, store)
+            warm, warm_hits, _ = run(repotools, results, paths, store)
+
+        print(f"  per-repo stores          : {separate * 1000:8.1f} ms  ({lookups} file results computed)")
+        print(f"  shared SQLite store      : {shared * 1000:8.1f} ms  (dedup {hits / lookups:.0%})")
+        print(f"  shared store, second run : {warm * 1000:8.1f} ms  (dedup {warm_hits / lookups:.0%})")
+
+
+if __name__ == "__main__":
+    main()
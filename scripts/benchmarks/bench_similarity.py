@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+
+"""
+Бенчмарк поиска похожих решений (repotools.similarity, dushnila.py --similarity).
+
+Генерирует группу из R репозиториев (по умолчанию 40) по F файлов C#
+(по умолчанию 25, из случайных методов) во временном каталоге; в каждой десятой
+паре соседних репозиториев пять файлов скопированы с переименованием
+идентификаторов и заменой чисел. Измеряет:
+  - хэширование шинглов (в пуле процессов, если ядер больше одного);
+  - отбрасывание общего каркаса и построение подписей MinHash;
+  - поиск пар-кандидатов LSH и оценку их похожести;
+  - попарное сравнение подписей всех файлов разных репозиториев.
+
+ИСПОЛЬЗОВАНИЕ:
+  python scripts/benchmarks/bench_similarity.py [--repos R] [--files F] [--repeat K]
+"""
+
+import argparse
+import importlib
+import random
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+from bench_solution_parser import best_time
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+
+def load_similarity_module():
+    """Импортирует repotools.similarity из каталога scripts/"""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    return importlib.import_module("repotools.similarity")
+
+
+def similar_pairs(similarity, owners: list, signatures: list) -> set:
+    """Пары индексов файлов разных репозиториев с похожестью не ниже MIN_SIMILARITY"""
+    return {
+        (left, right)
+        for left in range(len(signatures))
+        for right in range(left + 1, len(signatures))
+        if owners[left] != owners[right] and signatures[left] and signatures[right]
+        and similarity.estimate_similarity(signatures[left], signatures[right]) >= similarity.MIN_SIMILARITY
+    }
+
+
+def generate_expression(rng: random.Random, depth: int = 0) -> str:
+    if depth > 2 or rng.random() < 0.3:
+        return rng.choice(["x", "y", "items.Count", str(rng.randrange(100)), '"text"'])
+    kind = rng.randrange(4)
+    if kind == 0:
+        return f"({generate_expression(rng, depth + 1)} {rng.choice('+-*/%<>')} {generate_expression(rng, depth + 1)})"
+    if kind == 1:
+        arguments = ", ".join(generate_expression(rng, depth + 1) for _ in range(rng.randrange(3)))
+        return f"{rng.choice(['Math.Max', 'Compute', 'items.IndexOf', 'Parse'])}({arguments})"
+    if kind == 2:
+        return f"items[{generate_expression(rng, depth + 1)}]"
+    return f"!{generate_expression(rng, depth + 1)}"
+
+
+def generate_statements(rng: random.Random, indent: str, depth: int = 0) -> list:
+    lines = []
+    for _ in range(rng.randrange(2, 6)):
+        kind = rng.randrange(6 if depth < 2 else 3)
+        if kind == 0:
+            lines.append(f"{indent}var v{len(lines)} = {generate_expression(rng)};")
+        elif kind == 1:
+            lines.append(f"{indent}x = {generate_expression(rng)};")
+        elif kind == 2:
+            lines.append(f"{indent}items.Add({generate_expression(rng)});")
+        else:
+            header = {
+                3: f"if ({generate_expression(rng)})",
+                4: f"for (int i = 0; i < {generate_expression(rng)}; i++)",
+                5: f"while ({generate_expression(rng)})",
+            }[kind]
+            lines += [indent + header, indent + "{", *generate_statements(rng, indent + "    ", depth + 1), indent + "}"]
+    return lines
+
+
+def generate_source(name: str, rng: random.Random) -> str:
+    lines = ["namespace Bench;", "", f"public sealed class {name}", "{"]
+    for method in range(rng.randrange(3, 7)):
+        lines += [f"    public int Method{method}(int x, int y)", "    {", "        var items = new List<int>();"]
+        lines += generate_statements(rng, "        ")
+        lines += ["        return x + y;", "    }", ""]
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def disguise(source: str) -> str:
+    """Копия с переименованными методами и параметрами и другими числами"""
+    source = re.sub(r"\bMethod(\d+)", r"Do\1", source).replace("(int x, int y)", "(int first, int second)")
+    source = re.sub(r"\bx\b", "first", re.sub(r"\by\b", "second", source))
+    return re.sub(r"\b\d+\b", lambda match: str(int(match.group()) + 1), source)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark MinHash/LSH similarity across a cohort of repositories")
+    parser.add_argument("--repos", type=int, default=40, help="Number of repositories")
+    parser.add_argument("--files", type=int, default=25, help="Number of .cs files per repository")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs (best time is reported)")
+    args = parser.parse_args()
+
+    similarity = load_similarity_module()
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as directory:
+        files = []
+        planted = set()
+        for repo in range(args.repos):
+            for index in range(args.files):
+                path = Path(directory) / f"student{repo:03d}" / f"Type{index}.cs"
+                path.parent.mkdir(exist_ok=True)
+                if repo % 10 == 1 and index < 5:
+                    path.write_text(disguise((Path(files[-args.files][1])).read_text(encoding="utf-8")), encoding="utf-8")
+                    planted.add((len(files) - args.files, len(files)))
+                else:
+                    path.write_text(generate_source(f"Type{index}", rng), encoding="utf-8")
+                files.append((repo, str(path)))
+
+        owners = [repo for repo, _ in files]
+
+        def sign() -> list:
+            return similarity.map_batches(similarity.sign_source, [path for _, path in files])
+
+        signed = sign()
+
+        def filter_boilerplate() -> list:
+            return [signature for signature, _ in similarity.cohort_signatures(owners, signed, args.repos)]
+
+        signatures = filter_boilerplate()
+        compared = [index for index, signature in enumerate(signatures) if signature]
+
+        def lsh() -> set:
+            return {
+                (compared[left], compared[right])
+                for left, right in similarity.candidate_pairs([signatures[index] for index in compared])
+                if owners[compared[left]] != owners[compared[right]]
+                and similarity.estimate_similarity(signatures[compared[left]], signatures[compared[right]])
+                >= similarity.MIN_SIMILARITY
+            }
+
+        def all_pairs() -> set:
+            return similar_pairs(similarity, owners, signatures)
+
+        found = lsh()
+        assert planted <= found, f"missed {len(planted - found)} planted copies"
+        print(f"Synthetic cohort: {args.repos} repositories, {len(files)} files, {len(planted)} planted copies")
+
+        signing = best_time(sign, args.repeat)
+        filtering = best_time(filter_boilerplate, args.repeat)
+        candidates = best_time(lsh, args.repeat)
+        brute = best_time(all_pairs, 1)
+        exact = all_pairs()
+        candidate_count = len(similarity.candidate_pairs([signatures[index] for index in compared]))
+        print(f"  shingle hashes           : {signing * 1000:8.1f} ms  ({len(files) / signing:.0f} files/s)")
+        print(f"  boilerplate + MinHash    : {filtering * 1000:8.1f} ms  ({len(compared)} files compared)")
+        print(f"  LSH candidates           : {candidates * 1000:8.1f} ms  ({candidate_count} pairs)")
+        print(f"  all pairs                : {brute * 1000:8.1f} ms  (x{brute / candidates:.1f})")
+        print(f"  LSH recall               : {len(found & exact)} of {len(exact)} pairs above {similarity.MIN_SIMILARITY}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+"""
+Бенчмарк разбора файлов решения (repotools.solution, print-solution-graph.py).
+
+Генерирует во временном каталоге синтетическое решение из N проектов
+(по умолчанию 5000) в двух форматах — `.sln` с папками решения и полными
+секциями конфигураций сборки, и эквивалентный `.slnx` — и сравнивает:
+  - прежний построчный разбор (`PROJECT_PATTERN.search` по каждой строке файла);
+  - текущий `SolutionParser.parse` для `.sln` (один проход `finditer` до `Global`);
+  - текущий `SolutionParser.parse` для `.slnx` (разбор без DTD, `file_access.parse_xml`).
+
+ИСПОЛЬЗОВАНИЕ:
+  python scripts/benchmarks/bench_solution_parser.py [--projects N] [--repeat R]
+"""
+
+import argparse
+import importlib
+import re
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, List
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+CSHARP_PROJECT_TYPE = "FAE04EC0-301F-11D3-BF4B-00C04F79EFBC"
+SOLUTION_FOLDER_TYPE = "2150E333-8FDC-42A3-9474-1A3956D46DE8"
+PLATFORMS = ["Any CPU", "x64", "x86"]
+
+# Построчный разбор в том виде, в каком он был до однопроходного парсера
+LEGACY_PATTERN = re.compile(
+    r'Project\("\{[^}]+\}"\)\s*=\s*"([^"]+)"\s*,\s*"([^"]+\.csproj)"\s*,\s*"\{[^}]+\}"',
+    re.IGNORECASE
+)
+
+
+def load_solution_module():
+    """Импортирует repotools.solution из каталога scripts/"""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    return importlib.import_module("repotools.solution")
+
+
+def guid() -> str:
+    return str(uuid.uuid4()).upper()
+
+
+def generate_solution(root: Path, count: int) -> None:
+    """Создаёт bench.sln, bench.slnx и пустые .csproj файлы для count проектов"""
+    folders = [("src", guid()), ("tests", guid())]
+    projects = []
+    for i in range(count):
+        name = f"Project{i:05d}"
+        folder = folders[i % 2]
+        relative_path = f"{folder[0]}\\{name}\\{name}.csproj"
+        csproj = root / folder[0] / name / f"{name}.csproj"
+        csproj.parent.mkdir(parents=True, exist_ok=True)
+        csproj.write_text('<Project Sdk="Microsoft.NET.Sdk" />\n', encoding="utf-8")
+        projects.append((name, relative_path, guid(), folder))
+
+    lines = [
+        "",
+        "Microsoft Visual Studio Solution File, Format Version 12.00",
+        "# Visual Studio Version 17",
+    ]
+    for folder_name, folder_guid in folders:
+        lines.append(
+            f'Project("{{{SOLUTION_FOLDER_TYPE}}}") = "{folder_name}", "{folder_name}", "{{{folder_guid}}}"'
+        )
+        lines.append("EndProject")
+    for name, relative_path, project_guid, _ in projects:
+        lines.append(
+            f'Project("{{{CSHARP_PROJECT_TYPE}}}") = "{name}", "{relative_path}", "{{{project_guid}}}"'
+        )
+        lines.append("EndProject")
+
+    lines.append("Global")
+    lines.append("\tGlobalSection(ProjectConfigurationPlatforms) = postSolution")
+    for _, _, project_guid, _ in projects:
+        for configuration in ("Debug", "Release"):
+            for platform in PLATFORMS:
+                lines.append(
+                    f"\t\t{{{project_guid}}}.{configuration}|{platform}.ActiveCfg = {configuration}|Any CPU"
+                )
+                lines.append(
+                    f"\t\t{{{project_guid}}}.{configuration}|{platform}.Build.0 = {configuration}|Any CPU"
+                )
+    lines.append("\tEndGlobalSection")
+    lines.append("\tGlobalSection(NestedProjects) = preSolution")
+    for _, _, project_guid, folder in projects:
+        lines.append(f"\t\t{{{project_guid}}} = {{{folder[1]}}}")
+    lines.append("\tEndGlobalSection")
+    lines.append("EndGlobal")
+    (root / "bench.sln").write_text("\n".join(lines) + "\n", encoding="utf-8-sig")
+
+    xml_lines = ["<Solution>"]
+    for folder_name, _ in folders:
+        xml_lines.append(f'  <Folder Name="/{folder_name}/">')
+        for name, relative_path, _, folder in projects:
+            if folder[0] == folder_name:
+                xml_lines.append(f'    <Project Path="{relative_path.replace(chr(92), "/")}" />')
+        xml_lines.append("  </Folder>")
+    xml_lines.append("</Solution>")
+    (root / "bench.slnx").write_text("\n".join(xml_lines) + "\n", encoding="utf-8")
+
+
+def legacy_parse(sln_path: Path) -> List[str]:
+    """Прежний алгоритм: построчный search, без папок решения"""
+    content = sln_path.read_text(encoding="utf-8-sig")
+    names = []
+    for line in content.splitlines():
+        match = LEGACY_PATTERN.search(line)
+        if match:
+            csproj_path = (sln_path.parent / match.group(2).replace("\\", "/")).resolve()
+            if not csproj_path.exists():
+                raise ValueError(f"Project file not found: {csproj_path}")
+            names.append(match.group(1))
+    return names
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark solution file parsing")
+    parser.add_argument("--projects", type=int, default=5000, help="Number of synthetic projects")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs (best time is reported)")
+    args = parser.parse_args()
+
+    module = load_solution_module()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        generate_solution(root, args.projects)
+        sln_path = root / "bench.sln"
+        slnx_path = root / "bench.slnx"
+
+        solution = module.SolutionParser.parse(sln_path)
+        assert len(solution.projects) == args.projects
+        assert sorted(solution.folders) == ["src", "tests"]
+        assert len(module.SolutionParser.parse(slnx_path).projects) == args.projects
+
+        print(f"Synthetic solution: {args.projects} projects, "
+              f".sln {sln_path.stat().st_size / 1024:.0f} KiB, "
+              f".slnx {slnx_path.stat().st_size / 1024:.0f} KiB")
+
+        legacy = best_time(lambda: legacy_parse(sln_path), args.repeat)
+        current = best_time(lambda: module.SolutionParser.parse(sln_path), args.repeat)
+        xml = best_time(lambda: module.SolutionParser.parse(slnx_path), args.repeat)
+
+        print(f"  legacy line-by-line .sln : {legacy * 1000:8.1f} ms")
+        print(f"  single-pass .sln         : {current * 1000:8.1f} ms  (x{legacy / current:.2f})")
+        print(f"  .slnx without DTD        : {xml * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+"""
+Бенчмарк поиска namespace и типов верхнего уровня (repotools.source_scan, dushnila.py).
+
+Генерирует N файлов C# (по умолчанию 1000, по ~70 КБ: заголовок, атрибуты,
+строки и комментарии с ключевыми словами, один тип с большим телом) во временном
+каталоге. Сравнивает:
+  - полный разбор: файл читается целиком и все лексемы проходят через лексер;
+  - scan_declarations: читается не больше DECLARATION_SCAN_SIZE байт, разбор
+    останавливается на имени первого типа.
+
+ИСПОЛЬЗОВАНИЕ:
+  python scripts/benchmarks/bench_source_declarations.py [--files N] [--repeat K]
+"""
+
+import argparse
+import importlib
+import sys
+import tempfile
+from pathlib import Path
+
+from bench_solution_parser import best_time
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+
+def load_source_scan_module():
+    """Импортирует repotools.source_scan из каталога scripts/"""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    return importlib.import_module("repotools.source_scan")
+
+
+def generate_source(index: int) -> str:
+    lines = [
+        "// Файл с классом и комментарием: class NotAType",
+        "using System;",
+        "using System.Collections.Generic;",
+        "",
+        f"namespace Bench.Folder{index % 20};",
+        "",
+        '[Obsolete("class NotAType")]',
+        f"public sealed class Type{index}<T> where T : class",
+        "{",
+    ]
+    for member in range(600):
+        lines += [
+            f"    public string Method{member}(T value) => $\"{{value}} struct {member}\";",
+            f"    /* enum Hidden{member} */ private readonly char _c{member} = '{{';",
+        ]
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark header-only C# declaration scanning")
+    parser.add_argument("--files", type=int, default=1000, help="Number of .cs files")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs (best time is reported)")
+    args = parser.parse_args()
+
+    source_scan = load_source_scan_module()
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i in range(args.files):
+            path = Path(directory) / f"Type{i}.cs"
+            path.write_text(generate_source(i), encoding="utf-8")
+            paths.append(str(path))
+        total = sum(Path(path).stat().st_size for path in paths)
+
+        def full() -> int:
+            tokens = 0
+            for path in paths:
+                with open(path, "rb") as f:
+                    text = f.read().decode("utf-8")
+                tokens += sum(1 for _ in source_scan.DECLARATION_TOKEN_PATTERN.finditer(text))
+            return tokens
+
+        def header() -> list:
+            return [source_scan.scan_declarations(path) for path in paths]
+
+        assert all(declaration.type_name == f"Type{i}" for i, declaration in enumerate(header()))
+        print(f"Synthetic sources: {args.files} files, {total // (1024 * 1024)} MiB")
+
+        slow = best_time(full, 1)
+        fast = best_time(header, args.repeat)
+        print(f"  full-file lexing         : {slow * 1000:8.1f} ms")
+        print(f"  header only              : {fast * 1000:8.1f} ms  (x{slow / fast:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+"""
+Бенчмарк проверки фрагментов Vaibik (repotools.lexicon, dushnila.py).
+
+Берёт таблицу токенов из src/Grammar/Grammars/VaibikLexer.g4 и примеры программ
+из docs/examples.md, генерирует D документов Markdown (по умолчанию 500, по
+6 фрагментов: примеры, фрагменты с опечатками в ключевых словах и блоки EBNF без
+языка). Измеряет:
+  - построение сканера по таблице токенов;
+  - извлечение фрагментов за один проход по строкам;
+  - сканирование: наивное (`match` каждого правила лексера по очереди в каждой
+    позиции) и VaibikScanner (одно регулярное выражение с опережающими проверками).
+
+ИСПОЛЬЗОВАНИЕ:
+  python scripts/benchmarks/bench_vaibik_lexicon.py [--documents D] [--repeat K]
+"""
+
+import argparse
+import importlib
+import random
+import re
+import sys
+from pathlib import Path
+
+from bench_solution_parser import best_time
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+REPO_DIR = SCRIPTS_DIR.parent
+LEXER_PATH = REPO_DIR / "src" / "Grammar" / "Grammars" / "VaibikLexer.g4"
+EXAMPLES_PATH = REPO_DIR / "docs" / "examples.md"
+
+EBNF_BLOCK = ["digit = \"0\" | \"1\" | \"2\" ;", "number = digit , { digit } ;"]
+
+
+def load_repotools():
+    """Импортирует repotools.grammar и repotools.lexicon из каталога scripts/"""
+    sys.path.insert(0, str(SCRIPTS_DIR))
+    return importlib.import_module("repotools.grammar"), importlib.import_module("repotools.lexicon")
+
+
+def generate_document(examples, rng: random.Random) -> list:
+    lines = ["# Примеры", ""]
+    for index in range(6):
+        body = rng.choice(examples)
+        if index == 4:
+            body = [line.replace("ВЫБРОС", "ВЫБРОСИТЬ") for line in body]
+        elif index == 5:
+            body = EBNF_BLOCK
+        lines += ["```", *body, "```", ""]
+    return lines
+
+
+def naive_scan(rules, text: str) -> int:
+    """Лексемы текста: каждое правило проверяется отдельным `match`"""
+    position = 0
+    count = 0
+    while position < len(text):
+        best_end = position
+        best_hidden = True
+        for pattern, hidden in rules:
+            match = pattern.match(text, position)
+            if match is not None and match.end() > best_end:
+                best_end, best_hidden = match.end(), hidden
+        if best_end == position:
+            position += 1
+            continue
+        count += not best_hidden
+        position = best_end
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Vaibik snippet lexicon checking")
+    parser.add_argument("--documents", type=int, default=500, help="Number of Markdown documents")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs (best time is reported)")
+    args = parser.parse_args()
+
+    grammar, lexicon = load_repotools()
+    tokens = grammar.lexer_tokens(grammar.decode_grammar(LEXER_PATH.read_bytes()))
+    examples = [
+        snippet.text.splitlines()
+        for snippet in lexicon.extract_snippets("examples.md", EXAMPLES_PATH.read_text(encoding="utf-8").splitlines())
+    ]
+    rng = random.Random(42)
+    documents = [generate_document(examples, rng) for _ in range(args.documents)]
+
+    scanner = lexicon.VaibikScanner(tokens)
+    snippets = [
+        snippet
+        for index, lines in enumerate(documents)
+        for snippet in lexicon.extract_snippets(f"{index}.md", lines)
+        if snippet.tagged or scanner.looks_like_code(snippet.text)
+    ]
+    rules = [
+        (re.compile(re.escape(token.literal) if token.literal is not None else token.regex), token.hidden)
+        for token in tokens
+    ]
+
+    def extract() -> int:
+        return sum(1 for index, lines in enumerate(documents) for _ in lexicon.extract_snippets(f"{index}.md", lines))
+
+    def naive() -> int:
+        return sum(naive_scan(rules, snippet.text) for snippet in snippets)
+
+    def table() -> int:
+        unknown = 0
+        for snippet in snippets:
+            result = scanner.scan(snippet.text, snippet.line)
+            unknown += len(lexicon.unknown_keywords(scanner, result.lexemes, set()))
+        return unknown
+
+    lexeme_count = sum(len(scanner.scan(snippet.text).lexemes) for snippet in snippets)
+    assert naive() == lexeme_count
+    print(
+        f"Synthetic docs: {args.documents} documents, {extract()} snippets "
+        f"({len(snippets)} Vaibik), {lexeme_count} lexemes, {len(tokens)} lexer tokens"
+    )
+
+    build = best_time(lambda: lexicon.VaibikScanner(tokens), args.repeat)
+    extraction = best_time(extract, args.repeat)
+    slow = best_time(naive, 1)
+    fast = best_time(table, args.repeat)
+    print(f"  build scanner            : {build * 1000:8.1f} ms")
+    print(f"  extract snippets         : {extraction * 1000:8.1f} ms")
+    print(f"  rule-by-rule scan        : {slow * 1000:8.1f} ms")
+    print(f"  table-driven scan        : {fast * 1000:8.1f} ms  (x{slow / fast:.1f})")
+
+
+if __name__ == "__main__":
+    main()
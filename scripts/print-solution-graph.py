@@ -11,18 +11,57 @@
 отчётах или инструментах, поддерживающих Mermaid.
 
 ПРИНЦИП РАБОТЫ:
-1. Скрипт ищет единственный файл с расширением `.sln` в указанном каталоге
-   — при отсутствии или наличии нескольких `.sln` файлов выдаётся ошибка
-2. Парсит `.sln` файл с помощью регулярного выражения, извлекая только `.csproj` проекты
+1. Скрипт ищет единственный файл решения `.sln` или `.slnx` в указанном каталоге
+   — при отсутствии или наличии нескольких файлов решения выдаётся ошибка
+2. Парсит `.sln` файл одним проходом регулярного выражения по объявлениям проектов
+   (до блока `Global`, из которого читается только секция `NestedProjects`),
+   либо `.slnx` потоковым XML-разбором; извлекает `.csproj` проекты и папки решения
 3. Для каждого найденного проекта определяет:
    - является ли он тестовым (наличие сегмента `tests/` в пути, без учёта регистра)
    - путь к `.csproj` файлу (преобразуется в абсолютный)
-4. Читает каждый `.csproj` файл как XML и извлекает зависимости из элементов `<ProjectReference>`
+4. Параллельно (в пуле потоков) читает `.csproj` файлы потоковым разбором expat и извлекает
+   зависимости из элементов `<ProjectReference>`; разобранные файлы кэшируются
+   по пути, времени изменения и размеру
 5. Сопоставляет имена зависимостей с именами проектов, присутствующих в решении
-6. Генерирует диаграмму в формате `graph TD` (top-down), где:
+6. Ищет циклы зависимостей (выводит предупреждение, с `--fail-on-cycle` завершается с ошибкой)
+   и с флагом `--reduce` удаляет избыточные рёбра (транзитивное сокращение),
+   используя модуль graph_analysis.py
+7. Генерирует диаграмму в формате, выбранном флагом `--format` (модуль graph_export.py),
+   и пишет её построчно в stdout или в файл `--output`. Формат по умолчанию — Mermaid
+   `graph TD` (top-down), где:
    - каждый проект представлен как узел: `ProjectName["ProjectName"]`
    - каждая зависимость — как направленное ребро: `ПроектA --> ПроектB`
-7. При необходимости экранирует специальные символы в именах проектов
+   Также доступны Graphviz DOT, node-link JSON, GraphML и матрица смежности CSV
+8. При необходимости экранирует специальные символы в именах проектов
+9. С флагом `--build-plan` вместо диаграммы выводит план параллельной сборки:
+   уровни проектов, которые можно собирать одновременно, самую длинную цепочку
+   зависимостей и критический путь с весами (по умолчанию — размер отслеживаемых
+   `.cs` файлов проекта, либо измеренное время сборки из JSON файла `--build-times`)
+10. С флагом `--affected` по списку изменённых файлов (из stdin или `git diff --name-only A..B`)
+   определяет проекты-владельцы по каталогам `.csproj` и выводит минимальный набор проектов
+   для пересборки (владельцы и все транзитивно зависящие от них) и тестовые проекты для запуска
+11. С флагом `--diff A B` строит графы на двух ревизиях прямо из объектов git (без checkout;
+   неизменённые `.csproj` разбираются один раз) и выводит добавленные и удалённые проекты
+   и рёбра, а также диаграмму с выделенными изменениями
+12. Для больших решений флаг `--cluster` группирует проекты в подграфы (по каталогу, папке
+   решения или циклу зависимостей), `--collapse` сворачивает каждый кластер в один узел
+   с подписью числа рёбер, а `--focus PROJECT --depth N` оставляет только окрестность
+   проекта; эти представления строятся по транзитивному сокращению графа
+13. С флагом `--packages` добавляет в граф NuGet пакеты: из `obj/project.assets.json`
+   (инкрементальный разбор JSON, модуль nuget_assets.py; файлы разбираются параллельно
+   и кэшируются по хэшу содержимого, между запусками — в файле `--packages-cache`),
+   а для проектов без restore — из `PackageReference` в `.csproj` и `Directory.Build.props`;
+   пакеты с разными версиями в решении и избыточные прямые ссылки на пакеты выделяются
+14. С флагом `--metrics` вместо диаграммы выводит таблицу (или JSON) метрик проектов:
+   число отслеживаемых `.cs` файлов, строк, байт и объявлений типов (файлы распределяются
+   по проектам за один проход по `git ls-files` и считаются на уровне байтов в пуле процессов,
+   модуль source_scan.py), а также fan-in, fan-out и нестабильность Ce / (Ca + Ce).
+   С флагом `--annotate` те же метрики добавляются в подписи узлов диаграммы
+15. С флагом `--check-references` параллельно читает заголовки (`using`, `namespace`) всех
+   отслеживаемых `.cs` файлов, сопоставляет пространства имён объявляющим их проектам
+   и сравнивает фактическое использование с `ProjectReference`: выводит неиспользуемые
+   ссылки и проекты, используемые без прямой ссылки (только транзитивно или вовсе без неё);
+   при расхождениях завершается с кодом 1
 
 КЛЮЧЕВЫЕ ОГРАНИЧЕНИЯ:
 - Поддерживаются только проекты в формате `.csproj` (C#); другие типы (C++, F# и т.д.) игнорируются
@@ -33,11 +72,38 @@
 - Скрипт не модифицирует исходные файлы — работает только в режиме чтения
 
 ИСПОЛЬЗОВАНИЕ:
-  python sln-dependency-diagram.py [DIRECTORY] [--with-tests] [--verbose]
+  python sln-dependency-diagram.py [DIRECTORY] [--with-tests] [--format FORMAT] [--output FILE]
+                                   [--reduce] [--fail-on-cycle]
+                                   [--cluster MODE [--collapse]] [--focus PROJECT [--depth N]]
+                                   [--packages [--packages-cache FILE]] [--metrics] [--annotate]
+                                   [--check-references]
+                                   [--build-plan [--build-times FILE]] [--affected [A..B]] [--diff A B]
+                                   [--json]
+                                   [--verbose]
 
 ПАРАМЕТРЫ:
   DIRECTORY                     Каталог с решением (по умолчанию: текущий каталог)
   --with-tests                  Включить тестовые проекты (расположенные в подкаталогах `tests/`) в диаграмму
+  --format FORMAT               Формат диаграммы: mermaid (по умолчанию), dot, json, graphml, csv
+  --output FILE                 Записать диаграмму в файл вместо stdout
+  --reduce                      Не рисовать рёбра, следующие из более длинных путей зависимостей
+  --fail-on-cycle               Завершиться с кодом 1, если в зависимостях есть цикл
+  --cluster MODE                Сгруппировать проекты в подграфы: directory, folder или scc
+  --collapse                    Свернуть каждый кластер в один узел с агрегированными рёбрами
+  --focus PROJECT               Нарисовать только проект и его окрестность
+  --depth N                     Глубина окрестности для --focus (по умолчанию: 1)
+  --packages                    Добавить в диаграмму NuGet пакеты и выделить конфликты версий
+  --packages-cache FILE         JSON файл кэша разобранных project.assets.json
+  --metrics                     Вывести метрики размера и связности проектов вместо диаграммы
+  --annotate                    Добавить метрики в подписи узлов диаграммы
+  --check-references            Найти неиспользуемые и необъявленные ссылки между проектами
+  --build-plan                  Вывести план параллельной сборки вместо диаграммы
+  --build-times FILE            JSON файл с временем сборки проектов: {"Lexer": 4.2, ...}
+  --affected [A..B]             Вывести проекты для пересборки и тесты для запуска по изменённым
+                                файлам из `git diff A..B` или из stdin (пути относительно решения)
+  --diff A B                    Сравнить графы зависимостей двух ревизий git
+  --json                        Вывести план сборки, метрики, проверку ссылок, затронутые проекты
+                                или diff в формате JSON
   --verbose                     Включить расширенное логирование (уровень DEBUG)
 
 ПРИМЕРЫ:
@@ -47,6 +113,35 @@
   # Сгенерировать диаграмму с учётом тестовых проектов
   python sln-dependency-diagram.py --with-tests
 
+  # Сгенерировать диаграмму без избыточных рёбер, прервавшись при наличии циклов
+  python sln-dependency-diagram.py --reduce --fail-on-cycle
+
+  # Сохранить граф в формате Graphviz DOT
+  python sln-dependency-diagram.py --format dot --output docs/dependencies.dot
+
+  # Нарисовать обзор крупными блоками и окрестность одного проекта
+  python sln-dependency-diagram.py --with-tests --cluster directory --collapse
+  python sln-dependency-diagram.py --focus Parser --depth 2
+
+  # Найти самые крупные и самые связанные проекты
+  python sln-dependency-diagram.py --with-tests --metrics
+
+  # Проверить, что ProjectReference соответствуют использованию пространств имён
+  python sln-dependency-diagram.py --with-tests --check-references
+
+  # Показать пакеты проекта Parser и их конфликты версий
+  python sln-dependency-diagram.py --packages --focus Parser --depth 3
+
+  # Вывести план параллельной сборки с учётом измеренного времени сборки
+  python sln-dependency-diagram.py --build-plan --build-times build-times.json --json
+
+  # Определить проекты и тесты, затронутые изменениями ветки
+  git diff --name-only main...HEAD | python sln-dependency-diagram.py --affected
+  python sln-dependency-diagram.py --affected main..HEAD --json
+
+  # Показать, какие зависимости между проектами добавила ветка
+  python sln-dependency-diagram.py --diff main HEAD
+
   # Запустить с подробным логированием для отладки
   python sln-dependency-diagram.py --verbose
 
@@ -55,252 +150,137 @@
 """
 
 import argparse
+import json
 import logging
-import re
 import sys
-import xml.etree.ElementTree as ET
-from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Set, Pattern
-from collections import defaultdict
-
-
-@dataclass
-class Project:
-    """Класс для представления C# проекта"""
-    name: str
-    csproj_path: Path
-    relative_path: str
-    is_test: bool = field(default=False, init=False)
-    dependencies: Set[str] = field(default_factory=set, init=False)
-    
-    def __post_init__(self) -> None:
-        """Определяем, является ли проект тестовым"""
-        # Проверяем наличие 'tests/' в пути (регистронезависимо)
-        self.is_test = any(
-            part.lower() == 'tests' 
-            for part in self.csproj_path.parts
-        )
+from typing import Dict, List, Tuple
+
+from repotools.analysis import (
+    AffectedProjectsIndex,
+    BuildPlanner,
+    DiagramViews,
+    GitRevisionReader,
+    GraphDiffer,
+    MetricsCollector,
+    PackageAnalyzer,
+    ProjectMetrics,
+    ReferenceChecker,
+)
+from repotools.graph_analysis import ProjectGraph
+from repotools.graph_export import EXPORTERS, GraphDocument
+from repotools.nuget_assets import AssetsCache
+from repotools.repo import list_changed_files
+from repotools.solution import DependencyAnalyzer, Solution, SolutionParser, find_solution_file
 
 
-@dataclass
-class Solution:
-    """Класс для представления решения .sln"""
-    path: Path
-    directory: Path
-    projects: Dict[str, Project] = field(default_factory=dict)
-    
-    @property
-    def name(self) -> str:
-        """Имя решения (без расширения)"""
-        return self.path.stem
+def setup_logging(verbose: bool) -> None:
+    """Настраивает логирование"""
+    level = logging.DEBUG if verbose else logging.INFO
+    logging.basicConfig(
+        level=level,
+        format='%(levelname)s: %(message)s',
+        handlers=[logging.StreamHandler(sys.stderr)]
+    )
 
 
-class SolutionParser:
-    """Парсер файла решения .sln"""
+def build_plan(solution: Solution, dependencies: Dict[str, List[str]], args: argparse.Namespace) -> str:
+    """Строит и форматирует план параллельной сборки"""
+    # В план попадают и проекты без зависимостей и зависящих от них
+    project_names = selected_projects(solution, args)
+    graph = ProjectGraph({name: dependencies.get(name, []) for name in project_names})
     
-    # Регулярное выражение для извлечения проектов из .sln
-    # Формат: Project("{GUID}") = "ProjectName", "RelativePath\Project.csproj", "{GUID}"
-    PROJECT_PATTERN: Pattern[str] = re.compile(
-        r'Project\("\{[^}]+\}"\)\s*=\s*"([^"]+)"\s*,\s*"([^"]+\.csproj)"\s*,\s*"\{[^}]+\}"',
-        re.IGNORECASE
-    )
+    if args.build_times:
+        weights = BuildPlanner.load_weights(Path(args.build_times), project_names)
+        weight_unit = "s"
+    else:
+        weights = BuildPlanner.source_weights(solution, project_names)
+        weight_unit = "bytes"
     
-    @classmethod
-    def parse(cls, sln_path: Path) -> Solution:
-        """Парсит файл .sln и возвращает объект Solution"""
-        logging.debug(f"Parsing solution file: {sln_path}")
-        
-        if not sln_path.exists():
-            raise FileNotFoundError(f"Solution file not found: {sln_path}")
-        
-        solution = Solution(path=sln_path, directory=sln_path.parent)
-        
-        try:
-            content = sln_path.read_text(encoding='utf-8-sig')
-        except UnicodeDecodeError as e:
-            raise ValueError(f"Cannot read solution file (invalid encoding): {sln_path}") from e
-        
-        for line in content.splitlines():
-            match = cls.PROJECT_PATTERN.search(line)
-            if match:
-                project_name = match.group(1)
-                relative_path = match.group(2)
-                
-                # Пропускаем не-C# проекты (двойная проверка через расширение)
-                if not relative_path.lower().endswith('.csproj'):
-                    logging.debug(f"Skipping non-C# project: {project_name}")
-                    continue
-                
-                # Преобразуем относительный путь в абсолютный
-                # Заменяем обратные слеши на прямые для кроссплатформенности
-                normalized_path = relative_path.replace('\\', '/')
-                csproj_path = (sln_path.parent / normalized_path).resolve()
-                
-                if not csproj_path.exists():
-                    raise ValueError(f"Project file not found: {csproj_path}")
-                
-                project = Project(
-                    name=project_name,
-                    csproj_path=csproj_path,
-                    relative_path=relative_path
-                )
-                
-                solution.projects[project_name] = project
-                logging.debug(f"Found project: {project_name} ({csproj_path})")
-        
-        if not solution.projects:
-            raise ValueError(f"No C# projects found in solution: {sln_path}")
-        
-        logging.debug(f"Found {len(solution.projects)} projects in solution")
-        return solution
+    plan = BuildPlanner.plan(graph, weights, weight_unit, solution.name)
+    if args.json:
+        return BuildPlanner.format_json(plan)
+    return BuildPlanner.format_text(plan)
 
 
-class CsprojParser:
-    """Парсер файлов .csproj для извлечения зависимостей между проектами"""
-    
-    @classmethod
-    def parse_dependencies(cls, csproj_path: Path) -> Set[str]:
-        """Извлекает зависимости на другие проекты из файла .csproj"""
-        logging.debug(f"Parsing project file: {csproj_path}")
-        
-        if not csproj_path.exists():
-            raise FileNotFoundError(f"Project file not found: {csproj_path}")
-        
-        try:
-            tree = ET.parse(csproj_path)
-        except ET.ParseError as e:
-            raise ValueError(f"Invalid XML in project file: {csproj_path}") from e
-        
-        root = tree.getroot()
-        
-        # Обрабатываем пространства имён
-        namespaces = {'ns': root.tag.split('}')[0].strip('{')} if '}' in root.tag else {}
-        
-        dependencies: Set[str] = set()
-        
-        # Ищем все ProjectReference элементы
-        # Используем XPath с учётом пространства имён, если оно есть
-        if namespaces:
-            ref_elements = root.findall('.//ns:ProjectReference', namespaces)
-        else:
-            # Ищем без пространства имён
-            ref_elements = []
-            for elem in root.iter():
-                if 'ProjectReference' in elem.tag:
-                    ref_elements.append(elem)
-        
-        for ref in ref_elements:
-            include_attr = ref.get('Include')
-            if include_attr:
-                # Извлекаем имя проекта из пути
-                # Формат: ..\OtherProject\OtherProject.csproj или ../OtherProject/OtherProject.csproj
-                try:
-                    # Преобразуем в Path и получаем имя файла без расширения
-                    ref_path = Path(include_attr.replace('\\', '/'))
-                    project_name = ref_path.stem
-                    dependencies.add(project_name)
-                    logging.debug(f"  Found dependency: {project_name}")
-                except Exception as e:
-                    raise RuntimeError(f"  Invalid project reference format: {include_attr}") from e
-        
-        return dependencies
+def selected_projects(solution: Solution, args: argparse.Namespace) -> List[str]:
+    """Имена проектов, попадающих в анализ (с учётом --with-tests)"""
+    return sorted(
+        name for name, project in solution.projects.items()
+        if args.with_tests or not project.is_test
+    )
 
 
-class DependencyAnalyzer:
-    """Анализатор зависимостей между проектами"""
-    
-    @classmethod
-    def analyze(cls, solution: Solution, include_tests: bool = False) -> Dict[str, List[str]]:
-        """Анализирует зависимости между проектами в решении"""
-        logging.debug("Analyzing project dependencies...")
-        
-        # Собираем зависимости для каждого проекта
-        dependencies: Dict[str, List[str]] = defaultdict(list)
-        
-        for project_name, project in solution.projects.items():
-            # Пропускаем тестовые проекты, если не включен флаг
-            if project.is_test and not include_tests:
-                logging.debug(f"Skipping test project: {project_name}")
-                continue
-            
-            try:
-                deps = CsprojParser.parse_dependencies(project.csproj_path)
-                
-                # Фильтруем зависимости, оставляя только проекты из текущего решения
-                for dep in deps:
-                    if dep in solution.projects:
-                        dependencies[project_name].append(dep)
-                    else:
-                        logging.debug(f"Dependency on external project: {dep} (not in solution)")
-            
-            except Exception as e:
-                logging.exception(f"Failed to parse dependencies for project: {project_name}")
-                # Продолжаем анализ для других проектов
-        
-        return dict(dependencies)
+def project_metrics(solution: Solution, dependencies: Dict[str, List[str]], args: argparse.Namespace) -> List[ProjectMetrics]:
+    """Считает метрики проектов, попадающих в диаграмму"""
+    return MetricsCollector.collect(solution, dependencies, selected_projects(solution, args))
 
 
-class MermaidGenerator:
-    """Генератор диаграмм в формате Mermaid"""
-    
-    @classmethod
-    def escape_name(cls, name: str) -> str:
-        """Экранирует имя проекта для Mermaid диаграммы"""
-        # Заменяем символы, которые могут быть проблематичными в Mermaid
-        return name.replace('"', '\\"').replace("'", "\\'")
-    
-    @classmethod
-    def generate_diagram(cls, dependencies: Dict[str, List[str]], solution_name: str) -> str:
-        """Генерирует Mermaid диаграмму зависимостей"""
-        lines = [
-            f"%% Dependencies diagram for solution: {solution_name}",
-            "%% Generated by print-modules-graph",
-            "",
-            "graph TD"
-        ]
-        
-        # Собираем все уникальные проекты
-        all_projects = set(dependencies.keys())
-        for deps in dependencies.values():
-            all_projects.update(deps)
-        
-        # Добавляем узлы (проекты)
-        for project in sorted(all_projects):
-            escaped_name = cls.escape_name(project)
-            lines.append(f'    {project}["{escaped_name}"]')
-        
-        lines.append("")  # Пустая строка для разделения
-        
-        # Добавляем зависимости (стрелки)
-        for source, targets in sorted(dependencies.items()):
-            for target in sorted(targets):
-                lines.append(f"    {source} --> {target}")
-        
-        return "\n".join(lines)
+def check_references(solution: Solution, dependencies: Dict[str, List[str]], args: argparse.Namespace) -> Tuple[str, bool]:
+    """Проверяет ProjectReference по использованию пространств имён
 
+    Returns:
+        Отчёт и признак наличия расхождений
+    """
+    report = ReferenceChecker.check(solution, dependencies, selected_projects(solution, args))
+    text = ReferenceChecker.format_json(report) if args.json else ReferenceChecker.format_text(report)
+    return text, bool(report.unused or report.undeclared)
 
-def find_solution_file(directory: Path) -> Path:
-    """Находит файл .sln в указанном каталоге"""
-    sln_files = list(directory.glob("*.sln"))
-    
-    if not sln_files:
-        raise FileNotFoundError(f"No .sln files found in directory: {directory}")
+
+def affected_projects(solution: Solution, args: argparse.Namespace) -> str:
+    """Определяет проекты и тесты, затронутые изменёнными файлами"""
+    if args.affected == '-':
+        changed_paths = [line for line in sys.stdin.read().splitlines() if line.strip()]
+    else:
+        changed_paths = list_changed_files(solution.directory, args.affected)
+    logging.debug(f"Changed files: {len(changed_paths)}")
     
-    if len(sln_files) > 1:
-        raise ValueError(f"Multiple .sln files found in directory: {directory}. Please specify which one to use.")
+    # Тестовые проекты нужны всегда: по ним определяется, какие тесты запускать
+    dependencies = DependencyAnalyzer.analyze(solution, include_tests=True)
+    index = AffectedProjectsIndex(solution, dependencies)
+    projects, tests = index.affected(changed_paths)
     
-    return sln_files[0]
-
-
-def setup_logging(verbose: bool) -> None:
-    """Настраивает логирование"""
-    level = logging.DEBUG if verbose else logging.INFO
-    logging.basicConfig(
-        level=level,
-        format='%(levelname)s: %(message)s',
-        handlers=[logging.StreamHandler(sys.stderr)]
+    if args.json:
+        return json.dumps(
+            {"changed_files": len(changed_paths), "rebuild": projects, "tests": tests},
+            ensure_ascii=False,
+            indent=2,
+        )
+    return "\n".join([
+        f"Projects to rebuild ({len(projects)}): {', '.join(projects)}",
+        f"Test projects to run ({len(tests)}): {', '.join(tests)}",
+    ])
+
+
+def diff_revisions(directory: Path, args: argparse.Namespace) -> None:
+    """Выводит различия графа зависимостей между двумя ревизиями"""
+    old_revision, new_revision = args.diff
+    reader = GitRevisionReader(directory)
+    diff = GraphDiffer.diff(
+        old_revision,
+        reader.load(old_revision, args.with_tests),
+        new_revision,
+        reader.load(new_revision, args.with_tests),
+        args.with_tests,
     )
+    
+    if args.json:
+        print(GraphDiffer.format_json(diff))
+        return
+    
+    exporter = EXPORTERS[args.format]
+    if args.output:
+        print(GraphDiffer.format_text(diff))
+        with open(args.output, 'w', encoding='utf-8', newline='\n') as out:
+            exporter.write(diff.document, out)
+    elif args.format == 'mermaid':
+        print(GraphDiffer.format_text(diff))
+        print()
+        exporter.write(diff.document, sys.stdout)
+    else:
+        # Документ остальных форматов читается программами: сводка идёт в stderr
+        print(GraphDiffer.format_text(diff), file=sys.stderr)
+        exporter.write(diff.document, sys.stdout)
 
 
 def main() -> None:
@@ -319,6 +299,105 @@ def main() -> None:
         action="store_true",
         help="Include test projects (located in tests/)"
     )
+    parser.add_argument(
+        "--reduce",
+        action="store_true",
+        help="Draw the transitive reduction (omit edges implied by longer paths)"
+    )
+    parser.add_argument(
+        "--fail-on-cycle",
+        action="store_true",
+        help="Exit with code 1 if project dependencies contain a cycle"
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(EXPORTERS),
+        default="mermaid",
+        help="Diagram format (default: mermaid)"
+    )
+    parser.add_argument(
+        "--output",
+        metavar="FILE",
+        help="Write the diagram to FILE instead of stdout"
+    )
+    parser.add_argument(
+        "--cluster",
+        choices=DiagramViews.CLUSTER_MODES,
+        help="Group projects into subgraphs by parent directory, solution folder or dependency cycle"
+    )
+    parser.add_argument(
+        "--collapse",
+        action="store_true",
+        help="Draw one node per cluster with aggregated edges (requires --cluster)"
+    )
+    parser.add_argument(
+        "--focus",
+        metavar="PROJECT",
+        help="Draw only PROJECT and projects within --depth edges of it"
+    )
+    parser.add_argument(
+        "--depth",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Neighbourhood depth for --focus (default: 1)"
+    )
+    parser.add_argument(
+        "--packages",
+        action="store_true",
+        help="Add NuGet packages from obj/project.assets.json (or declared PackageReference) "
+             "and mark conflicting versions and redundant direct references"
+    )
+    parser.add_argument(
+        "--packages-cache",
+        metavar="FILE",
+        help="JSON file caching parsed project.assets.json by content hash between runs"
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Print per-project size (files, lines, bytes, types) and coupling metrics instead of the diagram"
+    )
+    parser.add_argument(
+        "--annotate",
+        action="store_true",
+        help="Add size and instability metrics to diagram node labels"
+    )
+    parser.add_argument(
+        "--check-references",
+        action="store_true",
+        help="Report unused ProjectReferences and projects used only through transitive references "
+             "(exit code 1 if any)"
+    )
+    parser.add_argument(
+        "--build-plan",
+        action="store_true",
+        help="Print parallel build levels and the critical path instead of the diagram"
+    )
+    parser.add_argument(
+        "--build-times",
+        metavar="FILE",
+        help="JSON file with measured build time per project (default weight: source size)"
+    )
+    parser.add_argument(
+        "--affected",
+        nargs="?",
+        const="-",
+        metavar="A..B",
+        help="Print projects to rebuild and tests to run for changed files: "
+             "from `git diff --name-only A..B`, or one path per line from stdin if no range is given"
+    )
+    parser.add_argument(
+        "--diff",
+        nargs=2,
+        metavar=("A", "B"),
+        help="Compare dependency graphs of two git revisions (read from git objects, no checkout)"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print the build plan, metrics, reference check, affected projects or graph diff as JSON"
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -326,6 +405,10 @@ def main() -> None:
     )
     
     args = parser.parse_args()
+    if args.collapse and not args.cluster:
+        parser.error("--collapse requires --cluster")
+    if args.depth < 0:
+        parser.error("--depth must be non-negative")
     
     # Настраиваем логирование
     setup_logging(args.verbose)
@@ -335,20 +418,90 @@ def main() -> None:
         directory = Path(args.directory).resolve()
         logging.debug(f"Analyzing directory: {directory}")
         
+        if args.diff:
+            diff_revisions(directory, args)
+            return
+        
         # Находим файл решения
         sln_path = find_solution_file(directory)
         
         # Парсим решение
         solution = SolutionParser.parse(sln_path)
         
+        if args.affected is not None:
+            print(affected_projects(solution, args))
+            return
+        
         # Анализируем зависимости
         dependencies = DependencyAnalyzer.analyze(solution, args.with_tests)
         
-        # Генерируем диаграмму
-        diagram = MermaidGenerator.generate_diagram(dependencies, solution.name)
+        # Ищем циклы и при необходимости убираем избыточные рёбра
+        graph = ProjectGraph(dependencies)
+        cycles = graph.cycles()
+        for cycle in cycles:
+            logging.warning(f"Dependency cycle: {' -> '.join(cycle)}")
+        if cycles and args.fail_on_cycle:
+            logging.error(f"Found {len(cycles)} dependency cycle(s)")
+            sys.exit(1)
+        
+        if args.build_plan:
+            print(build_plan(solution, dependencies, args))
+            return
+        
+        if args.metrics:
+            metrics = project_metrics(solution, dependencies, args)
+            if args.json:
+                print(MetricsCollector.format_json(metrics, solution.name))
+            else:
+                print(MetricsCollector.format_text(metrics, solution.name))
+            return
         
-        # Выводим результат
-        print(diagram)
+        if args.check_references:
+            text, has_differences = check_references(solution, dependencies, args)
+            print(text)
+            if has_differences:
+                sys.exit(1)
+            return
+        
+        # Метрики считаются по графу проектов, до добавления пакетов
+        annotations = {}
+        if args.annotate:
+            annotations = {
+                m.name: MetricsCollector.annotation(m)
+                for m in project_metrics(solution, dependencies, args)
+            }
+        
+        package_layer = None
+        if args.packages:
+            cache = AssetsCache(Path(args.packages_cache) if args.packages_cache else None)
+            package_layer = PackageAnalyzer.analyze(solution, dependencies, args.with_tests, cache)
+            dependencies = package_layer.dependencies
+            graph = ProjectGraph(dependencies)
+        
+        if args.cluster or args.collapse or args.focus:
+            if args.focus and args.focus not in solution.projects:
+                logging.error(f"Project not found in solution: {args.focus}")
+                sys.exit(1)
+            document = DiagramViews.build(
+                solution, dependencies, args.cluster, args.collapse, args.focus, args.depth
+            )
+        else:
+            if args.reduce:
+                dependencies = graph.transitive_reduction()
+            document = GraphDocument.from_dependencies(dependencies, solution.name)
+        if package_layer is not None:
+            package_layer.apply_styles(document)
+        document.node_labels.update(
+            (node, annotations[node]) for node in document.nodes if node in annotations
+        )
+        
+        # Генерируем диаграмму, записывая её в файл или stdout по мере формирования
+        exporter = EXPORTERS[args.format]
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8', newline='\n') as out:
+                exporter.write(document, out)
+        else:
+            exporter.write(document, sys.stdout)
         
         logging.debug("Diagram generated successfully")
 
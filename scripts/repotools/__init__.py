@@ -0,0 +1,60 @@
+"""
+Инструменты проверки и анализа репозитория C# решения.
+
+Пакет используется скриптами dushnila.py и print-solution-graph.py, которые
+являются обёртками командной строки над ним, и может импортироваться напрямую,
+чтобы выполнять несколько проверок в одном процессе без запуска подпроцессов:
+
+    import sys
+    sys.path.insert(0, "scripts")
+    from repotools import Repo, ResultStore, analyze, check_project_structure, load_solution
+
+    with Repo(".") as repo:
+        report = check_project_structure(repo)   # Report: errors, ok
+        graph = repo.graph(include_tests=False)  # ProjectGraph
+
+    # Проверка группы репозиториев с общим хранилищем результатов по SHA файлов
+    with ResultStore("results.db") as store:
+        reports = [check_project_structure(path, store) for path in paths]
+        print(store.dedup_ratio)
+
+    solution = load_solution("compiler.sln")     # Solution: projects, folders
+    graph = analyze(solution)                    # ProjectGraph: cycles(), reachability(), ...
+
+Модули:
+  solution        модель решения, разбор .sln/.slnx и .csproj
+  repo            Repo и обращения к git
+  results         общее хранилище результатов проверок по SHA содержимого (SQLite)
+  structure       проверки структуры проекта (dushnila.py)
+  editorconfig    модель .editorconfig, правила именования и каталог диагностик
+  file_access     чтение файлов с пределом размера, XML без DTD, ограничение времени проверок
+  generated       сгенерированные файлы ANTLR и Reqnroll и их манифест
+  grammar         статический анализ грамматик ANTLR (.g4)
+  gherkin         разбор сценариев .feature и привязок шагов Reqnroll
+  lexicon         проверка фрагментов кода Vaibik по таблице токенов лексера
+  markdown        якоря заголовков и относительные ссылки документации Markdown
+  similarity      поиск похожих файлов C# в группе репозиториев (MinHash, LSH)
+  analysis        diff ревизий, затронутые проекты, план сборки, метрики, пакеты
+  graph_analysis  алгоритмы на графе зависимостей
+  graph_export    экспорт графа в Mermaid, DOT, JSON, GraphML, CSV
+  nuget_assets    инкрементальный разбор project.assets.json
+  source_scan     параллельное сканирование исходных файлов C# (заголовки, объявления)
+"""
+
+from .graph_analysis import ProjectGraph
+from .repo import Repo
+from .results import ResultStore
+from .solution import Project, Solution, analyze, load_solution
+from .structure import Report, check_project_structure
+
+__all__ = [
+    "Project",
+    "ProjectGraph",
+    "Repo",
+    "Report",
+    "ResultStore",
+    "Solution",
+    "analyze",
+    "check_project_structure",
+    "load_solution",
+]
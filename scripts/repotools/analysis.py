@@ -0,0 +1,899 @@
+"""
+Анализы графа зависимостей решения.
+
+  GitRevisionReader, GraphDiffer   сравнение графов двух ревизий git без checkout
+  AffectedProjectsIndex            проекты и тесты, затронутые изменёнными файлами
+  BuildPlanner                     уровни параллельной сборки и критический путь
+  MetricsCollector                 метрики размера и связности проектов
+  ReferenceChecker                 сверка ProjectReference с использованием пространств имён
+  DiagramViews                     кластеры, свёртка и окрестность проекта для диаграмм
+  PackageAnalyzer                  слой NuGet пакетов
+"""
+
+import json
+import logging
+import os
+import posixpath
+import subprocess
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .graph_analysis import ProjectGraph
+from .graph_export import GraphDocument
+from .nuget_assets import AssetsCache, AssetsSummary, file_hash, parse_assets
+from .repo import list_git_files
+from .solution import (
+    CsprojInfo,
+    CsprojParser,
+    DependencyAnalyzer,
+    Project,
+    ProjectFileIndex,
+    Solution,
+    SolutionParser,
+)
+from .source_scan import count_source, map_batches, scan_header
+
+
+class GitRevisionReader:
+    """Чтение решения и файлов проектов на заданной ревизии прямо из объектов git
+
+    Рабочий каталог не меняется (checkout не выполняется): дерево ревизии читается
+    через `git ls-tree`, содержимое файлов — через `git cat-file --batch`.
+    Разобранные .csproj кэшируются по SHA объекта, поэтому файлы, не изменившиеся
+    между ревизиями, читаются и разбираются один раз.
+    """
+    
+    SOLUTION_SUFFIXES = ('.sln', '.slnx')
+    
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        # Каталог решения относительно корня репозитория: "" или "sub/dir"
+        self.prefix = self._git('rev-parse', '--show-prefix').decode('utf-8').strip().rstrip('/')
+        # SHA объекта .csproj -> сведения о проекте
+        self._csproj_cache: Dict[str, CsprojInfo] = {}
+    
+    def load(self, revision: str, include_tests: bool) -> Tuple[Solution, Dict[str, List[str]]]:
+        """Строит решение и граф зависимостей на ревизии revision"""
+        tree = self._list_tree(revision)
+        
+        solutions = [
+            path for path in tree
+            if posixpath.dirname(path) == self.prefix
+            and path.lower().endswith(self.SOLUTION_SUFFIXES)
+        ]
+        if len(solutions) != 1:
+            raise ValueError(
+                f"Expected exactly one solution file in '{self.prefix or '.'}' at {revision}, "
+                f"found {len(solutions)}"
+            )
+        
+        sln_path = Path(solutions[0])
+        sln_data = self._read_blobs([tree[solutions[0]]])[tree[solutions[0]]]
+        solution = SolutionParser.parse_content(
+            sln_path, sln_data, lambda path: path.as_posix() in tree
+        )
+        
+        missing = sorted({
+            tree[project.csproj_path.as_posix()]
+            for project in solution.projects.values()
+            if tree[project.csproj_path.as_posix()] not in self._csproj_cache
+        })
+        logging.debug(f"{revision}: {len(solution.projects)} projects, {len(missing)} new project blobs")
+        for blob_sha, data in self._read_blobs(missing).items():
+            self._csproj_cache[blob_sha] = CsprojParser.parse_bytes(Path(blob_sha), data)
+        
+        dependencies = DependencyAnalyzer.analyze(
+            solution,
+            include_tests,
+            lambda project: self._csproj_cache[tree[project.csproj_path.as_posix()]].dependencies,
+        )
+        return solution, dependencies
+    
+    def _list_tree(self, revision: str) -> Dict[str, str]:
+        """Файлы решений и проектов в дереве ревизии: путь от корня репозитория -> SHA"""
+        output = self._git('ls-tree', '-r', '-z', '--full-tree', revision)
+        tree: Dict[str, str] = {}
+        for entry in output.decode('utf-8').split('\0'):
+            if not entry:
+                continue
+            meta, path = entry.split('\t', 1)
+            _, object_type, blob_sha = meta.split()
+            if object_type == 'blob' and path.lower().endswith(self.SOLUTION_SUFFIXES + ('.csproj',)):
+                tree[path] = blob_sha
+        return tree
+    
+    def _read_blobs(self, blob_shas: List[str]) -> Dict[str, bytes]:
+        """Читает содержимое объектов одним вызовом git cat-file --batch"""
+        if not blob_shas:
+            return {}
+        
+        output = self._git('cat-file', '--batch', input=''.join(f"{sha}\n" for sha in blob_shas).encode())
+        blobs: Dict[str, bytes] = {}
+        position = 0
+        while position < len(output):
+            header_end = output.index(b'\n', position)
+            header = output[position:header_end].decode('utf-8').split()
+            if len(header) != 3:
+                raise RuntimeError(f"Cannot read git object: {' '.join(header)}")
+            blob_sha, _, size = header
+            start = header_end + 1
+            blobs[blob_sha] = output[start:start + int(size)]
+            # После содержимого объекта git выводит перевод строки
+            position = start + int(size) + 1
+        return blobs
+    
+    def _git(self, *args: str, input: Optional[bytes] = None) -> bytes:
+        try:
+            result = subprocess.run(
+                ["git", *args], cwd=self.directory, input=input, capture_output=True, check=True
+            )
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(
+                f"Failed to execute git {args[0]}: {e.stderr.decode('utf-8', 'replace').strip()}"
+            ) from e
+        except FileNotFoundError:
+            raise RuntimeError("Git is not installed or not in PATH") from None
+        return result.stdout
+
+
+@dataclass
+class GraphDiff:
+    """Различия графов зависимостей двух ревизий"""
+    old_revision: str
+    new_revision: str
+    added_projects: List[str]
+    removed_projects: List[str]
+    added_edges: List[Tuple[str, str]]
+    removed_edges: List[Tuple[str, str]]
+    document: GraphDocument
+
+
+class GraphDiffer:
+    """Сравнение графов зависимостей двух ревизий"""
+    
+    @classmethod
+    def diff(
+        cls,
+        old_revision: str,
+        old: Tuple[Solution, Dict[str, List[str]]],
+        new_revision: str,
+        new: Tuple[Solution, Dict[str, List[str]]],
+        include_tests: bool,
+    ) -> GraphDiff:
+        """Сравнивает проекты и рёбра; документ содержит объединение графов с выделением"""
+        old_projects = cls._projects(old[0], include_tests)
+        new_projects = cls._projects(new[0], include_tests)
+        old_edges = {(source, target) for source, targets in old[1].items() for target in targets}
+        new_edges = {(source, target) for source, targets in new[1].items() for target in targets}
+        
+        added_projects = sorted(new_projects - old_projects)
+        removed_projects = sorted(old_projects - new_projects)
+        added_edges = sorted(new_edges - old_edges)
+        removed_edges = sorted(old_edges - new_edges)
+        
+        nodes = set(added_projects) | set(removed_projects)
+        for source, target in old_edges | new_edges:
+            nodes.update((source, target))
+        
+        document = GraphDocument(
+            name=new[0].name,
+            nodes=sorted(nodes),
+            edges=sorted(old_edges | new_edges),
+            node_styles={
+                **{name: 'added' for name in added_projects},
+                **{name: 'removed' for name in removed_projects},
+            },
+            edge_styles={
+                **{edge: 'added' for edge in added_edges},
+                **{edge: 'removed' for edge in removed_edges},
+            },
+        )
+        return GraphDiff(
+            old_revision=old_revision,
+            new_revision=new_revision,
+            added_projects=added_projects,
+            removed_projects=removed_projects,
+            added_edges=added_edges,
+            removed_edges=removed_edges,
+            document=document,
+        )
+    
+    @classmethod
+    def _projects(cls, solution: Solution, include_tests: bool) -> Set[str]:
+        return {
+            name for name, project in solution.projects.items()
+            if include_tests or not project.is_test
+        }
+    
+    @classmethod
+    def format_text(cls, diff: GraphDiff) -> str:
+        """Текстовая сводка различий"""
+        lines = [f"Dependency graph diff: {diff.old_revision} -> {diff.new_revision}", ""]
+        lines.append(f"Added projects ({len(diff.added_projects)}): {', '.join(diff.added_projects)}")
+        lines.append(f"Removed projects ({len(diff.removed_projects)}): {', '.join(diff.removed_projects)}")
+        lines.append(f"Added edges ({len(diff.added_edges)}):")
+        lines.extend(f"  + {source} --> {target}" for source, target in diff.added_edges)
+        lines.append(f"Removed edges ({len(diff.removed_edges)}):")
+        lines.extend(f"  - {source} --> {target}" for source, target in diff.removed_edges)
+        return "\n".join(lines)
+    
+    @classmethod
+    def format_json(cls, diff: GraphDiff) -> str:
+        """JSON-представление различий"""
+        return json.dumps(
+            {
+                "old_revision": diff.old_revision,
+                "new_revision": diff.new_revision,
+                "added_projects": diff.added_projects,
+                "removed_projects": diff.removed_projects,
+                "added_edges": [list(edge) for edge in diff.added_edges],
+                "removed_edges": [list(edge) for edge in diff.removed_edges],
+            },
+            ensure_ascii=False,
+            indent=2,
+        )
+
+
+class AffectedProjectsIndex:
+    """Индекс для поиска проектов, затронутых изменёнными файлами
+
+    Строится один раз: индекс каталогов проектов и битовые строки транзитивно
+    зависящих проектов. После этого запрос по каждому пути — несколько поисков
+    в словаре и одно объединение битовых строк.
+    """
+    
+    # Файлы вне проектов, изменение которых затрагивает все проекты в их каталоге
+    BUILD_INPUT_FILES = {
+        'directory.build.props',
+        'directory.build.targets',
+        'directory.packages.props',
+        'global.json',
+        'nuget.config',
+        '.editorconfig',
+    }
+    
+    def __init__(self, solution: Solution, dependencies: Dict[str, List[str]]) -> None:
+        self.solution = solution
+        self.file_index = ProjectFileIndex(solution)
+        self.graph = ProjectGraph({name: dependencies.get(name, []) for name in solution.projects})
+        
+        # Для каждого проекта: он сам и все проекты, транзитивно зависящие от него
+        dependents = self.graph.reversed().reachability()
+        self.affected_bits: Dict[str, int] = {
+            name: dependents[node] | (1 << node) for node, name in enumerate(self.graph.names)
+        }
+        self.test_bits = self.graph.bits_of(
+            name for name, project in solution.projects.items() if project.is_test
+        )
+        self.solution_file = Path(os.path.relpath(solution.path, solution.directory)).as_posix()
+    
+    def affected(self, changed_paths: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """Возвращает проекты для пересборки и тестовые проекты для запуска
+
+        Args:
+            changed_paths: Изменённые файлы относительно каталога решения
+        """
+        bits = 0
+        for changed_path in changed_paths:
+            file_path = posixpath.normpath(changed_path.strip().replace('\\', '/'))
+            owner = self.file_index.owner(file_path)
+            if owner is not None:
+                bits |= self.affected_bits[owner]
+            elif file_path == self.solution_file:
+                bits |= self._projects_under('.')
+            elif posixpath.basename(file_path).lower() in self.BUILD_INPUT_FILES:
+                bits |= self._projects_under(posixpath.dirname(file_path) or '.')
+        
+        return (
+            self.graph.names_from_bits(bits),
+            self.graph.names_from_bits(bits & self.test_bits),
+        )
+    
+    def _projects_under(self, directory: str) -> int:
+        """Проекты, каталог которых лежит внутри directory, вместе с зависящими от них"""
+        bits = 0
+        prefix = '' if directory == '.' else directory + '/'
+        for project_directory, name in self.file_index.directories.items():
+            if directory == '.' or project_directory == directory or project_directory.startswith(prefix):
+                bits |= self.affected_bits[name]
+        return bits
+
+
+@dataclass
+class BuildPlan:
+    """План параллельной сборки решения"""
+    solution_name: str
+    levels: List[List[str]]
+    longest_chain: List[str]
+    critical_path: List[str]
+    critical_weight: float
+    weight_unit: str
+    weights: Dict[str, float]
+
+
+class BuildPlanner:
+    """Построение уровней параллельной сборки и критического пути"""
+    
+    @classmethod
+    def source_weights(cls, solution: Solution, project_names: List[str]) -> Dict[str, float]:
+        """Вес проекта — суммарный размер отслеживаемых .cs файлов в его каталоге"""
+        index = ProjectFileIndex(solution)
+        weights = {name: 0.0 for name in project_names}
+        
+        for file_path in list_git_files(solution.directory):
+            if not file_path.endswith('.cs'):
+                continue
+            owner = index.owner(file_path)
+            if owner in weights:
+                try:
+                    weights[owner] += (solution.directory / file_path).stat().st_size
+                except OSError:
+                    logging.debug(f"Skipping unreadable source file: {file_path}")
+        
+        return weights
+    
+    @classmethod
+    def load_weights(cls, weights_path: Path, project_names: List[str]) -> Dict[str, float]:
+        """Читает измеренное время сборки проектов из JSON: {"Project": seconds, ...}"""
+        try:
+            data = json.loads(weights_path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Cannot read build weights file: {weights_path}") from e
+        
+        if not isinstance(data, dict):
+            raise ValueError(f"Build weights file must contain a JSON object: {weights_path}")
+        
+        weights = {}
+        for name in project_names:
+            if name not in data:
+                logging.warning(f"No build time for project {name} in {weights_path}, assuming 0")
+            weights[name] = float(data.get(name, 0.0))
+        return weights
+    
+    @classmethod
+    def plan(
+        cls, graph: ProjectGraph, weights: Dict[str, float], weight_unit: str, solution_name: str
+    ) -> BuildPlan:
+        """Строит план сборки по графу зависимостей"""
+        _, longest_chain = graph.critical_path()
+        critical_weight, critical_path = graph.critical_path(weights)
+        return BuildPlan(
+            solution_name=solution_name,
+            levels=graph.topological_levels(),
+            longest_chain=longest_chain,
+            critical_path=critical_path,
+            critical_weight=critical_weight,
+            weight_unit=weight_unit,
+            weights=weights,
+        )
+    
+    @classmethod
+    def format_text(cls, plan: BuildPlan) -> str:
+        """Текстовое представление плана сборки"""
+        lines = [f"Build plan for solution: {plan.solution_name}", ""]
+        for level, projects in enumerate(plan.levels):
+            lines.append(f"Level {level} ({len(projects)} in parallel): {', '.join(projects)}")
+        lines.append("")
+        lines.append(
+            f"Longest dependency chain ({len(plan.longest_chain)} projects): "
+            f"{' -> '.join(plan.longest_chain)}"
+        )
+        lines.append(
+            f"Critical path ({plan.critical_weight:g} {plan.weight_unit}): "
+            f"{' -> '.join(plan.critical_path)}"
+        )
+        return "\n".join(lines)
+    
+    @classmethod
+    def format_json(cls, plan: BuildPlan) -> str:
+        """JSON-представление плана сборки"""
+        return json.dumps(
+            {
+                "solution": plan.solution_name,
+                "levels": plan.levels,
+                "longest_chain": plan.longest_chain,
+                "critical_path": {
+                    "projects": plan.critical_path,
+                    "weight": plan.critical_weight,
+                    "unit": plan.weight_unit,
+                },
+                "weights": dict(sorted(plan.weights.items())),
+            },
+            ensure_ascii=False,
+            indent=2,
+        )
+
+
+@dataclass
+class ProjectMetrics:
+    """Метрики размера и связности проекта"""
+    name: str
+    files: int = 0
+    lines: int = 0
+    bytes: int = 0
+    types: int = 0
+    # Число проектов, зависящих от данного (Ca), и число его зависимостей (Ce)
+    fan_in: int = 0
+    fan_out: int = 0
+    
+    @property
+    def instability(self) -> float:
+        """Нестабильность Ce / (Ca + Ce): 0 — от проекта только зависят, 1 — он только зависит"""
+        total = self.fan_in + self.fan_out
+        return self.fan_out / total if total else 0.0
+
+
+class MetricsCollector:
+    """Метрики проектов: размер отслеживаемых .cs файлов и связность в графе"""
+    
+    COLUMNS = ("Project", "Files", "Lines", "Bytes", "Types", "Fan-in", "Fan-out", "Instability")
+    
+    @classmethod
+    def collect(
+        cls, solution: Solution, dependencies: Dict[str, List[str]], project_names: List[str]
+    ) -> List[ProjectMetrics]:
+        """Считает метрики за один проход по `git ls-files` и параллельный подсчёт файлов"""
+        index = ProjectFileIndex(solution)
+        metrics = {name: ProjectMetrics(name) for name in project_names}
+        
+        owners: List[str] = []
+        paths: List[str] = []
+        for file_path in list_git_files(solution.directory):
+            if not file_path.endswith('.cs'):
+                continue
+            owner = index.owner(file_path)
+            if owner in metrics:
+                owners.append(owner)
+                paths.append(str(solution.directory / file_path))
+        logging.debug(f"Counting {len(paths)} source file(s)")
+        
+        for owner, counts in zip(owners, map_batches(count_source, paths)):
+            project = metrics[owner]
+            project.files += 1
+            project.lines += counts.lines
+            project.bytes += counts.bytes
+            project.types += counts.types
+        
+        for source in project_names:
+            for target in dependencies.get(source, []):
+                if target in metrics:
+                    metrics[source].fan_out += 1
+                    metrics[target].fan_in += 1
+        
+        return [metrics[name] for name in project_names]
+    
+    @classmethod
+    def annotation(cls, project: ProjectMetrics) -> str:
+        """Подпись узла диаграммы: имя проекта и основные метрики"""
+        return (
+            f"{project.name}\n"
+            f"{project.lines} lines, {project.types} types\n"
+            f"I={project.instability:.2f}"
+        )
+    
+    @classmethod
+    def format_text(cls, metrics: List[ProjectMetrics], solution_name: str) -> str:
+        """Таблица метрик с итоговой строкой"""
+        rows = [
+            [m.name, m.files, m.lines, m.bytes, m.types, m.fan_in, m.fan_out, f"{m.instability:.2f}"]
+            for m in metrics
+        ]
+        rows.append([
+            "Total",
+            sum(m.files for m in metrics),
+            sum(m.lines for m in metrics),
+            sum(m.bytes for m in metrics),
+            sum(m.types for m in metrics),
+            "", "", "",
+        ])
+        table = [list(cls.COLUMNS)] + [[str(value) for value in row] for row in rows]
+        widths = [max(len(row[column]) for row in table) for column in range(len(cls.COLUMNS))]
+        
+        lines = [f"Metrics for solution: {solution_name}", ""]
+        for row in table:
+            cells = [row[0].ljust(widths[0])] + [
+                value.rjust(width) for value, width in zip(row[1:], widths[1:])
+            ]
+            lines.append("  ".join(cells).rstrip())
+        return "\n".join(lines)
+    
+    @classmethod
+    def format_json(cls, metrics: List[ProjectMetrics], solution_name: str) -> str:
+        """JSON-представление метрик"""
+        return json.dumps(
+            {
+                "solution": solution_name,
+                "projects": {
+                    m.name: {
+                        "files": m.files,
+                        "lines": m.lines,
+                        "bytes": m.bytes,
+                        "types": m.types,
+                        "fan_in": m.fan_in,
+                        "fan_out": m.fan_out,
+                        "instability": round(m.instability, 4),
+                    }
+                    for m in metrics
+                },
+            },
+            ensure_ascii=False,
+            indent=2,
+        )
+
+
+@dataclass
+class ReferenceReport:
+    """Расхождения между фактическим использованием проектов и ProjectReference"""
+    solution_name: str
+    # (проект, ссылка), из пространств имён которой в проекте ничего не подключено
+    unused: List[Tuple[str, str]] = field(default_factory=list)
+    # (проект, используемый проект, путь по объявленным ссылкам или None)
+    undeclared: List[Tuple[str, str, Optional[List[str]]]] = field(default_factory=list)
+
+
+class ReferenceChecker:
+    """Сравнение графа использования пространств имён с графом ProjectReference
+
+    Из заголовков отслеживаемых .cs файлов (модуль source_scan.py) строится
+    отображение "пространство имён -> проекты, которые его объявляют" и множество
+    подключённых каждым проектом пространств имён (директивы using, <Using> в .csproj
+    и объемлющие пространства имён самих файлов). Полностью квалифицированные
+    имена в теле файлов не учитываются.
+    """
+    
+    @classmethod
+    def resolve(cls, name: str, declared: Dict[str, Set[str]]) -> Set[str]:
+        """Проекты, объявляющие пространство имён name или ближайшее объемлющее
+
+        Для `using static X.Y.Type` и псевдонимов типов имя длиннее пространства имён.
+        """
+        while name:
+            projects = declared.get(name)
+            if projects:
+                return projects
+            name = name.rpartition('.')[0]
+        return set()
+    
+    @classmethod
+    def check(
+        cls, solution: Solution, dependencies: Dict[str, List[str]], project_names: List[str]
+    ) -> ReferenceReport:
+        """Сканирует заголовки файлов проектов и сравнивает использование с объявлениями"""
+        index = ProjectFileIndex(solution)
+        selected = set(project_names)
+        owners: List[str] = []
+        paths: List[str] = []
+        for file_path in list_git_files(solution.directory):
+            if file_path.endswith('.cs'):
+                owner = index.owner(file_path)
+                if owner in selected:
+                    owners.append(owner)
+                    paths.append(str(solution.directory / file_path))
+        logging.debug(f"Scanning headers of {len(paths)} source file(s)")
+        headers = map_batches(scan_header, paths)
+        
+        declared: Dict[str, Set[str]] = defaultdict(set)
+        imported: Dict[str, Set[str]] = {name: set() for name in project_names}
+        for owner, header in zip(owners, headers):
+            imported[owner].update(header.usings)
+            for namespace in header.namespaces:
+                declared[namespace].add(owner)
+                # Типы объемлющих пространств имён доступны без using
+                parent = namespace.rpartition('.')[0]
+                while parent:
+                    imported[owner].add(parent)
+                    parent = parent.rpartition('.')[0]
+        for name in project_names:
+            imported[name].update(CsprojParser.parse(solution.projects[name].csproj_path).usings)
+        
+        graph = ProjectGraph({name: dependencies.get(name, []) for name in project_names})
+        report = ReferenceReport(solution.name)
+        for name in project_names:
+            references = set(dependencies.get(name, []))
+            used: Set[str] = set()
+            missing: Set[str] = set()
+            for namespace in imported[name]:
+                candidates = cls.resolve(namespace, declared)
+                if not candidates or name in candidates:
+                    continue
+                direct = candidates & references
+                if direct:
+                    used.update(direct)
+                else:
+                    # Из нескольких объявляющих проектов предпочитаем достижимый
+                    missing.add(min(candidates, key=lambda c: (not graph.reaches(name, c), c)))
+            
+            report.unused.extend((name, reference) for reference in sorted(references - used))
+            for target in sorted(missing):
+                path = graph.shortest_path(name, target) if graph.reaches(name, target) else None
+                report.undeclared.append((name, target, path))
+        return report
+    
+    @classmethod
+    def format_text(cls, report: ReferenceReport) -> str:
+        """Текстовый отчёт о расхождениях"""
+        lines = [f"Reference check for solution: {report.solution_name}", ""]
+        if not report.unused and not report.undeclared:
+            lines.append("Namespace usage matches ProjectReference declarations")
+            return "\n".join(lines)
+        
+        if report.unused:
+            lines.append(f"Unused ProjectReference ({len(report.unused)}):")
+            lines.extend(f"  {project} -> {reference}" for project, reference in report.unused)
+        if report.undeclared:
+            if report.unused:
+                lines.append("")
+            lines.append(f"Used without ProjectReference ({len(report.undeclared)}):")
+            for project, target, path in report.undeclared:
+                reason = f"only through {' -> '.join(path)}" if path else "not referenced"
+                lines.append(f"  {project} -> {target} ({reason})")
+        return "\n".join(lines)
+    
+    @classmethod
+    def format_json(cls, report: ReferenceReport) -> str:
+        """JSON-представление отчёта"""
+        return json.dumps(
+            {
+                "solution": report.solution_name,
+                "unused": [list(edge) for edge in report.unused],
+                "undeclared": [
+                    {"project": project, "uses": target, "path": path}
+                    for project, target, path in report.undeclared
+                ],
+            },
+            ensure_ascii=False,
+            indent=2,
+        )
+
+
+class DiagramViews:
+    """Упрощённые представления диаграммы для больших решений
+
+    Все представления строятся по транзитивному сокращению графа: в нём меньше
+    рёбер, поэтому и окрестность проекта, и свёрнутые кластеры остаются обозримыми.
+    """
+    
+    CLUSTER_MODES = ('directory', 'folder', 'scc')
+    
+    @classmethod
+    def clusters(cls, solution: Solution, graph: ProjectGraph, mode: str) -> Dict[str, List[str]]:
+        """Группирует узлы графа в кластеры
+
+        Args:
+            mode: directory — по каталогу, содержащему каталог проекта (src, tests, ...);
+                  folder — по папкам решения; scc — по циклам зависимостей
+
+        Returns:
+            Подпись кластера -> отсортированные узлы. Узлы вне кластеров не включаются.
+        """
+        clusters: Dict[str, List[str]] = defaultdict(list)
+        if mode == 'scc':
+            for component in graph.strongly_connected_components():
+                if len(component) > 1:
+                    names = sorted(graph.names[node] for node in component)
+                    clusters[f"cycle: {', '.join(names)}"] = names
+            return dict(clusters)
+        
+        for name in graph.names:
+            project = solution.projects.get(name)
+            if project is None:
+                continue
+            if mode == 'folder':
+                label = project.folder
+            else:
+                directory = os.path.relpath(project.csproj_path.parent, solution.directory)
+                label = posixpath.dirname(Path(directory).as_posix())
+            if label:
+                clusters[label].append(name)
+        return dict(clusters)
+    
+    @classmethod
+    def build(
+        cls,
+        solution: Solution,
+        dependencies: Dict[str, List[str]],
+        cluster_mode: Optional[str] = None,
+        collapse: bool = False,
+        focus: Optional[str] = None,
+        depth: int = 1,
+    ) -> GraphDocument:
+        """Строит документ диаграммы с кластерами, свёрткой и/или окрестностью проекта"""
+        graph = ProjectGraph(dependencies)
+        # В сокращении нет проектов без зависимостей — они остаются отдельными узлами
+        reduced = {name: [] for name in graph.names}
+        reduced.update(graph.transitive_reduction())
+        
+        if focus is not None:
+            # Проект без зависимостей в графе отсутствует — показываем его одного
+            graph = ProjectGraph({focus: [], **reduced})
+            reduced = graph.subgraph(graph.neighbourhood(focus, depth))
+            logging.debug(f"Focus on {focus}: {len(reduced)} project(s) within depth {depth}")
+        
+        graph = ProjectGraph(reduced)
+        clusters = cls.clusters(solution, graph, cluster_mode) if cluster_mode else {}
+        
+        if not collapse:
+            document = GraphDocument.from_dependencies(reduced, solution.name)
+            document.clusters = clusters
+            return document
+        
+        group_of = {name: label for label, names in clusters.items() for name in names}
+        collapsed, counts = graph.quotient(group_of)
+        # После свёртки часть рёбер между кластерами снова становится избыточной
+        # Узлами остаются все группы: кластер без связей с другими тоже показывается
+        reduction = ProjectGraph(collapsed).transitive_reduction()
+        document = GraphDocument(
+            name=solution.name,
+            nodes=sorted(collapsed),
+            edges=sorted((source, target) for source, targets in reduction.items() for target in targets),
+        )
+        document.edge_labels = {
+            edge: str(counts[edge]) for edge in document.edges if counts[edge] > 1
+        }
+        return document
+
+
+@dataclass
+class PackageLayer:
+    """Объединённый граф проектов и NuGet пакетов"""
+    # Узел -> зависимости; пакеты именуются "Имя/Версия"
+    dependencies: Dict[str, List[str]]
+    # Стили узлов (package, conflict) и рёбер (duplicate)
+    node_styles: Dict[str, str] = field(default_factory=dict)
+    edge_styles: Dict[Tuple[str, str], str] = field(default_factory=dict)
+    
+    def apply_styles(self, document: GraphDocument) -> None:
+        """Выделяет пакеты, конфликты версий и дублирующие ссылки в документе"""
+        nodes = set(document.nodes)
+        edges = set(document.edges)
+        document.node_styles.update(
+            (node, style) for node, style in self.node_styles.items() if node in nodes
+        )
+        document.edge_styles.update(
+            (edge, style) for edge, style in self.edge_styles.items() if edge in edges
+        )
+
+
+class PackageAnalyzer:
+    """Слой NuGet пакетов: project.assets.json или объявленные PackageReference
+
+    Для проекта, у которого выполнен restore, пакеты и их транзитивные зависимости
+    читаются из obj/project.assets.json (модуль nuget_assets.py), иначе берутся
+    PackageReference из .csproj и ближайшего Directory.Build.props.
+    """
+    
+    ASSETS_FILE = 'project.assets.json'
+    BUILD_PROPS_FILE = 'Directory.Build.props'
+    
+    @classmethod
+    def package_node(cls, name: str, version: str) -> str:
+        """Имя узла пакета в графе"""
+        return f"{name}/{version}" if version else name
+    
+    @classmethod
+    def assets_path(cls, project: Project) -> Path:
+        """Путь к project.assets.json с учётом MSBuildProjectExtensionsPath в .csproj"""
+        properties = CsprojParser.parse(project.csproj_path).properties
+        for name in ('MSBuildProjectExtensionsPath', 'BaseIntermediateOutputPath'):
+            value = properties.get(name, '')
+            # Значения с подстановками MSBuild не вычисляются
+            if value and '$(' not in value:
+                return project.csproj_path.parent / value.replace('\\', '/') / cls.ASSETS_FILE
+        return project.csproj_path.parent / 'obj' / cls.ASSETS_FILE
+    
+    @classmethod
+    def declared_packages(cls, project: Project) -> Dict[str, str]:
+        """Пакеты проекта из PackageReference: Directory.Build.props, затем .csproj"""
+        packages: Dict[str, str] = {}
+        # MSBuild импортирует только ближайший Directory.Build.props выше проекта
+        for directory in project.csproj_path.parents:
+            props_path = directory / cls.BUILD_PROPS_FILE
+            if props_path.is_file():
+                packages.update(CsprojParser.parse(props_path).packages)
+                break
+        
+        info = CsprojParser.parse(project.csproj_path)
+        packages.update(info.packages)
+        for name, version in info.package_updates.items():
+            if name in packages and version:
+                packages[name] = version
+        return packages
+    
+    @classmethod
+    def load_assets(cls, paths: List[Path], cache: AssetsCache) -> Dict[Path, AssetsSummary]:
+        """Разбирает project.assets.json, которых нет в кэше; файлы разбираются параллельно"""
+        keys = {path: file_hash(path) for path in paths}
+        missing = sorted({key: path for path, key in keys.items() if cache.get(key) is None}.items())
+        logging.debug(f"Assets files: {len(paths)}, cached: {len(paths) - len(missing)}")
+        
+        missing_paths = [path for _, path in missing]
+        if len(missing_paths) > 1 and (os.cpu_count() or 1) > 1:
+            # Разбор JSON упирается в процессор и GIL, поэтому нужны процессы, а не потоки
+            with ProcessPoolExecutor() as executor:
+                summaries = list(executor.map(parse_assets, missing_paths))
+        else:
+            summaries = [parse_assets(path) for path in missing_paths]
+        for (key, _), summary in zip(missing, summaries):
+            cache.put(key, summary)
+        return {path: cache.get(key) for path, key in keys.items()}
+    
+    @classmethod
+    def analyze(
+        cls,
+        solution: Solution,
+        dependencies: Dict[str, List[str]],
+        include_tests: bool = False,
+        cache: Optional[AssetsCache] = None,
+    ) -> PackageLayer:
+        """Добавляет к графу проектов пакеты, от которых они зависят
+
+        Узлы пакетов с несколькими версиями в решении помечаются стилем conflict,
+        а прямые ссылки на пакет, который и так приходит транзитивно, — duplicate.
+        """
+        if cache is None:
+            cache = AssetsCache()
+        
+        projects = [
+            project for project in solution.projects.values()
+            if include_tests or not project.is_test
+        ]
+        assets_paths = {project.name: cls.assets_path(project) for project in projects}
+        existing = [path for path in assets_paths.values() if path.is_file()]
+        summaries: Dict[Path, AssetsSummary] = {}
+        try:
+            summaries = cls.load_assets(existing, cache)
+        except (OSError, ValueError):
+            logging.exception("Failed to read project.assets.json; using declared PackageReference")
+        
+        combined: Dict[str, Set[str]] = defaultdict(set)
+        for source, targets in dependencies.items():
+            combined[source].update(targets)
+        direct_edges: Set[Tuple[str, str]] = set()
+        versions: Dict[str, Set[str]] = defaultdict(set)
+        
+        for project in projects:
+            summary = summaries.get(assets_paths[project.name])
+            if summary is not None:
+                logging.debug(f"Packages of {project.name}: {assets_paths[project.name]}")
+                for name, package_versions in summary.packages.items():
+                    versions[name].update(package_versions)
+                    for version in package_versions:
+                        node = cls.package_node(name, version)
+                        for dependency in summary.package_dependencies.get(name, []):
+                            for dependency_version in summary.packages.get(dependency, ['']):
+                                combined[node].add(cls.package_node(dependency, dependency_version))
+                direct = {
+                    cls.package_node(name, version)
+                    for name in summary.direct
+                    for version in summary.packages.get(name, [''])
+                }
+            else:
+                logging.debug(f"Packages of {project.name}: declared PackageReference")
+                declared = cls.declared_packages(project)
+                for name, version in declared.items():
+                    versions[name].add(version)
+                direct = {cls.package_node(name, version) for name, version in declared.items()}
+            
+            combined[project.name].update(direct)
+            direct_edges.update((project.name, node) for node in direct)
+        
+        cache.save()
+        
+        layer = PackageLayer({name: sorted(targets) for name, targets in sorted(combined.items())})
+        conflicting = {name for name, found in versions.items() if len(found) > 1}
+        for name, found in versions.items():
+            for version in found:
+                node = cls.package_node(name, version)
+                layer.node_styles[node] = 'conflict' if name in conflicting else 'package'
+        
+        reduced = ProjectGraph(layer.dependencies).transitive_reduction()
+        kept = {(source, target) for source, targets in reduced.items() for target in targets}
+        for edge in direct_edges - kept:
+            layer.edge_styles[edge] = 'duplicate'
+        
+        if conflicting:
+            logging.warning(f"Packages with conflicting versions: {', '.join(sorted(conflicting))}")
+        return layer
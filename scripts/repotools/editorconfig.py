@@ -0,0 +1,236 @@
+"""
+Модель файла .editorconfig и проверка правил именования и диагностик.
+
+Используется проверкой EditorConfigChecker (dushnila.py).
+
+Файл разбирается за один проход по строкам в индексированную модель:
+  - секции по шаблону файлов (`[*.cs]`) с ключами и номерами строк;
+  - правила именования `dotnet_naming_rule.<имя>.{symbols,style,severity}`,
+    группы символов `dotnet_naming_symbols.<имя>.*` и стили
+    `dotnet_naming_style.<имя>.*` — словари по имени;
+  - уровни диагностик `dotnet_diagnostic.<ID>.severity`.
+
+Ссылки правил на группы символов и стили разрешаются поиском в словарях.
+Идентификаторы диагностик сверяются со встроенным каталогом ANALYZER_RULES:
+списки правил анализаторов из пакетов, которые требует BuildPropsChecker, и
+анализаторов стиля кода .NET SDK, диапазон предупреждений компилятора.
+Диагностика, настроенная в нескольких секциях, отмечается предупреждением.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Каталог правил: пакет (или "sdk") -> идентификаторы правил. `CA1700-1727` — все
+# номера от первого до последнего; перечислены правила версий пакетов из
+# Directory.Build.props (NetAnalyzers 8, Roslynator 4.13, StyleCop 1.1.118,
+# xunit.analyzers 1.23), включая устаревшие. Предупреждения компилятора (CS)
+# задаются диапазоном: их номера не перечисляются
+ANALYZER_RULES: Dict[str, str] = {
+    "sdk": """
+        CS0001-9999
+        IDE0001-0005 IDE0007-0011 IDE0016-0066 IDE0070-0084 IDE0090 IDE0100 IDE0110 IDE0120-0121
+        IDE0130 IDE0150 IDE0160-0161 IDE0170 IDE0180 IDE0200 IDE0210-0211 IDE0220 IDE0230
+        IDE0240-0241 IDE0250-0251 IDE0260 IDE0270 IDE0280 IDE0290 IDE0300-0306 IDE0320 IDE0330
+        IDE0340 IDE0350 IDE0360 IDE0370 IDE0380 IDE1005-1006 IDE2000-2006 IDE3000
+    """,
+    "Microsoft.CodeAnalysis.NetAnalyzers": """
+        CA1000-1003 CA1005 CA1008 CA1010 CA1012 CA1014 CA1016-1019 CA1021 CA1024 CA1027-1028
+        CA1030-1034 CA1036 CA1040-1041 CA1043-1047 CA1050-1056 CA1058 CA1060-1070
+        CA1200 CA1303-1305 CA1307-1311 CA1401 CA1416-1422
+        CA1501-1502 CA1505-1516
+        CA1700 CA1707-1708 CA1710-1717 CA1720-1721 CA1724-1725 CA1727
+        CA1801-1802 CA1805-1806 CA1810 CA1812-1816 CA1819-1875
+        CA2000 CA2002 CA2007-2009 CA2011-2025
+        CA2100-2101 CA2109 CA2119 CA2153
+        CA2200-2201 CA2207-2208 CA2211 CA2213-2219 CA2224-2227 CA2229 CA2231 CA2234-2235 CA2237
+        CA2241-2265
+        CA2300-2302 CA2305 CA2310-2312 CA2315 CA2321-2322 CA2326-2330 CA2350-2356 CA2361-2362
+        CA3001-3012 CA3061 CA3075-3077 CA3147
+        CA5350-5351 CA5358-5405
+    """,
+    "Roslynator.Analyzers": """
+        RCS1001-1010 RCS1012-1052 RCS1055-1061 RCS1063-1066 RCS1068-1081 RCS1084-1091
+        RCS1093-1094 RCS1096-1108 RCS1110-1114 RCS1118 RCS1123-1124 RCS1126 RCS1128-1130
+        RCS1132-1136 RCS1138-1143 RCS1145-1146 RCS1151 RCS1154-1166 RCS1168-1177 RCS1179-1182
+        RCS1186-1218 RCS1220-1244 RCS1246-1268
+    """,
+    "StyleCop.Analyzers": """
+        SA0001-0002 SA1000-1028 SA1100-1139 SA1141-1142 SA1200-1217 SA1300-1316
+        SA1400-1414 SA1500-1520 SA1600-1651 SX1101 SX1309
+    """,
+    "xunit.analyzers": "xUnit1000-1051 xUnit2000-2032 xUnit3000-3003",
+}
+
+SEVERITIES = {"none", "silent", "suggestion", "warning", "error", "default"}
+CAPITALIZATIONS = {"pascal_case", "camel_case", "first_word_upper", "all_upper", "all_lower"}
+
+# Свойства элементов именования: префикс ключа -> допустимые свойства
+NAMING_PROPERTIES = {
+    "dotnet_naming_rule": {"symbols", "style", "severity"},
+    "dotnet_naming_symbols": {"applicable_kinds", "applicable_accessibilities", "required_modifiers"},
+    "dotnet_naming_style": {"capitalization", "required_prefix", "required_suffix", "word_separator"},
+}
+
+DIAGNOSTIC_ID_PATTERN = re.compile(r"^([A-Za-z]+)0*(\d+)$")
+# Элемент каталога ANALYZER_RULES: идентификатор или диапазон `CA1700-1727`
+RULE_RANGE_PATTERN = re.compile(r"^([A-Za-z]+)(\d+)(?:-(\d+))?$")
+
+
+@dataclass
+class Entry:
+    """Ключ .editorconfig: секция, значение и номер строки"""
+    section: str
+    key: str
+    value: str
+    line: int
+
+
+@dataclass
+class EditorConfig:
+    """Индексированная модель .editorconfig"""
+
+    # Шаблон секции -> ключ -> запись (ключи до первой секции — в секции "root")
+    sections: Dict[str, Dict[str, Entry]] = field(default_factory=dict)
+    # Префикс именования -> имя элемента -> свойство -> запись
+    naming: Dict[str, Dict[str, Dict[str, Entry]]] = field(
+        default_factory=lambda: {prefix: {} for prefix in NAMING_PROPERTIES}
+    )
+    # Идентификатор диагностики -> запись dotnet_diagnostic.<ID>.severity
+    diagnostics: Dict[str, Entry] = field(default_factory=dict)
+    # (серьёзность "error"/"warning", строка, сообщение)
+    problems: List[Tuple[str, int, str]] = field(default_factory=list)
+
+    def values(self) -> Dict[str, Dict[str, str]]:
+        """Значения ключей по секциям (повторные секции объединены)"""
+        return {
+            section: {key: entry.value for key, entry in entries.items()}
+            for section, entries in self.sections.items()
+        }
+
+
+def parse_editorconfig(lines: Iterable[str]) -> EditorConfig:
+    """Разбирает .editorconfig за один проход; повторы и переопределения ключей
+    в одной секции записываются в problems"""
+    config = EditorConfig()
+    section = "root"
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line.startswith("[") and line.endswith("]"):
+            section = line[1:-1]
+            continue
+        if "=" not in line:
+            config.problems.append(("error", line_number, f"строка без `=`: {line}"))
+            continue
+        key, value = (part.strip() for part in line.split("=", 1))
+        entry = Entry(section, key, value, line_number)
+
+        # Ключи нечувствительны к регистру
+        entries = config.sections.setdefault(section, {})
+        previous = entries.get(key.lower())
+        if previous is not None:
+            if previous.value == value:
+                config.problems.append(
+                    ("warning", line_number, f"{key} повторяет значение из строки {previous.line}")
+                )
+            else:
+                config.problems.append(
+                    ("warning", line_number, f"{key} = {value} переопределяет {previous.value} из строки {previous.line}")
+                )
+        entries[key.lower()] = entry
+        _index_entry(config, entry)
+    return config
+
+
+def _index_entry(config: EditorConfig, entry: Entry) -> None:
+    prefix, _, rest = entry.key.partition(".")
+    prefix = prefix.lower()
+    if prefix in NAMING_PROPERTIES:
+        name, _, prop = rest.rpartition(".")
+        prop = prop.lower()
+        if not name or prop not in NAMING_PROPERTIES[prefix]:
+            config.problems.append(("error", entry.line, f"неизвестное свойство {entry.key}"))
+            return
+        config.naming[prefix].setdefault(name, {})[prop] = entry
+    elif prefix == "dotnet_diagnostic":
+        diagnostic_id, _, prop = rest.rpartition(".")
+        if prop.lower() != "severity" or not diagnostic_id:
+            config.problems.append(("error", entry.line, f"неизвестное свойство {entry.key}"))
+            return
+        previous = config.diagnostics.get(diagnostic_id)
+        if previous is not None and previous.section != entry.section:
+            # Повтор в той же секции уже отмечен как повтор ключа
+            config.problems.append((
+                "warning", entry.line,
+                f"диагностика {diagnostic_id} уже настроена в секции [{previous.section}] в строке {previous.line}",
+            ))
+        config.diagnostics[diagnostic_id] = entry
+
+
+def rule_catalog(packages: Iterable[str]) -> Dict[str, Set[int]]:
+    """Номера правил по префиксу (строчными буквами) для SDK и указанных пакетов"""
+    catalog: Dict[str, Set[int]] = {}
+    for package in ["sdk", *packages]:
+        for item in ANALYZER_RULES.get(package, "").split():
+            match = RULE_RANGE_PATTERN.match(item)
+            if match is None:
+                raise ValueError(f"неверный элемент каталога правил {package}: {item}")
+            first = int(match.group(2))
+            last = int(match.group(3)) if match.group(3) else first
+            catalog.setdefault(match.group(1).lower(), set()).update(range(first, last + 1))
+    return catalog
+
+
+def check_references(config: EditorConfig, catalog: Dict[str, Set[int]]) -> List[Tuple[str, int, str]]:
+    """Висячие ссылки правил именования, неизвестные значения и идентификаторы диагностик"""
+    problems: List[Tuple[str, int, str]] = []
+    rules = config.naming["dotnet_naming_rule"]
+    symbols = config.naming["dotnet_naming_symbols"]
+    styles = config.naming["dotnet_naming_style"]
+    used_symbols = set()
+    used_styles = set()
+
+    for name, props in rules.items():
+        line = min(entry.line for entry in props.values())
+        for prop in ("symbols", "style", "severity"):
+            if prop not in props:
+                problems.append(("error", line, f"у правила именования {name} нет свойства {prop}"))
+        if "symbols" in props:
+            used_symbols.add(props["symbols"].value)
+            if props["symbols"].value not in symbols:
+                problems.append((
+                    "error", props["symbols"].line,
+                    f"правило {name} ссылается на неопределённую группу dotnet_naming_symbols.{props['symbols'].value}",
+                ))
+        if "style" in props:
+            used_styles.add(props["style"].value)
+            if props["style"].value not in styles:
+                problems.append((
+                    "error", props["style"].line,
+                    f"правило {name} ссылается на неопределённый стиль dotnet_naming_style.{props['style'].value}",
+                ))
+        if "severity" in props and props["severity"].value not in SEVERITIES:
+            problems.append(("error", props["severity"].line, f"неизвестный уровень {props['severity'].value} правила {name}"))
+
+    for name, props in symbols.items():
+        if name not in used_symbols:
+            problems.append(("warning", min(entry.line for entry in props.values()), f"группа символов {name} не используется"))
+    for name, props in styles.items():
+        if name not in used_styles:
+            problems.append(("warning", min(entry.line for entry in props.values()), f"стиль именования {name} не используется"))
+        capitalization = props.get("capitalization")
+        if capitalization is None:
+            problems.append(("error", min(entry.line for entry in props.values()), f"у стиля {name} нет свойства capitalization"))
+        elif capitalization.value not in CAPITALIZATIONS:
+            problems.append(("error", capitalization.line, f"неизвестный регистр {capitalization.value} стиля {name}"))
+
+    for diagnostic_id, entry in config.diagnostics.items():
+        severity = entry.value.split(":")[0].strip()
+        if severity not in SEVERITIES:
+            problems.append(("error", entry.line, f"неизвестный уровень {entry.value} диагностики {diagnostic_id}"))
+        match = DIAGNOSTIC_ID_PATTERN.match(diagnostic_id)
+        if match is None or int(match.group(2)) not in catalog.get(match.group(1).lower(), set()):
+            problems.append(("error", entry.line, f"диагностика {diagnostic_id} не найдена в каталоге правил анализаторов"))
+    return problems
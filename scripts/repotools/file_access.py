@@ -0,0 +1,174 @@
+"""
+Ограниченный по ресурсам доступ к файлам проверяемого репозитория.
+
+Используется проверками dushnila.py (BuildPropsChecker, EditorConfigChecker,
+LicenseChecker, ReadmeChecker и ограничение времени каждой проверки) и
+разбором .csproj (solution.CsprojParser).
+
+Один испорченный или враждебный репозиторий не должен останавливать проверку
+группы: LICENSE размером в гигабайты, Directory.Build.props с «бомбой» из
+вложенных сущностей XML, двоичный файл под видом .csproj, именованный канал
+вместо файла. Поэтому:
+  - читаются только обычные файлы и не больше заданного числа байт: чтение идёт
+    блоками по CHUNK_SIZE и прекращается, как только предел превышен (размер
+    из stat не гарантирует размер прочитанного — файл может расти);
+  - текстовые файлы с нулевыми байтами считаются двоичными;
+  - XML разбирается expat без DTD: объявление <!DOCTYPE> — ошибка, поэтому
+    сущности не объявляются и не раскрываются, внешние ресурсы не загружаются;
+  - проверка выполняется с ограничением времени time_limit: в главном потоке
+    на Unix по сигналу SIGALRM (прерывается и разбор, занятый процессором),
+    иначе — между блоками чтения файлов.
+
+Ошибки чтения и разбора — FileAccessError (подкласс ValueError), превышение
+времени — CheckTimeoutError.
+"""
+
+import os
+import signal
+import stat
+import threading
+import time
+import xml.etree.ElementTree as ET
+import xml.parsers.expat as expat
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, NoReturn, Optional, Union
+
+# Размер блока чтения файла
+CHUNK_SIZE = 64 * 1024
+
+# Ограничение времени каждой проверки dushnila.py по умолчанию, секунды
+CHECK_TIMEOUT = 60.0
+
+# Срок текущего ограничения времени (time.monotonic) в этом потоке
+_local = threading.local()
+
+
+class FileAccessError(ValueError):
+    """Файл превышает предел размера, двоичный, не является обычным файлом или небезопасный XML"""
+
+
+class CheckTimeoutError(BaseException):
+    """Превышено ограничение времени time_limit
+
+    Наследуется от BaseException, как KeyboardInterrupt: проверки перехватывают
+    Exception, чтобы сообщить об ошибке в файле, и не должны продолжать работу
+    после истечения времени.
+    """
+
+    def __init__(self, seconds: float) -> None:
+        super().__init__(f"time limit of {seconds:g} s exceeded")
+        self.seconds = seconds
+
+
+def _check_deadline() -> None:
+    deadline = getattr(_local, "deadline", None)
+    if deadline is not None and time.monotonic() > deadline[0]:
+        raise CheckTimeoutError(deadline[1])
+
+
+@contextmanager
+def time_limit(seconds: Optional[float]) -> Iterator[None]:
+    """Ограничивает время выполнения блока; по истечении выбрасывается CheckTimeoutError
+
+    Вложенные ограничения не поддерживаются. None или 0 — без ограничения.
+    """
+    if not seconds:
+        yield
+        return
+    previous = getattr(_local, "deadline", None)
+    _local.deadline = (time.monotonic() + seconds, seconds)
+    use_signal = hasattr(signal, "setitimer") and threading.current_thread() is threading.main_thread()
+    if use_signal:
+        def expired(signum: int, frame: Any) -> NoReturn:
+            raise CheckTimeoutError(seconds)
+
+        handler = signal.signal(signal.SIGALRM, expired)
+        signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        if use_signal:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, handler)
+        _local.deadline = previous
+
+
+def iter_chunks(path: Union[str, Path], limit: int) -> Iterator[bytes]:
+    """Блоки содержимого обычного файла; FileAccessError, если файл больше limit байт"""
+    # Именованный канал или устройство заблокировали бы open и read
+    if not stat.S_ISREG(os.stat(path).st_mode):
+        raise FileAccessError(f"{path} is not a regular file")
+    with open(path, "rb") as f:
+        total = 0
+        while True:
+            _check_deadline()
+            chunk = f.read(min(CHUNK_SIZE, limit + 1 - total))
+            if not chunk:
+                return
+            total += len(chunk)
+            if total > limit:
+                raise FileAccessError(f"{path} is larger than {limit} bytes")
+            yield chunk
+
+
+def read_bytes(path: Union[str, Path], limit: int) -> bytes:
+    """Содержимое файла не больше limit байт"""
+    return b"".join(iter_chunks(path, limit))
+
+
+def read_text(path: Union[str, Path], limit: int, encoding: str = "utf-8") -> str:
+    """Текст файла не больше limit байт; файл с нулевыми байтами считается двоичным"""
+    return decode_text(read_bytes(path, limit), path, encoding)
+
+
+def check_text(data: bytes, path: Union[str, Path]) -> None:
+    """FileAccessError, если в содержимом (или его блоке) есть нулевые байты"""
+    if b"\0" in data:
+        raise FileAccessError(f"{path} is a binary file")
+
+
+def decode_text(data: bytes, path: Union[str, Path], encoding: str = "utf-8") -> str:
+    """Декодирует текстовый файл; FileAccessError для двоичного содержимого"""
+    check_text(data, path)
+    return data.decode(encoding)
+
+
+def harden_parser(parser: expat.XMLParserType) -> None:
+    """Запрещает DTD в парсере expat: объявления сущностей возможны только в DTD"""
+
+    def forbid_dtd(*args: Any) -> NoReturn:
+        raise FileAccessError("DTD and entity declarations are not allowed")
+
+    parser.StartDoctypeDeclHandler = forbid_dtd
+    parser.EntityDeclHandler = forbid_dtd
+    parser.ExternalEntityRefHandler = forbid_dtd
+
+
+def parse_xml(data: bytes) -> ET.Element:
+    """Дерево ElementTree из XML без DTD; ошибки синтаксиса — ET.ParseError
+
+    Разбор выполняет expat с обработкой пространств имён, имена элементов и
+    атрибутов записываются как у ET.fromstring: `{namespace}Name`.
+    """
+    builder = ET.TreeBuilder()
+    parser = expat.ParserCreate(namespace_separator="}")
+    harden_parser(parser)
+    parser.buffer_text = True
+
+    def name(raw: str) -> str:
+        return "{" + raw if "}" in raw else raw
+
+    def start(tag: str, attrs: Dict[str, str]) -> None:
+        builder.start(name(tag), {name(key): value for key, value in attrs.items()})
+
+    parser.StartElementHandler = start
+    parser.EndElementHandler = lambda tag: builder.end(name(tag))
+    parser.CharacterDataHandler = builder.data
+    try:
+        parser.Parse(data, True)
+    except expat.ExpatError as e:
+        error = ET.ParseError(f"{expat.ErrorString(e.code)}: line {e.lineno}, column {e.offset}")
+        error.code, error.position = e.code, (e.lineno, e.offset)
+        raise error from None
+    return builder.close()
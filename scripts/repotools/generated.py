@@ -0,0 +1,130 @@
+"""
+Сгенерированные файлы и их исходники.
+
+Используется проверкой GeneratedFilesChecker (dushnila.py): сопоставляет
+грамматики ANTLR (`*.g4`) и сценарии Reqnroll (`*.feature`) со сгенерированными
+по ним файлами и сверяет SHA объектов git с манифестом generated-files.txt,
+не запуская Java и dotnet.
+
+Пары строятся по индексу git:
+  - `X.feature` -> `X.feature.cs`;
+  - `X.g4` -> `X.interp`, `X.tokens` и файлы `.cs` того же каталога, в заголовке
+    которых записано `// Generated from X.g4` (лексер, парсер, listener, visitor).
+Читаются только первые килобайты файлов `.cs` из каталогов с грамматиками.
+
+Манифест — по строке на сгенерированный файл:
+
+    <сгенерированный файл> <исходник> <SHA исходника> <SHA сгенерированного файла>
+"""
+
+import posixpath
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+MANIFEST_NAME = "generated-files.txt"
+
+GRAMMAR_EXTENSION = ".g4"
+FEATURE_EXTENSION = ".feature"
+
+# Расширения служебных файлов ANTLR, имя которых совпадает с именем грамматики
+ANTLR_DATA_EXTENSIONS = (".interp", ".tokens")
+
+# Заголовок файлов C#, сгенерированных ANTLR: "// Generated from VaibikParser.g4 by ANTLR 4.13.2"
+ANTLR_HEADER_PATTERN = re.compile(rb"^// Generated from (\S+\.g4) by ANTLR", re.MULTILINE)
+HEADER_SIZE = 2048
+
+
+@dataclass
+class GeneratedFiles:
+    """Сгенерированные файлы репозитория"""
+
+    # Сгенерированный файл -> исходник
+    sources: Dict[str, str] = field(default_factory=dict)
+    # Исходники, для которых не найдено ни одного сгенерированного файла
+    missing: List[str] = field(default_factory=list)
+    # Сгенерированные файлы, исходник которых отсутствует
+    orphaned: List[Tuple[str, str]] = field(default_factory=list)
+
+
+def read_header(path: Path) -> bytes:
+    """Первые HEADER_SIZE байт файла"""
+    with open(path, "rb") as f:
+        return f.read(HEADER_SIZE)
+
+
+def find_generated_files(root: Path, git_files: List[str]) -> GeneratedFiles:
+    """Сопоставить исходники со сгенерированными файлами по списку файлов git"""
+    tracked = set(git_files)
+    result = GeneratedFiles()
+    grammar_dirs = set()
+
+    for file_path in git_files:
+        directory, file_name = posixpath.split(file_path)
+        stem, extension = posixpath.splitext(file_name)
+        if extension == ".cs" and stem.endswith(FEATURE_EXTENSION):
+            source = file_path[:-len(".cs")]
+        elif extension in ANTLR_DATA_EXTENSIONS:
+            source = posixpath.join(directory, stem + GRAMMAR_EXTENSION)
+            grammar_dirs.add(directory)
+        elif extension == GRAMMAR_EXTENSION:
+            grammar_dirs.add(directory)
+            continue
+        else:
+            continue
+        result.sources[file_path] = source
+
+    for file_path in git_files:
+        directory, file_name = posixpath.split(file_path)
+        if directory not in grammar_dirs or not file_name.endswith(".cs"):
+            continue
+        try:
+            match = ANTLR_HEADER_PATTERN.search(read_header(root / file_path))
+        except OSError:
+            continue
+        if match:
+            result.sources[file_path] = posixpath.join(directory, match.group(1).decode("utf-8", "replace"))
+
+    generated_from = set(result.sources.values())
+    for file_path in git_files:
+        if file_path.endswith((GRAMMAR_EXTENSION, FEATURE_EXTENSION)) and file_path not in generated_from:
+            result.missing.append(file_path)
+    for generated, source in sorted(result.sources.items()):
+        if source not in tracked:
+            result.orphaned.append((generated, source))
+    return result
+
+
+def parse_manifest(lines: List[str]) -> Tuple[Dict[str, Tuple[str, str, str]], List[int]]:
+    """Разобрать манифест.
+
+    Returns:
+        Кортеж (сгенерированный файл -> (исходник, SHA исходника, SHA файла),
+        номера некорректных строк)
+    """
+    entries: Dict[str, Tuple[str, str, str]] = {}
+    invalid: List[int] = []
+    for line_number, line in enumerate(lines, 1):
+        text = line.split("#", 1)[0].strip()
+        if not text:
+            continue
+        parts = text.split()
+        if len(parts) != 4:
+            invalid.append(line_number)
+            continue
+        generated, source, source_sha, generated_sha = parts
+        entries[generated] = (source, source_sha, generated_sha)
+    return entries, invalid
+
+
+def format_manifest(generated: GeneratedFiles, blob_shas: Dict[str, str]) -> str:
+    """Манифест по текущему состоянию индекса git (осиротевшие файлы не записываются)"""
+    lines = [
+        "# Сгенерированные файлы и SHA объектов git на момент генерации (обновляется dushnila.py --update-generated)",
+        "# <сгенерированный файл> <исходник> <SHA исходника> <SHA сгенерированного файла>",
+    ]
+    for file_path, source in sorted(generated.sources.items()):
+        if source in blob_shas and file_path in blob_shas:
+            lines.append(f"{file_path} {source} {blob_shas[source]} {blob_shas[file_path]}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,372 @@
+"""
+Проверка сценариев Gherkin (`*.feature`) и привязок шагов Reqnroll.
+
+Используется проверкой FeatureChecker (dushnila.py).
+
+Файлы разбираются построчным конечным автоматом, который знает ключевые слова
+языков en и ru (`# language: ru-RU`). Файлы раздаются пакетами в пул процессов
+(source_scan.map_batches). Найденные замечания:
+  - нарушения структуры: шаги вне сценария, сценарий без шагов, повторная
+    функциональность или предыстория, Примеры вне структуры сценария;
+  - незакрытые блоки `\"\"\"` и ```` ``` ````, таблицы с разным числом ячеек;
+  - параметры `<имя>` структуры сценария, отсутствующие в Примерах.
+
+Шаги сверяются с привязками `[Given(...)]`, `[When(...)]`, `[Then(...)]`,
+`[StepDefinition(...)]` из файлов C#. Все привязки одного вида собираются в одно
+регулярное выражение с именованной группой на привязку, поэтому шаг проверяется
+одним `fullmatch`, а имя совпавшей группы указывает на привязку.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from . import file_access
+
+# Наибольший размер файла .feature; файлы больше не разбираются (file_access)
+MAX_FILE_SIZE = 1024 * 1024
+
+# Ключевые слова Gherkin по языкам (как в gherkin-languages.json)
+KEYWORDS: Dict[str, Dict[str, List[str]]] = {
+    "en": {
+        "feature": ["Feature", "Business Need", "Ability"],
+        "background": ["Background"],
+        "rule": ["Rule"],
+        "scenario": ["Scenario", "Example"],
+        "outline": ["Scenario Outline", "Scenario Template"],
+        "examples": ["Examples", "Scenarios"],
+        "given": ["Given"],
+        "when": ["When"],
+        "then": ["Then"],
+        "and": ["And", "*"],
+        "but": ["But"],
+    },
+    "ru": {
+        "feature": ["Функциональность", "Функционал", "Функция", "Свойство", "Фича"],
+        "background": ["Предыстория", "Контекст"],
+        "rule": ["Правило"],
+        "scenario": ["Сценарий", "Пример"],
+        "outline": ["Структура сценария", "Шаблон сценария"],
+        "examples": ["Примеры"],
+        "given": ["Допустим", "Дано", "Пусть"],
+        "when": ["Когда", "Если"],
+        "then": ["Тогда", "Затем", "То"],
+        "and": ["И", "К тому же", "Также", "*"],
+        "but": ["Но", "А", "Иначе"],
+    },
+}
+
+LANGUAGE_PATTERN = re.compile(r"^\s*#\s*language\s*:\s*(\S+)\s*$")
+STEP_KINDS = ("given", "when", "then")
+PLACEHOLDER_PATTERN = re.compile(r"<([^<>\s][^<>]*)>")
+
+# Число файлов в одной задаче пула процессов
+BATCH_SIZE = 64
+
+
+@dataclass
+class Step:
+    kind: str
+    text: str
+    line: int
+
+
+@dataclass
+class Scenario:
+    name: str
+    line: int
+    outline: bool = False
+    steps: List[Step] = field(default_factory=list)
+    # Столбцы всех таблиц Примеров
+    example_columns: List[str] = field(default_factory=list)
+    has_examples: bool = False
+
+
+@dataclass
+class FeatureDocument:
+    """Разобранный файл .feature"""
+
+    path: str
+    name: str = ""
+    scenarios: List[Scenario] = field(default_factory=list)
+    # Ошибки структуры: (строка, сообщение)
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+
+
+def _keyword_table(language: str) -> List[Tuple[str, str, bool]]:
+    """Ключевые слова языка: (ключевое слово, вид, заголовок ли с двоеточием).
+
+    Более длинные ключевые слова проверяются раньше ("Структура сценария" до "Сценарий").
+    """
+    table = []
+    for kind, words in KEYWORDS[language].items():
+        for word in words:
+            table.append((word, kind, kind not in STEP_KINDS + ("and", "but")))
+    return sorted(table, key=lambda entry: -len(entry[0]))
+
+
+def _match_keyword(text: str, table: List[Tuple[str, str, bool]]) -> Optional[Tuple[str, str]]:
+    """Вид ключевого слова и остаток строки"""
+    for word, kind, is_header in table:
+        if is_header:
+            if text.startswith(word) and text[len(word):].lstrip().startswith(":"):
+                return kind, text[len(word):].lstrip()[1:].strip()
+        elif text.startswith(word + " ") or (word == "*" and text.startswith("*")):
+            return kind, text[len(word):].strip()
+    return None
+
+
+def parse_feature(path: str, lines: List[str]) -> FeatureDocument:
+    """Разобрать файл .feature построчно"""
+    document = FeatureDocument(path)
+    errors = document.errors
+    language = "en"
+    table = _keyword_table(language)
+
+    # Состояние: None (до функциональности), feature, background, scenario, examples
+    section: Optional[str] = None
+    scenario: Optional[Scenario] = None
+    background_seen = False
+    last_step: Optional[Step] = None
+    step_kind: Optional[str] = None
+    doc_string: Optional[Tuple[str, int]] = None
+    table_width: Optional[int] = None
+    can_take_argument = False
+    # Свободный текст (описание) допускается сразу после заголовка любой секции
+    description_allowed = False
+
+    for line_number, raw_line in enumerate(lines, 1):
+        text = raw_line.strip().lstrip("\ufeff")
+
+        if doc_string is not None:
+            if text.startswith(doc_string[0]):
+                doc_string = None
+            continue
+
+        if not text:
+            continue
+
+        if text.startswith("#"):
+            match = LANGUAGE_PATTERN.match(text)
+            if match:
+                if section is not None or document.name:
+                    errors.append((line_number, "директива # language должна стоять в начале файла"))
+                code = match.group(1).split("-")[0].lower()
+                if code not in KEYWORDS:
+                    errors.append((line_number, f"неподдерживаемый язык {match.group(1)}"))
+                else:
+                    language = code
+                    table = _keyword_table(language)
+            continue
+
+        if text.startswith('"""') or text.startswith("```"):
+            if not can_take_argument:
+                errors.append((line_number, "блок текста не относится к шагу"))
+            doc_string = (text[:3], line_number)
+            can_take_argument = description_allowed = False
+            continue
+
+        if text.startswith("|"):
+            cells = [cell.strip() for cell in re.split(r"(?<!\\)\|", text.strip())[1:-1]]
+            if section == "examples" and scenario is not None:
+                if table_width is None:
+                    scenario.example_columns.extend(cells)
+            elif not can_take_argument and table_width is None:
+                errors.append((line_number, "таблица не относится к шагу или Примерам"))
+            if not text.endswith("|"):
+                errors.append((line_number, "строка таблицы должна заканчиваться символом |"))
+            elif table_width is None:
+                table_width = len(cells)
+            elif len(cells) != table_width:
+                errors.append((line_number, f"в строке таблицы {len(cells)} ячеек вместо {table_width}"))
+            can_take_argument = description_allowed = False
+            continue
+        table_width = None
+
+        if text.startswith("@"):
+            description_allowed = False
+            continue
+
+        keyword = _match_keyword(text, table)
+        if keyword is None:
+            if not description_allowed:
+                errors.append((line_number, f"непонятная строка: {text}"))
+            can_take_argument = False
+            continue
+
+        kind, rest = keyword
+        can_take_argument = False
+        if kind == "feature":
+            if document.name or section is not None:
+                errors.append((line_number, "функциональность может быть только одна в файле"))
+            document.name = rest
+            section = "feature"
+        elif section is None:
+            errors.append((line_number, "до функциональности допустимы только комментарии и теги"))
+        elif kind == "rule":
+            section = "feature"
+            scenario = None
+            background_seen = False
+        elif kind == "background":
+            if background_seen or document.scenarios:
+                errors.append((line_number, "предыстория должна быть одна и стоять до сценариев"))
+            background_seen = True
+            section = "background"
+            scenario = None
+        elif kind in ("scenario", "outline"):
+            _finish_scenario(scenario, errors)
+            scenario = Scenario(rest, line_number, outline=kind == "outline")
+            document.scenarios.append(scenario)
+            section = "scenario"
+        elif kind == "examples":
+            if scenario is None or not scenario.outline:
+                errors.append((line_number, "Примеры допустимы только в структуре сценария"))
+            else:
+                scenario.has_examples = True
+            section = "examples"
+        else:
+            if section not in ("background", "scenario"):
+                errors.append((line_number, "шаг вне сценария или предыстории"))
+                continue
+            if kind in STEP_KINDS:
+                step_kind = kind
+            elif last_step is None or (scenario is not None and not scenario.steps and section == "scenario"):
+                errors.append((line_number, f"шаг не может начинаться с ключевого слова {text.split()[0]}"))
+                step_kind = step_kind or "given"
+            last_step = Step(step_kind or "given", rest, line_number)
+            if scenario is not None and section == "scenario":
+                scenario.steps.append(last_step)
+            can_take_argument = True
+            description_allowed = False
+            continue
+        last_step = None
+        description_allowed = section is not None
+
+    _finish_scenario(scenario, errors)
+    if doc_string is not None:
+        errors.append((doc_string[1], f"незакрытый блок {doc_string[0]}"))
+    if not document.name:
+        errors.append((1, "в файле нет функциональности"))
+    return document
+
+
+def _finish_scenario(scenario: Optional[Scenario], errors: List[Tuple[int, str]]) -> None:
+    if scenario is None:
+        return
+    if not scenario.steps:
+        errors.append((scenario.line, f"в сценарии {scenario.name} нет шагов"))
+    if scenario.outline:
+        if not scenario.has_examples:
+            errors.append((scenario.line, f"в структуре сценария {scenario.name} нет Примеров"))
+        columns = set(scenario.example_columns)
+        for step in scenario.steps:
+            for placeholder in PLACEHOLDER_PATTERN.findall(step.text):
+                if placeholder not in columns:
+                    errors.append((step.line, f"параметра <{placeholder}> нет в Примерах"))
+
+
+def parse_feature_file(path: str) -> FeatureDocument:
+    """Прочитать и разобрать файл .feature (функция для пула процессов)"""
+    try:
+        lines = file_access.read_text(path, MAX_FILE_SIZE, "utf-8-sig").splitlines()
+    except (OSError, UnicodeDecodeError, file_access.FileAccessError) as e:
+        return FeatureDocument(path, errors=[(0, f"ошибка чтения: {e}")])
+    return parse_feature(path, lines)
+
+
+# Атрибут привязки шага: [Given(@"...")], [When("...")], [StepDefinition(@"...")]
+BINDING_PATTERN = re.compile(
+    r'\b(Given|When|Then|StepDefinition)(?:Attribute)?\s*\(\s*(@?)"((?:[^"\\]|\\.|"")*)"',
+)
+
+# Параметры выражений Cucumber
+CUCUMBER_PARAMETERS = {
+    "int": r"-?\d+",
+    "long": r"-?\d+",
+    "float": r"-?\d*[.,]?\d+",
+    "double": r"-?\d*[.,]?\d+",
+    "decimal": r"-?\d*[.,]?\d+",
+    "word": r"[^\s]+",
+    "string": r"\"[^\"]*\"|'[^']*'",
+    "": r".*",
+}
+CUCUMBER_PARAMETER_PATTERN = re.compile(r"\{(\w*)\}")
+NAMED_GROUP_PATTERN = re.compile(r"\(\?P?<(?![=!])\w+>")
+
+
+@dataclass
+class Binding:
+    kind: str
+    pattern: str
+    path: str
+    line: int
+
+
+def parse_bindings(path: str, text: str) -> List[Binding]:
+    """Привязки шагов из файла C#"""
+    bindings = []
+    for match in BINDING_PATTERN.finditer(text):
+        attribute, verbatim, literal = match.groups()
+        if verbatim:
+            value = literal.replace('""', '"')
+        else:
+            value = re.sub(r"\\(.)", lambda escape: {"n": "\n", "t": "\t"}.get(escape.group(1), escape.group(1)), literal)
+        kind = attribute.lower() if attribute != "StepDefinition" else "any"
+        bindings.append(Binding(kind, value, path, text.count("\n", 0, match.start()) + 1))
+    return bindings
+
+
+def binding_regex(pattern: str) -> str:
+    """Регулярное выражение привязки: выражение Cucumber или регулярное выражение Reqnroll"""
+    parameters = CUCUMBER_PARAMETER_PATTERN.findall(pattern)
+    if parameters and all(parameter in CUCUMBER_PARAMETERS for parameter in parameters) \
+            and not pattern.startswith("^") and not pattern.endswith("$"):
+        parts = []
+        position = 0
+        for match in CUCUMBER_PARAMETER_PATTERN.finditer(pattern):
+            parts.append(re.escape(pattern[position:match.start()]))
+            parts.append(f"(?:{CUCUMBER_PARAMETERS[match.group(1)]})")
+            position = match.end()
+        parts.append(re.escape(pattern[position:]))
+        return "".join(parts)
+    # Именованные группы .NET (?<name>...) и Python (?P<name>...) не нужны для сопоставления
+    # и могут повторяться в разных привязках
+    return NAMED_GROUP_PATTERN.sub("(?:", pattern.removeprefix("^").removesuffix("$"))
+
+
+class StepMatcher:
+    """Сопоставление шагов с привязками одним регулярным выражением на вид шага"""
+
+    def __init__(self, bindings: List[Binding]) -> None:
+        self.bindings = bindings
+        self.errors: List[Tuple[Binding, str]] = []
+        self.patterns: Dict[str, Pattern[str]] = {}
+        valid: List[Tuple[int, str]] = []
+        for index, binding in enumerate(bindings):
+            regex = binding_regex(binding.pattern)
+            try:
+                re.compile(regex)
+            except re.error as e:
+                self.errors.append((binding, f"некорректное выражение привязки: {e}"))
+                continue
+            valid.append((index, regex))
+
+        for kind in STEP_KINDS:
+            alternatives = [
+                f"(?P<b{index}>{regex})"
+                for index, regex in valid
+                if bindings[index].kind in (kind, "any")
+            ]
+            if alternatives:
+                self.patterns[kind] = re.compile("|".join(alternatives))
+
+    def match(self, step: Step) -> Optional[Binding]:
+        """Привязка, с которой совпадает шаг"""
+        pattern = self.patterns.get(step.kind)
+        if pattern is None:
+            return None
+        match = pattern.fullmatch(step.text)
+        if match is None:
+            return None
+        # Группа привязки закрывается последней среди именованных групп альтернативы
+        return self.bindings[int(match.lastgroup[1:])]
@@ -0,0 +1,806 @@
+"""
+Статический анализ грамматик ANTLR 4 (`*.g4`) без запуска ANTLR.
+
+Используется проверкой GrammarChecker (dushnila.py).
+
+Файл грамматики разбирается за один линейный проход: лексер на регулярном
+выражении выдаёт лексемы (имена, строки, множества символов, действия
+в фигурных скобках с учётом вложенности), а рекурсивный спуск строит дерево
+каждого правила. По деревьям строится граф ссылок между правилами и находятся:
+  - ссылки на неопределённые правила и токены;
+  - правила парсера, недостижимые из первого правила, и неиспользуемые фрагменты;
+  - левая рекурсия, которую ANTLR не поддерживает: косвенная, внутри подправила
+    или после необязательного префикса, а также правило без нелеворекурсивной альтернативы;
+  - токены-литералы, которые никогда не будут выданы, потому что та же строка
+    распознаётся раньше определённым правилом лексера (как предупреждение 184 ANTLR).
+
+Проверки одного файла выполняются в analyze_grammar и вместе с описанием его
+токенов сохраняются в GrammarSummary. Сводка хранится в общем хранилище
+результатов (results.ResultStore) по SHA объекта git содержимого файла, поэтому
+повторная проверка после правки заново разбирает только изменённую грамматику;
+проверки между файлами (tokenVocab) дёшевы и выполняются по сводкам
+в check_vocabularies.
+"""
+
+import posixpath
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from .graph_analysis import ProjectGraph
+from .results import ResultStore
+
+# Версия анализатора входит в ключ кэша: при изменении проверок сводки пересчитываются
+ANALYZER_VERSION = "1"
+
+# Лексемы .g4; действия `{...}` обрабатываются отдельно из-за вложенных скобок
+TOKEN_PATTERN = re.compile(
+    r"""
+      (?P<skip>\s+ | //[^\n]* | /\*.*?(?:\*/|\Z))
+    | (?P<id>[A-Za-z_][A-Za-z0-9_]*)
+    | (?P<string>'(?:[^'\\\n]|\\.)*')
+    | (?P<set>\[(?:[^\]\\]|\\.)*\])
+    | (?P<punct>->|\.\.|\+=|::|[:;|()*+?~=\#,.<>@!$^])
+    | (?P<action>\{)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+ANTLR_ESCAPES = {"n": "\n", "r": "\r", "t": "\t", "b": "\b", "f": "\f"}
+ESCAPE_PATTERN = re.compile(r"\\(u\{[0-9A-Fa-f]+\}|u[0-9A-Fa-f]{4}|.)", re.DOTALL)
+
+# Команды лексера, после которых токен не попадает в парсер
+HIDDEN_COMMANDS = {"skip", "more", "channel"}
+
+Diagnostic = Tuple[str, int, str]
+
+
+@dataclass
+class Token:
+    kind: str
+    text: str
+    line: int
+
+
+@dataclass
+class Node:
+    """Узел дерева правила
+
+    kind: alt (последовательность), block (альтернативы), ref, literal, set,
+    range, any, not, suffix (value: *, +, ? с необязательным ?), action
+    """
+
+    kind: str
+    children: List["Node"] = field(default_factory=list)
+    value: str = ""
+    line: int = 0
+
+
+@dataclass
+class Rule:
+    name: str
+    line: int
+    body: Node
+    fragment: bool = False
+    mode: str = "DEFAULT_MODE"
+    commands: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def is_lexer(self) -> bool:
+        return self.name[0].isupper()
+
+
+@dataclass
+class GrammarSummary:
+    """Результат анализа одного файла грамматики (сериализуется в JSON для кэша)"""
+
+    name: str = ""
+    kind: str = "combined"
+    token_vocab: Optional[str] = None
+    # Токены, определённые правилами лексера или блоком tokens {}: имя -> строка
+    tokens: Dict[str, int] = field(default_factory=dict)
+    # Токены, не попадающие в парсер (-> skip, -> channel(...), -> more)
+    hidden_tokens: List[str] = field(default_factory=list)
+    # Строки токенов-литералов: литерал -> имя токена
+    literals: Dict[str, str] = field(default_factory=dict)
+    # Ссылки правил парсера на токены и литералы: имя или литерал -> первая строка
+    token_refs: Dict[str, int] = field(default_factory=dict)
+    literal_refs: Dict[str, int] = field(default_factory=dict)
+    # Замечания по файлу: (error или warning, строка, сообщение)
+    diagnostics: List[Diagnostic] = field(default_factory=list)
+
+
+def tokenize(text: str) -> Iterator[Token]:
+    """Лексемы грамматики за один проход; действия выдаются целиком"""
+    position = 0
+    line = 1
+    length = len(text)
+    while position < length:
+        match = TOKEN_PATTERN.match(text, position)
+        if match is None:
+            raise ValueError(f"line {line}: unexpected character {text[position]!r}")
+        kind = match.lastgroup
+        if kind == "action":
+            end = _skip_action(text, position)
+            yield Token("action", text[position:end], line)
+        else:
+            end = match.end()
+            if kind != "skip":
+                yield Token(kind, match.group(), line)
+        line += text.count("\n", position, end)
+        position = end
+
+
+def _skip_action(text: str, start: int) -> int:
+    """Позиция после действия `{...}` с вложенными скобками, строками и символами"""
+    depth = 0
+    position = start
+    length = len(text)
+    while position < length:
+        char = text[position]
+        if char in "\"'":
+            position += 1
+            while position < length and text[position] != char:
+                position += 2 if text[position] == "\\" else 1
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return position + 1
+        position += 1
+    raise ValueError("unterminated action")
+
+
+def unescape(literal: str) -> str:
+    """Значение строки ANTLR без кавычек"""
+
+    def replace(match: "re.Match[str]") -> str:
+        escape = match.group(1)
+        if escape.startswith("u{"):
+            return chr(int(escape[2:-1], 16))
+        if escape.startswith("u") and len(escape) == 5:
+            return chr(int(escape[1:], 16))
+        return ANTLR_ESCAPES.get(escape, escape)
+
+    return ESCAPE_PATTERN.sub(replace, literal[1:-1])
+
+
+class GrammarParser:
+    """Разбор лексем грамматики в правила рекурсивным спуском"""
+
+    def __init__(self, tokens: List[Token]) -> None:
+        self.tokens = tokens
+        self.position = 0
+        self.summary = GrammarSummary()
+        self.rules: Dict[str, Rule] = {}
+        self.mode = "DEFAULT_MODE"
+
+    def peek(self, offset: int = 0) -> Optional[Token]:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else None
+
+    def next(self) -> Token:
+        token = self.peek()
+        if token is None:
+            raise ValueError("unexpected end of grammar")
+        self.position += 1
+        return token
+
+    def expect(self, text: str) -> Token:
+        token = self.next()
+        if token.text != text:
+            raise ValueError(f"line {token.line}: expected {text!r}, found {token.text!r}")
+        return token
+
+    def parse(self) -> Tuple[GrammarSummary, Dict[str, Rule]]:
+        self._parse_header()
+        while self.peek() is not None:
+            token = self.next()
+            if token.text in ("options", "tokens", "channels") and self.peek() and self.peek().kind == "action":
+                self._parse_prequel(token.text, self.next())
+            elif token.text == "import":
+                while self.next().text != ";":
+                    pass
+            elif token.text == "@":
+                # @header {...}, @parser::members {...}
+                while self.next().kind != "action":
+                    pass
+            elif token.text == "mode":
+                self.mode = self.next().text
+                self.expect(";")
+            elif token.kind == "id":
+                self._parse_rule(token)
+            else:
+                raise ValueError(f"line {token.line}: unexpected {token.text!r}")
+        return self.summary, self.rules
+
+    def _parse_header(self) -> None:
+        token = self.next()
+        if token.text in ("lexer", "parser"):
+            self.summary.kind = token.text
+            token = self.next()
+        if token.text != "grammar":
+            raise ValueError(f"line {token.line}: expected grammar declaration")
+        self.summary.name = self.next().text
+        self.expect(";")
+
+    def _parse_prequel(self, section: str, block: Token) -> None:
+        content = block.text[1:-1]
+        if section == "options":
+            match = re.search(r"\btokenVocab\s*=\s*([A-Za-z_][\w.]*)", content)
+            if match:
+                self.summary.token_vocab = match.group(1)
+        elif section == "tokens":
+            for name in re.findall(r"[A-Za-z_]\w*", content):
+                self.summary.tokens.setdefault(name, block.line)
+
+    def _parse_rule(self, token: Token) -> None:
+        fragment = token.text == "fragment"
+        if fragment or token.text in ("public", "private", "protected"):
+            token = self.next()
+        name = token.text
+        # Аргументы, returns, locals, throws, options и @init до двоеточия
+        while self.next().text != ":":
+            pass
+        commands: List[Tuple[str, str]] = []
+        body = self._parse_alternatives(commands)
+        self.expect(";")
+        # Обработчики исключений после правила
+        while self.peek() is not None and self.peek().text in ("catch", "finally"):
+            self.next()
+            if self.peek() is not None and self.peek().kind == "set":
+                self.next()
+            self.next()
+
+        if name in self.rules:
+            self.summary.diagnostics.append(
+                ("error", token.line, f"правило {name} определено повторно (строка {self.rules[name].line})")
+            )
+            return
+        self.rules[name] = Rule(name, token.line, body, fragment, self.mode, commands)
+
+    def _parse_alternatives(self, commands: List[Tuple[str, str]]) -> Node:
+        block = Node("block", [self._parse_alternative(commands)])
+        while self.peek() is not None and self.peek().text == "|":
+            self.next()
+            block.children.append(self._parse_alternative(commands))
+        return block
+
+    def _parse_alternative(self, commands: List[Tuple[str, str]]) -> Node:
+        alternative = Node("alt")
+        while True:
+            token = self.peek()
+            if token is None or token.text in ("|", ";", ")"):
+                return alternative
+            if token.text == "#":
+                # Метка альтернативы
+                self.next()
+                self.next()
+            elif token.text == "->":
+                self.next()
+                self._parse_commands(commands)
+            elif token.text == "<":
+                # Параметры элемента <assoc=right>
+                while self.next().text != ">":
+                    pass
+            else:
+                element = self._parse_element()
+                if element is not None:
+                    alternative.children.append(element)
+
+    def _parse_commands(self, commands: List[Tuple[str, str]]) -> None:
+        while True:
+            name = self.next().text
+            argument = ""
+            if self.peek() is not None and self.peek().text == "(":
+                self.next()
+                argument = self.next().text
+                self.expect(")")
+            commands.append((name, argument))
+            if self.peek() is None or self.peek().text != ",":
+                return
+            self.next()
+
+    def _parse_element(self) -> Optional[Node]:
+        token = self.peek()
+        # Метка элемента: x=atom, x+=atom
+        following = self.peek(1)
+        if token.kind == "id" and following is not None and following.text in ("=", "+="):
+            self.next()
+            self.next()
+
+        atom = self._parse_atom()
+        token = self.peek()
+        if token is not None and token.text in ("*", "+", "?"):
+            operator = self.next().text
+            if self.peek() is not None and self.peek().text == "?":
+                operator += self.next().text
+            atom = Node("suffix", [atom], operator)
+        return atom
+
+    def _parse_atom(self) -> Node:
+        token = self.next()
+        if token.text == "(":
+            block = self._parse_alternatives([])
+            self.expect(")")
+            return block
+        if token.text == "~":
+            return Node("not", [self._parse_atom()], line=token.line)
+        if token.text == ".":
+            return Node("any", line=token.line)
+        if token.kind == "action":
+            # Семантический предикат {...}? делает правило условным
+            if self.peek() is not None and self.peek().text == "?":
+                self.next()
+                return Node("action", value="predicate", line=token.line)
+            return Node("action", line=token.line)
+        if token.kind == "set":
+            return Node("set", value=token.text, line=token.line)
+        if token.kind == "string":
+            if self.peek() is not None and self.peek().text == "..":
+                self.next()
+                end = self.next()
+                return Node("range", value=unescape(token.text) + unescape(end.text), line=token.line)
+            return Node("literal", value=unescape(token.text), line=token.line)
+        if token.kind == "id":
+            # Аргументы правила: expr[0]
+            if self.peek() is not None and self.peek().kind == "set":
+                self.next()
+            return Node("ref", value=token.text, line=token.line)
+        raise ValueError(f"line {token.line}: unexpected {token.text!r}")
+
+
+def _references(node: Node) -> Iterator[Node]:
+    if node.kind == "ref":
+        yield node
+    for child in node.children:
+        yield from _references(child)
+
+
+def _literals(node: Node) -> Iterator[Node]:
+    if node.kind == "literal":
+        yield node
+    for child in node.children:
+        yield from _literals(child)
+
+
+def _single_literal(body: Node) -> Optional[str]:
+    """Строка правила вида `NAME: 'text';`"""
+    if len(body.children) == 1 and len(body.children[0].children) == 1:
+        element = body.children[0].children[0]
+        if element.kind == "literal":
+            return element.value
+    return None
+
+
+class LeftRecursionAnalyzer:
+    """Поиск левой рекурсии, которую ANTLR 4 не поддерживает
+
+    ANTLR переписывает только прямую левую рекурсию, когда правило стоит первым
+    элементом альтернативы верхнего уровня (`expr: expr '*' expr | INT`).
+    Остальные ссылки, которые могут оказаться первыми в выводе (с учётом
+    необязательных префиксов), образуют граф левых углов: цикл в нём — ошибка.
+    """
+
+    def __init__(self, rules: Dict[str, Rule]) -> None:
+        self.rules = rules
+        self.nullable: Set[str] = set()
+        self._compute_nullable()
+
+    def _compute_nullable(self) -> None:
+        changed = True
+        while changed:
+            changed = False
+            for name, rule in self.rules.items():
+                if name not in self.nullable and self.is_nullable(rule.body):
+                    self.nullable.add(name)
+                    changed = True
+
+    def is_nullable(self, node: Node) -> bool:
+        if node.kind == "alt":
+            return all(self.is_nullable(child) for child in node.children)
+        if node.kind == "block":
+            return any(self.is_nullable(child) for child in node.children)
+        if node.kind == "suffix":
+            return node.value[0] in "*?" or self.is_nullable(node.children[0])
+        if node.kind == "ref":
+            return node.value in self.nullable
+        return node.kind == "action"
+
+    def left_corners(self, node: Node, result: Set[str]) -> None:
+        """Правила, которые могут стоять первыми при выводе узла"""
+        if node.kind == "alt":
+            for child in node.children:
+                self.left_corners(child, result)
+                if not self.is_nullable(child):
+                    return
+        elif node.kind in ("block", "suffix"):
+            for child in node.children:
+                self.left_corners(child, result)
+        elif node.kind == "ref" and node.value in self.rules:
+            result.add(node.value)
+
+    def analyze(self) -> List[Tuple[int, str]]:
+        """Найти неподдерживаемую левую рекурсию.
+
+        Returns:
+            Список (строка, сообщение)
+        """
+        problems: List[Tuple[int, str]] = []
+        graph: Dict[str, Set[str]] = {}
+        for name, rule in self.rules.items():
+            corners: Set[str] = set()
+            recursive_alternatives = 0
+            for alternative in rule.body.children:
+                elements = alternative.children
+                if elements and elements[0].kind == "ref" and elements[0].value == name:
+                    # Поддерживаемая форма: левый угол — само правило; далее элементы не первые
+                    recursive_alternatives += 1
+                    continue
+                self.left_corners(alternative, corners)
+            if recursive_alternatives and recursive_alternatives == len(rule.body.children):
+                problems.append((rule.line, f"все альтернативы правила {name} леворекурсивны"))
+            graph[name] = corners
+
+        # Компоненты сильной связности графа левых углов, правила — в порядке определения
+        order = {name: position for position, name in enumerate(graph)}
+        corner_graph = ProjectGraph(graph)
+        components = sorted(
+            (sorted((corner_graph.names[node] for node in nodes), key=order.__getitem__)
+             for nodes in corner_graph.strongly_connected_components()),
+            key=lambda component: order[component[0]],
+        )
+        for component in components:
+            if len(component) == 1:
+                name = component[0]
+                if name in graph[name]:
+                    problems.append((
+                        self.rules[name].line,
+                        f"левая рекурсия в правиле {name} не в поддерживаемой ANTLR форме "
+                        "(внутри подправила или после необязательного префикса)",
+                    ))
+            else:
+                cycle = " -> ".join(component + [component[0]])
+                problems.append((self.rules[component[0]].line, f"косвенная левая рекурсия: {cycle}"))
+        return problems
+
+
+class LexerRegexBuilder:
+    """Перевод правил лексера в регулярные выражения Python для поиска перекрытий
+
+    Поддерживаются литералы, множества, диапазоны, отрицания, `.`, подправила,
+    повторения и ссылки на другие правила (подставляются). Правило с предикатом
+    или рекурсией не переводится.
+    """
+
+    def __init__(self, rules: Dict[str, Rule]) -> None:
+        self.rules = rules
+        self.cache: Dict[str, Optional[str]] = {}
+        self.in_progress: Set[str] = set()
+
+    def rule_regex(self, name: str) -> Optional[str]:
+        if name not in self.cache:
+            if name in self.in_progress:
+                return None
+            self.in_progress.add(name)
+            self.cache[name] = self._node(self.rules[name].body)
+            self.in_progress.discard(name)
+        return self.cache[name]
+
+    def _node(self, node: Node) -> Optional[str]:
+        if node.kind in ("alt", "block"):
+            parts = [self._node(child) for child in node.children]
+            if any(part is None for part in parts):
+                return None
+            separator = "" if node.kind == "alt" else "|"
+            return "(?:" + separator.join(parts) + ")"
+        if node.kind == "suffix":
+            inner = self._node(node.children[0])
+            return None if inner is None else inner + node.value
+        if node.kind == "literal":
+            return re.escape(node.value)
+        if node.kind == "any":
+            return "(?s:.)"
+        if node.kind == "ref":
+            if node.value not in self.rules or not self.rules[node.value].is_lexer:
+                return None
+            return self.rule_regex(node.value)
+        if node.kind == "action":
+            return None if node.value == "predicate" else ""
+        characters = self._characters(node)
+        if characters is None:
+            return None
+        negated, ranges = characters
+        return "[" + ("^" if negated else "") + _character_class(ranges) + "]"
+
+    def _characters(self, node: Node) -> Optional[Tuple[bool, List[Tuple[str, str]]]]:
+        """Множество символов узла: (отрицание, диапазоны)"""
+        if node.kind == "set":
+            return False, _parse_set(node.value)
+        if node.kind == "range":
+            return False, [(node.value[0], node.value[-1])]
+        if node.kind == "literal" and len(node.value) == 1:
+            return False, [(node.value, node.value)]
+        if node.kind == "block":
+            ranges: List[Tuple[str, str]] = []
+            for alternative in node.children:
+                if len(alternative.children) != 1:
+                    return None
+                inner = self._characters(alternative.children[0])
+                if inner is None or inner[0]:
+                    return None
+                ranges.extend(inner[1])
+            return False, ranges
+        if node.kind == "not":
+            inner = self._characters(node.children[0])
+            if inner is None or inner[0]:
+                return None
+            return True, inner[1]
+        return None
+
+
+def _parse_set(text: str) -> List[Tuple[str, str]]:
+    """Диапазоны множества ANTLR `[a-z\\u0410-\\u042F_]`"""
+    characters: List[str] = []
+    is_range: List[bool] = []
+    position = 1
+    while position < len(text) - 1:
+        if text[position] == "\\":
+            match = ESCAPE_PATTERN.match(text, position)
+            escape = match.group(1)
+            position = match.end()
+            if escape.startswith("u{"):
+                characters.append(chr(int(escape[2:-1], 16)))
+            elif escape.startswith("u") and len(escape) == 5:
+                characters.append(chr(int(escape[1:], 16)))
+            else:
+                characters.append(ANTLR_ESCAPES.get(escape, escape))
+            is_range.append(False)
+        else:
+            characters.append(text[position])
+            is_range.append(text[position] == "-")
+            position += 1
+
+    ranges: List[Tuple[str, str]] = []
+    index = 0
+    while index < len(characters):
+        if index + 2 < len(characters) and is_range[index + 1]:
+            ranges.append((characters[index], characters[index + 2]))
+            index += 3
+        else:
+            ranges.append((characters[index], characters[index]))
+            index += 1
+    return ranges
+
+
+def _character_class(ranges: List[Tuple[str, str]]) -> str:
+    parts = []
+    for start, end in ranges:
+        parts.append(re.escape(start) if start == end else f"{re.escape(start)}-{re.escape(end)}")
+    return "".join(parts)
+
+
+@dataclass
+class LexerToken:
+    """Токен лексера в порядке определения (для сканеров, построенных по грамматике)"""
+
+    name: str
+    # Строка токена-литерала или регулярное выражение Python остальных правил
+    literal: Optional[str]
+    regex: Optional[str]
+    hidden: bool
+
+
+def lexer_tokens(text: str) -> List[LexerToken]:
+    """Токены лексера режима по умолчанию (фрагменты не входят).
+
+    Правила, которые не переводятся в регулярное выражение, возвращаются с regex=None.
+    """
+    _, rules = GrammarParser(list(tokenize(text))).parse()
+    lexer_rules = {name: rule for name, rule in rules.items() if rule.is_lexer}
+    builder = LexerRegexBuilder(lexer_rules)
+    tokens = []
+    for name, rule in lexer_rules.items():
+        if rule.fragment or rule.mode != "DEFAULT_MODE":
+            continue
+        literal = _single_literal(rule.body)
+        hidden = any(command in HIDDEN_COMMANDS for command, _ in rule.commands)
+        regex = None if literal is not None else builder.rule_regex(name)
+        tokens.append(LexerToken(name, literal, regex, hidden))
+    return tokens
+
+
+def decode_grammar(data: bytes) -> str:
+    """Текст грамматики: UTF-8, иначе cp1251 (комментарии в старых файлах)"""
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return data.decode("cp1251", "replace")
+
+
+def analyze_grammar(text: str) -> GrammarSummary:
+    """Разобрать грамматику и выполнить проверки, не требующие других файлов"""
+    try:
+        summary, rules = GrammarParser(list(tokenize(text))).parse()
+    except ValueError as e:
+        return GrammarSummary(diagnostics=[("error", 0, f"ошибка разбора грамматики: {e}")])
+
+    diagnostics = summary.diagnostics
+    lexer_rules = {name: rule for name, rule in rules.items() if rule.is_lexer}
+    parser_rules = {name: rule for name, rule in rules.items() if not rule.is_lexer}
+
+    for name, rule in lexer_rules.items():
+        if rule.fragment:
+            continue
+        summary.tokens.setdefault(name, rule.line)
+        if any(command in HIDDEN_COMMANDS for command, _ in rule.commands):
+            summary.hidden_tokens.append(name)
+        for command, argument in rule.commands:
+            if command == "type":
+                summary.tokens.setdefault(argument, rule.line)
+        literal = _single_literal(rule.body)
+        if literal is not None and literal not in summary.literals:
+            summary.literals[literal] = name
+
+    _check_lexer_rules(lexer_rules, diagnostics)
+    _check_parser_rules(parser_rules, summary)
+    if summary.kind != "lexer":
+        for problem in LeftRecursionAnalyzer(parser_rules).analyze():
+            diagnostics.append(("error", problem[0], problem[1]))
+    diagnostics.sort(key=lambda diagnostic: diagnostic[1])
+    return summary
+
+
+def _check_lexer_rules(rules: Dict[str, Rule], diagnostics: List[Diagnostic]) -> None:
+    used_fragments: Set[str] = set()
+    for rule in rules.values():
+        for reference in _references(rule.body):
+            if reference.value not in rules:
+                diagnostics.append(
+                    ("error", reference.line, f"правило лексера {rule.name} ссылается на неопределённое правило {reference.value}")
+                )
+            elif rules[reference.value].fragment:
+                used_fragments.add(reference.value)
+    for name, rule in rules.items():
+        if rule.fragment and name not in used_fragments:
+            diagnostics.append(("warning", rule.line, f"фрагмент {name} не используется"))
+
+    # Перекрытие литералов: правило, определённое раньше в том же режиме,
+    # распознаёт ту же строку (равная длина — побеждает первое правило).
+    # Более ранние литералы ищутся по словарю, регулярные выражения строятся
+    # только для остальных правил, которых в грамматике обычно единицы
+    builder = LexerRegexBuilder(rules)
+    earlier_literals: Dict[Tuple[str, str], Rule] = {}
+    earlier_patterns: List[Tuple[Rule, "re.Pattern[str]"]] = []
+    for rule in rules.values():
+        if rule.fragment:
+            continue
+        literal = _single_literal(rule.body)
+        if literal is None:
+            regex = builder.rule_regex(rule.name)
+            if regex is not None:
+                try:
+                    earlier_patterns.append((rule, re.compile(regex)))
+                except re.error:
+                    pass
+            continue
+
+        shadowing = earlier_literals.get((rule.mode, literal))
+        if shadowing is None:
+            shadowing = next(
+                (other for other, pattern in earlier_patterns if other.mode == rule.mode and pattern.fullmatch(literal)),
+                None,
+            )
+        if shadowing is not None:
+            diagnostics.append((
+                "error", rule.line,
+                f"токен {rule.name} ('{literal}') никогда не будет выдан: "
+                f"строку раньше распознаёт правило {shadowing.name} (строка {shadowing.line})",
+            ))
+        earlier_literals.setdefault((rule.mode, literal), rule)
+
+
+def _check_parser_rules(rules: Dict[str, Rule], summary: GrammarSummary) -> None:
+    if not rules:
+        return
+    diagnostics = summary.diagnostics
+    graph: Dict[str, Set[str]] = {}
+    for name, rule in rules.items():
+        graph[name] = set()
+        for reference in _references(rule.body):
+            if reference.value[0].isupper():
+                summary.token_refs.setdefault(reference.value, reference.line)
+            elif reference.value in rules:
+                graph[name].add(reference.value)
+            else:
+                diagnostics.append(
+                    ("error", reference.line, f"правило {name} ссылается на неопределённое правило {reference.value}")
+                )
+        for literal in _literals(rule.body):
+            summary.literal_refs.setdefault(literal.value, literal.line)
+
+    # Достижимость из первого правила (стартового)
+    start = next(iter(rules))
+    reachable = {start}
+    queue = [start]
+    while queue:
+        for successor in graph[queue.pop()]:
+            if successor not in reachable:
+                reachable.add(successor)
+                queue.append(successor)
+    for name, rule in rules.items():
+        if name not in reachable:
+            diagnostics.append(("warning", rule.line, f"правило {name} недостижимо из стартового правила {start}"))
+
+
+def check_vocabularies(summaries: Dict[str, GrammarSummary]) -> Dict[str, List[Diagnostic]]:
+    """Проверки между файлами: токены парсера против словаря лексера (tokenVocab).
+
+    Args:
+        summaries: путь файла грамматики -> сводка
+
+    Returns:
+        путь файла -> замечания
+    """
+    by_name: Dict[Tuple[str, str], GrammarSummary] = {}
+    for path, summary in summaries.items():
+        by_name.setdefault((posixpath.dirname(path), summary.name), summary)
+
+    result: Dict[str, List[Diagnostic]] = {}
+    used_tokens: Dict[int, Set[str]] = {}
+    for path, summary in summaries.items():
+        if summary.kind == "lexer":
+            continue
+        vocabulary = summary
+        if summary.token_vocab is not None:
+            vocabulary = by_name.get((posixpath.dirname(path), summary.token_vocab))
+            if vocabulary is None:
+                result.setdefault(path, []).append(
+                    ("warning", 0, f"словарь токенов {summary.token_vocab} не найден, токены не проверяются")
+                )
+                continue
+        used_tokens.setdefault(id(vocabulary), set()).update(summary.token_refs)
+        for literal in summary.literal_refs:
+            if literal in vocabulary.literals:
+                used_tokens[id(vocabulary)].add(vocabulary.literals[literal])
+
+        diagnostics = result.setdefault(path, [])
+        for token, line in sorted(summary.token_refs.items(), key=lambda item: item[1]):
+            if token != "EOF" and token not in vocabulary.tokens:
+                diagnostics.append(("error", line, f"токен {token} не определён в {vocabulary.name}"))
+            elif token in vocabulary.hidden_tokens:
+                diagnostics.append(("error", line, f"токен {token} не попадает в парсер (skip/channel/more)"))
+        if vocabulary is not summary:
+            for literal, line in sorted(summary.literal_refs.items(), key=lambda item: item[1]):
+                if literal not in vocabulary.literals:
+                    diagnostics.append(("error", line, f"литерал '{literal}' не определён токеном в {vocabulary.name}"))
+
+    for path, summary in summaries.items():
+        if summary.kind == "parser" or id(summary) not in used_tokens:
+            continue
+        used = used_tokens[id(summary)]
+        for token, line in sorted(summary.tokens.items(), key=lambda item: item[1]):
+            if token not in used and token not in summary.hidden_tokens:
+                result.setdefault(path, []).append(("warning", line, f"токен {token} не используется парсером"))
+    return result
+
+
+class GrammarCache:
+    """Кэш сводок грамматик по SHA объекта git и версии анализатора
+
+    Args:
+        store: Общее хранилище результатов (None — база в памяти процесса)
+    """
+
+    CHECKER = "grammar"
+
+    def __init__(self, store: Optional[ResultStore] = None) -> None:
+        self.store = store if store is not None else ResultStore()
+
+    def summary(self, data: bytes) -> GrammarSummary:
+        """Сводка грамматики: из хранилища или результат analyze_grammar"""
+        value = self.store.fetch(
+            self.CHECKER, ANALYZER_VERSION, data, lambda content: asdict(analyze_grammar(decode_grammar(content)))
+        )
+        return GrammarSummary(**{**value, "diagnostics": [tuple(item) for item in value["diagnostics"]]})
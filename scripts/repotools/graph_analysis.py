@@ -0,0 +1,414 @@
+"""
+Анализ графа зависимостей между проектами.
+
+Используется скриптами print-solution-graph.py и dushnila.py.
+
+Узлы графа нумеруются целыми числами в порядке сортировки имён, а множества
+достижимых узлов хранятся как битовые строки (целые числа Python): объединение
+множеств — одна операция `|`, проверка принадлежности — `>> id & 1`.
+Это позволяет считать транзитивное замыкание и транзитивное сокращение
+для решений из тысяч проектов за доли секунды.
+
+Сильно связные компоненты ищутся итеративным алгоритмом Тарьяна (без рекурсии,
+поэтому глубина графа не ограничена лимитом стека Python). Тарьян выдаёт
+компоненты в обратном топологическом порядке, поэтому достижимость вычисляется
+за один проход по конденсации графа.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class ProjectGraph:
+    """Ориентированный граф зависимостей с целочисленными идентификаторами узлов"""
+
+    def __init__(self, dependencies: Dict[str, Iterable[str]]) -> None:
+        """Строит граф из словаря "проект -> проекты, от которых он зависит"
+
+        Узлами становятся все проекты, упомянутые как ключи или как зависимости.
+        """
+        names = set(dependencies)
+        for targets in dependencies.values():
+            names.update(targets)
+
+        self.names: List[str] = sorted(names)
+        self.ids: Dict[str, int] = {name: index for index, name in enumerate(self.names)}
+        self.successors: List[List[int]] = [[] for _ in self.names]
+
+        for source, targets in dependencies.items():
+            source_id = self.ids[source]
+            self.successors[source_id] = sorted({self.ids[target] for target in targets})
+
+        self._components: Optional[List[List[int]]] = None
+        self._component_of: List[int] = []
+        self._reach: Optional[List[int]] = None
+        self._reduced: Optional[List[List[int]]] = None
+        self._condensed: Optional[List[List[int]]] = None
+        self._predecessors: Optional[List[List[int]]] = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def reversed(self) -> "ProjectGraph":
+        """Граф с обращёнными рёбрами: проект -> проекты, которые от него зависят
+
+        Узлы и их идентификаторы совпадают с исходным графом.
+        """
+        dependents: Dict[str, List[str]] = {name: [] for name in self.names}
+        for source, target in self.edges():
+            dependents[target].append(source)
+        return ProjectGraph(dependents)
+
+    def bits_of(self, names: Iterable[str]) -> int:
+        """Битовая строка для множества узлов"""
+        bits = 0
+        for name in names:
+            bits |= 1 << self.ids[name]
+        return bits
+
+    def edges(self) -> Iterator[Tuple[str, str]]:
+        """Перечисляет рёбра (источник, цель) в детерминированном порядке"""
+        for source_id, targets in enumerate(self.successors):
+            for target_id in targets:
+                yield self.names[source_id], self.names[target_id]
+
+    def strongly_connected_components(self) -> List[List[int]]:
+        """Возвращает сильно связные компоненты в обратном топологическом порядке
+
+        Компонента, от которой ничего не зависит дальше (сток), идёт первой.
+        """
+        if self._components is None:
+            self._components = self._tarjan()
+        return self._components
+
+    def _tarjan(self) -> List[List[int]]:
+        """Итеративный алгоритм Тарьяна"""
+        count = len(self.names)
+        index = [-1] * count
+        lowlink = [0] * count
+        on_stack = [False] * count
+        stack: List[int] = []
+        components: List[List[int]] = []
+        self._component_of = [-1] * count
+        next_index = 0
+
+        for root in range(count):
+            if index[root] != -1:
+                continue
+
+            # Стек вызовов: (узел, позиция следующего соседа)
+            call_stack = [(root, 0)]
+            index[root] = lowlink[root] = next_index
+            next_index += 1
+            stack.append(root)
+            on_stack[root] = True
+
+            while call_stack:
+                node, position = call_stack[-1]
+                successors = self.successors[node]
+
+                if position < len(successors):
+                    call_stack[-1] = (node, position + 1)
+                    successor = successors[position]
+                    if index[successor] == -1:
+                        index[successor] = lowlink[successor] = next_index
+                        next_index += 1
+                        stack.append(successor)
+                        on_stack[successor] = True
+                        call_stack.append((successor, 0))
+                    elif on_stack[successor]:
+                        lowlink[node] = min(lowlink[node], index[successor])
+                    continue
+
+                call_stack.pop()
+                if call_stack:
+                    parent = call_stack[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        self._component_of[member] = len(components)
+                        component.append(member)
+                        if member == node:
+                            break
+                    component.sort()
+                    components.append(component)
+
+        return components
+
+    def _is_cyclic(self, component: List[int]) -> bool:
+        """Компонента образует цикл: в ней больше одного узла или есть петля"""
+        return len(component) > 1 or component[0] in self.successors[component[0]]
+
+    def cycles(self) -> List[List[str]]:
+        """Возвращает по одному циклу на каждую циклическую компоненту
+
+        Каждый цикл — список имён, в котором первый узел повторяется в конце:
+        ["A", "B", "A"].
+        """
+        result = []
+        for component in self.strongly_connected_components():
+            if not self._is_cyclic(component):
+                continue
+            start = component[0]
+            members = set(component)
+            successor = next(s for s in self.successors[start] if s in members)
+            path = self._shortest_path_ids(successor, start, members)
+            result.append([self.names[start]] + [self.names[node] for node in path])
+        result.sort()
+        return result
+
+    def reachability(self) -> List[int]:
+        """Транзитивное замыкание: для каждого узла битовая строка достижимых узлов
+
+        Узел считается достижимым из самого себя, только если он лежит на цикле.
+        """
+        if self._reach is None:
+            self._compute_closure_and_reduction()
+        return self._reach
+
+    def reaches(self, source: str, target: str) -> bool:
+        """Проверяет, зависит ли source от target транзитивно"""
+        return bool(self.reachability()[self.ids[source]] >> self.ids[target] & 1)
+
+    def transitive_closure(self) -> Dict[str, List[str]]:
+        """Возвращает транзитивное замыкание в виде словаря зависимостей"""
+        return {
+            self.names[node]: self.names_from_bits(bits)
+            for node, bits in enumerate(self.reachability())
+            if bits
+        }
+
+    def transitive_reduction(self) -> Dict[str, List[str]]:
+        """Возвращает граф без избыточных рёбер
+
+        Ребро A -> C избыточно, если C достижим из A через другую прямую
+        зависимость A. Для ациклического графа результат — точное транзитивное
+        сокращение; рёбра внутри циклов сохраняются как есть, а между
+        компонентами остаются только неизбыточные.
+        """
+        if self._reduced is None:
+            self._compute_closure_and_reduction()
+        return {
+            self.names[node]: [self.names[target] for target in targets]
+            for node, targets in enumerate(self._reduced)
+            if targets
+        }
+
+    def _compute_closure_and_reduction(self) -> None:
+        """Один проход по конденсации в обратном топологическом порядке"""
+        components = self.strongly_connected_components()
+        component_of = self._component_of
+        member_bits = [0] * len(components)
+        for component_id, component in enumerate(components):
+            for node in component:
+                member_bits[component_id] |= 1 << node
+
+        # Достижимые из компоненты узлы за пределами самой компоненты
+        component_reach = [0] * len(components)
+        reduced: List[List[int]] = [[] for _ in self.names]
+        reach = [0] * len(self.names)
+
+        for component_id, component in enumerate(components):
+            successor_components = self._component_successors()[component_id]
+
+            # Узлы, достижимые через какую-либо прямую зависимость транзитивно
+            via_successors = 0
+            for successor_component in successor_components:
+                via_successors |= component_reach[successor_component]
+
+            redundant = set()
+            total = via_successors
+            for successor_component in successor_components:
+                total |= member_bits[successor_component]
+                if member_bits[successor_component] & via_successors:
+                    redundant.add(successor_component)
+            component_reach[component_id] = total
+
+            own_bits = member_bits[component_id] if self._is_cyclic(component) else 0
+            for node in component:
+                reach[node] = total | own_bits
+                reduced[node] = [
+                    target
+                    for target in self.successors[node]
+                    if component_of[target] == component_id
+                    or component_of[target] not in redundant
+                ]
+
+        self._reach = reach
+        self._reduced = reduced
+
+    def _component_successors(self) -> List[List[int]]:
+        """Рёбра конденсации: для каждой компоненты — компоненты её прямых зависимостей"""
+        if self._condensed is None:
+            components = self.strongly_connected_components()
+            component_of = self._component_of
+            self._condensed = [
+                sorted({
+                    component_of[target]
+                    for node in component
+                    for target in self.successors[node]
+                    if component_of[target] != component_id
+                })
+                for component_id, component in enumerate(components)
+            ]
+        return self._condensed
+
+    def topological_levels(self) -> List[List[str]]:
+        """Разбивает узлы на уровни сборки
+
+        Уровень 0 — проекты без зависимостей, уровень k — проекты, все зависимости
+        которых лежат на уровнях меньше k. Проекты одного уровня можно собирать
+        параллельно. Узлы одного цикла попадают на общий уровень.
+        """
+        components = self.strongly_connected_components()
+        component_level = [0] * len(components)
+        levels: List[List[str]] = []
+
+        for component_id, successor_components in enumerate(self._component_successors()):
+            level = 1 + max(
+                (component_level[successor] for successor in successor_components), default=-1
+            )
+            component_level[component_id] = level
+            while len(levels) <= level:
+                levels.append([])
+            levels[level].extend(self.names[node] for node in components[component_id])
+
+        for level_names in levels:
+            level_names.sort()
+        return levels
+
+    def critical_path(self, weights: Optional[Dict[str, float]] = None) -> Tuple[float, List[str]]:
+        """Находит самую тяжёлую цепочку зависимостей
+
+        Args:
+            weights: Вес каждого узла; по умолчанию 1, и тогда результат —
+                самая длинная цепочка зависимостей
+
+        Returns:
+            Суммарный вес и цепочка от зависящего проекта к его самой глубокой
+            зависимости. Узлы цикла учитываются вместе, их веса суммируются.
+        """
+        components = self.strongly_connected_components()
+        total = [0.0] * len(components)
+        next_component: List[Optional[int]] = [None] * len(components)
+
+        for component_id, successor_components in enumerate(self._component_successors()):
+            own = sum(
+                weights.get(self.names[node], 0.0) if weights is not None else 1.0
+                for node in components[component_id]
+            )
+            best: Optional[int] = None
+            for successor in successor_components:
+                # При равенстве весов выбираем компоненту с меньшим номером
+                if best is None or total[successor] > total[best]:
+                    best = successor
+            total[component_id] = own + (total[best] if best is not None else 0.0)
+            next_component[component_id] = best
+
+        if not components:
+            return 0.0, []
+
+        start = max(range(len(components)), key=lambda component_id: (total[component_id], -component_id))
+        path: List[str] = []
+        current: Optional[int] = start
+        while current is not None:
+            path.extend(self.names[node] for node in components[current])
+            current = next_component[current]
+        return total[start], path
+
+    def neighbourhood(self, name: str, depth: int) -> List[str]:
+        """Узлы на расстоянии не больше depth рёбер от name в любом направлении
+
+        Учитываются и зависимости узла, и зависящие от него узлы.
+        """
+        if self._predecessors is None:
+            self._predecessors = [[] for _ in self.names]
+            for source, targets in enumerate(self.successors):
+                for target in targets:
+                    self._predecessors[target].append(source)
+
+        start = self.ids[name]
+        distance = {start: 0}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            if distance[node] == depth:
+                continue
+            for neighbour in self.successors[node] + self._predecessors[node]:
+                if neighbour not in distance:
+                    distance[neighbour] = distance[node] + 1
+                    queue.append(neighbour)
+        return sorted(self.names[node] for node in distance)
+
+    def subgraph(self, names: Iterable[str]) -> Dict[str, List[str]]:
+        """Рёбра между узлами из names в виде словаря зависимостей"""
+        selected = {self.ids[name] for name in names}
+        return {
+            self.names[node]: [self.names[target] for target in self.successors[node] if target in selected]
+            for node in sorted(selected)
+        }
+
+    def quotient(self, group_of: Dict[str, str]) -> Tuple[Dict[str, List[str]], Dict[Tuple[str, str], int]]:
+        """Сворачивает группы узлов в отдельные узлы
+
+        Args:
+            group_of: Имя группы для узла; узлы без группы остаются сами собой
+
+        Returns:
+            Зависимости между группами и число исходных рёбер за каждым ребром групп.
+            Рёбра внутри группы отбрасываются.
+        """
+        counts: Dict[Tuple[str, str], int] = {}
+        groups = set()
+        for name in self.names:
+            groups.add(group_of.get(name, name))
+        for source, target in self.edges():
+            edge = (group_of.get(source, source), group_of.get(target, target))
+            if edge[0] != edge[1]:
+                counts[edge] = counts.get(edge, 0) + 1
+
+        dependencies: Dict[str, List[str]] = {group: [] for group in sorted(groups)}
+        for source, target in sorted(counts):
+            dependencies[source].append(target)
+        return dependencies, counts
+
+    def shortest_path(self, source: str, target: str) -> Optional[List[str]]:
+        """Кратчайший путь зависимостей от source к target (включительно) или None"""
+        path = self._shortest_path_ids(self.ids[source], self.ids[target])
+        if path is None:
+            return None
+        return [self.names[node] for node in path]
+
+    def _shortest_path_ids(
+        self, source: int, target: int, allowed: Optional[set] = None
+    ) -> Optional[List[int]]:
+        """Поиск в ширину; allowed ограничивает множество посещаемых узлов"""
+        previous = {source: source}
+        queue = deque([source])
+        while queue:
+            node = queue.popleft()
+            if node == target:
+                path = [node]
+                while node != source:
+                    node = previous[node]
+                    path.append(node)
+                path.reverse()
+                return path
+            for successor in self.successors[node]:
+                if successor not in previous and (allowed is None or successor in allowed):
+                    previous[successor] = node
+                    queue.append(successor)
+        return None
+
+    def names_from_bits(self, bits: int) -> List[str]:
+        """Переводит битовую строку в отсортированный список имён"""
+        names = []
+        while bits:
+            low = bits & -bits
+            names.append(self.names[low.bit_length() - 1])
+            bits ^= low
+        return names
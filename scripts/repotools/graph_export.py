@@ -0,0 +1,338 @@
+"""
+Экспорт графа зависимостей между проектами в различные форматы.
+
+Используется скриптом print-solution-graph.py (флаг `--format`).
+
+Каждый экспортёр пишет документ построчно в переданный текстовый поток (файл или
+stdout) и не собирает его целиком в памяти. Узлы и рёбра всегда перечисляются
+в отсортированном порядке, поэтому вывод детерминирован и закоммиченные
+диаграммы дают чистый diff.
+
+Поддерживаемые форматы:
+  mermaid  — диаграмма `graph TD` для Markdown и документации
+  dot      — Graphviz DOT
+  json     — node-link JSON (совместим с networkx.node_link_graph)
+  graphml  — GraphML для yEd, Gephi и т.п.
+  csv      — матрица смежности в CSV (строка — зависящий проект, столбец — зависимость)
+
+Выделение узлов и рёбер (GraphDocument.node_styles/edge_styles: added/removed
+при сравнении ревизий, package/conflict/duplicate для пакетов) Mermaid и DOT
+рисуют стилем, а JSON, GraphML и CSV записывают как атрибут `change`.
+"""
+
+import csv
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple, Type, Union
+from xml.sax.saxutils import escape, quoteattr
+
+
+@dataclass
+class GraphDocument:
+    """Граф, подготовленный к экспорту: отсортированные узлы и рёбра"""
+    name: str
+    nodes: List[str]
+    edges: List[Tuple[str, str]]
+    # Выделение узлов и рёбер стилем ("added", "removed", "conflict", ...), например для diff ревизий
+    node_styles: Dict[str, str] = field(default_factory=dict)
+    edge_styles: Dict[Tuple[str, str], str] = field(default_factory=dict)
+    # Подписи узлов вместо имени; строки разделяются "\n"
+    node_labels: Dict[str, str] = field(default_factory=dict)
+    # Подписи рёбер (например, число рёбер за ребром свёрнутых кластеров)
+    edge_labels: Dict[Tuple[str, str], str] = field(default_factory=dict)
+    # Кластеры: подпись кластера -> узлы внутри него (рисуются как subgraph)
+    clusters: Dict[str, List[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_dependencies(cls, dependencies: Dict[str, Iterable[str]], name: str) -> "GraphDocument":
+        """Строит документ из словаря "проект -> проекты, от которых он зависит"
+
+        Узлами становятся все проекты, упомянутые как ключи или как зависимости.
+        """
+        nodes = set(dependencies)
+        edges = set()
+        for source, targets in dependencies.items():
+            for target in targets:
+                nodes.add(target)
+                edges.add((source, target))
+        return cls(name=name, nodes=sorted(nodes), edges=sorted(edges))
+
+
+class GraphExporter:
+    """Базовый класс экспортёра графа"""
+
+    # Имя формата для флага --format
+    FORMAT = ""
+
+    @classmethod
+    def write(cls, document: GraphDocument, out: TextIO) -> None:
+        """Записывает граф в поток out"""
+        raise NotImplementedError
+
+
+class MermaidExporter(GraphExporter):
+    """Диаграмма в формате Mermaid"""
+
+    FORMAT = "mermaid"
+
+    # Оформление выделенных узлов (classDef) и рёбер (linkStyle)
+    NODE_STYLES = {
+        "added": "fill:#dafbe1,stroke:#1a7f37,stroke-width:2px",
+        "removed": "fill:#ffebe9,stroke:#cf222e,stroke-dasharray:5 5",
+        "package": "fill:#f6f8fa,stroke:#8c959f",
+        "conflict": "fill:#fff8c5,stroke:#bf8700,stroke-width:2px",
+    }
+    EDGE_STYLES = {
+        "added": "stroke:#1a7f37,stroke-width:2px",
+        "removed": "stroke:#cf222e,stroke-dasharray:5 5",
+        "duplicate": "stroke:#bf8700,stroke-dasharray:3 3",
+    }
+
+    # Символы, недопустимые в идентификаторе узла Mermaid
+    INVALID_ID_CHARS = re.compile(r"[^\w.]")
+
+    @classmethod
+    def escape_name(cls, name: str) -> str:
+        """Экранирует имя проекта для Mermaid диаграммы"""
+        # Заменяем символы, которые могут быть проблематичными в Mermaid
+        return name.replace('"', '\\"').replace("'", "\\'")
+
+    @classmethod
+    def node_id(cls, name: str) -> str:
+        """Идентификатор узла (имена проектов обычно используются как есть)"""
+        return cls.INVALID_ID_CHARS.sub("_", name)
+
+    @classmethod
+    def node_declaration(cls, document: GraphDocument, node: str) -> str:
+        """Объявление узла с подписью: `Id["Label"]`"""
+        label = cls.escape_name(document.node_labels.get(node, node)).replace("\n", "<br/>")
+        return f'{cls.node_id(node)}["{label}"]'
+
+    @classmethod
+    def write(cls, document: GraphDocument, out: TextIO) -> None:
+        out.write(f"%% Dependencies diagram for solution: {document.name}\n")
+        out.write("%% Generated by print-modules-graph\n")
+        out.write("\n")
+        out.write("graph TD\n")
+
+        # Узлы (проекты), сгруппированные в кластеры
+        clustered = set()
+        for index, (label, members) in enumerate(sorted(document.clusters.items())):
+            out.write(f'    subgraph cluster_{index}["{cls.escape_name(label)}"]\n')
+            for node in members:
+                out.write(f"        {cls.node_declaration(document, node)}\n")
+            out.write("    end\n")
+            clustered.update(members)
+
+        for node in document.nodes:
+            if node not in clustered:
+                out.write(f"    {cls.node_declaration(document, node)}\n")
+
+        # Пустая строка для разделения
+        out.write("\n")
+
+        # Зависимости (стрелки); номера выделенных рёбер нужны для linkStyle
+        styled_edges: Dict[str, List[str]] = {}
+        for index, (source, target) in enumerate(document.edges):
+            style = document.edge_styles.get((source, target))
+            arrow = "-.->" if style == "removed" else "-->"
+            label = document.edge_labels.get((source, target))
+            if label:
+                arrow += f"|{label}|"
+            out.write(f"    {cls.node_id(source)} {arrow} {cls.node_id(target)}\n")
+            if style:
+                styled_edges.setdefault(style, []).append(str(index))
+
+        if not document.node_styles and not styled_edges:
+            return
+
+        out.write("\n")
+        styled_nodes: Dict[str, List[str]] = {}
+        for node in document.nodes:
+            style = document.node_styles.get(node)
+            if style:
+                styled_nodes.setdefault(style, []).append(node)
+        for style, nodes in sorted(styled_nodes.items()):
+            out.write(f"    classDef {style} {cls.NODE_STYLES[style]}\n")
+            out.write(f"    class {','.join(cls.node_id(node) for node in nodes)} {style}\n")
+        for style, indices in sorted(styled_edges.items()):
+            out.write(f"    linkStyle {','.join(indices)} {cls.EDGE_STYLES[style]}\n")
+
+
+class DotExporter(GraphExporter):
+    """Граф в формате Graphviz DOT"""
+
+    FORMAT = "dot"
+
+    # Атрибуты выделенных узлов и рёбер
+    STYLES = {
+        "added": 'color="#1a7f37", penwidth=2',
+        "removed": 'color="#cf222e", style=dashed',
+        "package": 'color="#8c959f", shape=ellipse',
+        "conflict": 'color="#bf8700", penwidth=2, shape=ellipse',
+        "duplicate": 'color="#bf8700", style=dotted',
+    }
+
+    @classmethod
+    def quote(cls, name: str) -> str:
+        """Идентификатор DOT в кавычках"""
+        return '"' + name.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+    @classmethod
+    def write(cls, document: GraphDocument, out: TextIO) -> None:
+        out.write(f"// Dependencies diagram for solution: {document.name}\n")
+        out.write(f"digraph {cls.quote(document.name)} {{\n")
+        out.write("    node [shape=box];\n")
+
+        clustered = set()
+        for index, (label, members) in enumerate(sorted(document.clusters.items())):
+            out.write(f"    subgraph cluster_{index} {{\n")
+            out.write(f"        label={cls.quote(label)};\n")
+            for node in members:
+                cls._write_node(document, node, out, "        ")
+            out.write("    }\n")
+            clustered.update(members)
+
+        for node in document.nodes:
+            if node not in clustered:
+                cls._write_node(document, node, out, "    ")
+
+        for source, target in document.edges:
+            attributes = []
+            style = document.edge_styles.get((source, target))
+            if style:
+                attributes.append(cls.STYLES[style])
+            label = document.edge_labels.get((source, target))
+            if label:
+                attributes.append(f"label={cls.quote(label)}")
+            suffix = f" [{', '.join(attributes)}]" if attributes else ""
+            out.write(f"    {cls.quote(source)} -> {cls.quote(target)}{suffix};\n")
+
+        out.write("}\n")
+
+    @classmethod
+    def _write_node(cls, document: GraphDocument, node: str, out: TextIO, indent: str) -> None:
+        attributes = []
+        style = document.node_styles.get(node)
+        if style:
+            attributes.append(cls.STYLES[style])
+        label = document.node_labels.get(node)
+        if label:
+            attributes.append(f"label={cls.quote(label)}".replace("\n", "\\n"))
+        suffix = f" [{', '.join(attributes)}]" if attributes else ""
+        out.write(f"{indent}{cls.quote(node)}{suffix};\n")
+
+
+class JsonExporter(GraphExporter):
+    """Граф в формате node-link JSON"""
+
+    FORMAT = "json"
+
+    @classmethod
+    def write(cls, document: GraphDocument, out: TextIO) -> None:
+        out.write("{\n")
+        out.write('  "directed": true,\n')
+        out.write('  "multigraph": false,\n')
+        out.write(f'  "graph": {{"name": {json.dumps(document.name, ensure_ascii=False)}}},\n')
+
+        out.write('  "nodes": [')
+        for index, node in enumerate(document.nodes):
+            separator = "," if index else ""
+            change = cls._change(document.node_styles.get(node))
+            out.write(f'{separator}\n    {{"id": {json.dumps(node, ensure_ascii=False)}{change}}}')
+        out.write("\n  ],\n")
+
+        out.write('  "links": [')
+        for index, (source, target) in enumerate(document.edges):
+            separator = "," if index else ""
+            change = cls._change(document.edge_styles.get((source, target)))
+            out.write(
+                f'{separator}\n    {{"source": {json.dumps(source, ensure_ascii=False)}, '
+                f'"target": {json.dumps(target, ensure_ascii=False)}{change}}}'
+            )
+        out.write("\n  ]\n")
+        out.write("}\n")
+
+    @staticmethod
+    def _change(style: Optional[str]) -> str:
+        return f', "change": {json.dumps(style)}' if style else ""
+
+
+class GraphMLExporter(GraphExporter):
+    """Граф в формате GraphML"""
+
+    FORMAT = "graphml"
+
+    @classmethod
+    def write(cls, document: GraphDocument, out: TextIO) -> None:
+        out.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        out.write('<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+        out.write('  <key id="label" for="node" attr.name="label" attr.type="string"/>\n')
+        if document.node_styles:
+            out.write('  <key id="change" for="node" attr.name="change" attr.type="string"/>\n')
+        if document.edge_styles:
+            out.write('  <key id="edge_change" for="edge" attr.name="change" attr.type="string"/>\n')
+        out.write(f'  <graph id={quoteattr(document.name)} edgedefault="directed">\n')
+
+        for node in document.nodes:
+            style = document.node_styles.get(node)
+            change = f'<data key="change">{escape(style)}</data>' if style else ""
+            out.write(
+                f"    <node id={quoteattr(node)}>"
+                f'<data key="label">{escape(node)}</data>{change}</node>\n'
+            )
+
+        for source, target in document.edges:
+            style = document.edge_styles.get((source, target))
+            if style:
+                out.write(
+                    f"    <edge source={quoteattr(source)} target={quoteattr(target)}>"
+                    f'<data key="edge_change">{escape(style)}</data></edge>\n'
+                )
+            else:
+                out.write(f"    <edge source={quoteattr(source)} target={quoteattr(target)}/>\n")
+
+        out.write("  </graph>\n")
+        out.write("</graphml>\n")
+
+
+class CsvAdjacencyExporter(GraphExporter):
+    """Матрица смежности в формате CSV
+
+    Строка — зависящий проект, столбец — проект-зависимость, 1 означает ребро.
+    Выделенное ребро записывается именем выделения (added, removed, ...) вместо 1,
+    выделение узла — в последнем столбце change, если в документе есть выделенные узлы.
+    Матрица пишется построчно, в памяти хранится только одна строка.
+    """
+
+    FORMAT = "csv"
+
+    @classmethod
+    def write(cls, document: GraphDocument, out: TextIO) -> None:
+        writer = csv.writer(out, lineterminator="\n")
+        changes = bool(document.node_styles)
+        writer.writerow([""] + document.nodes + (["change"] if changes else []))
+
+        column = {node: index for index, node in enumerate(document.nodes)}
+        edge_index = 0
+        for node in document.nodes:
+            row: List[Union[int, str]] = [0] * len(document.nodes)
+            # Рёбра отсортированы по источнику, поэтому читаются одним проходом
+            while edge_index < len(document.edges) and document.edges[edge_index][0] == node:
+                edge = document.edges[edge_index]
+                row[column[edge[1]]] = document.edge_styles.get(edge, 1)
+                edge_index += 1
+            writer.writerow([node] + row + ([document.node_styles.get(node, "")] if changes else []))
+
+
+EXPORTERS: Dict[str, Type[GraphExporter]] = {
+    exporter.FORMAT: exporter
+    for exporter in (
+        MermaidExporter,
+        DotExporter,
+        JsonExporter,
+        GraphMLExporter,
+        CsvAdjacencyExporter,
+    )
+}
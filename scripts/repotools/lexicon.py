@@ -0,0 +1,200 @@
+"""
+Проверка фрагментов кода Vaibik в документации и сценариях по таблице токенов лексера.
+
+Используется проверкой LexiconChecker (dushnila.py).
+
+Сканер VaibikScanner строится один раз по правилам VaibikLexer.g4
+(grammar.lexer_tokens): токены-литералы собираются в одну альтернативу от
+длинных к коротким, остальные правила (ID, числа, строки, комментарии) — в
+опережающие проверки одного регулярного выражения. Один вызов `match` даёт длины
+всех кандидатов в позиции, и выбирается самый длинный, при равной длине — правило,
+определённое раньше, как в ANTLR. Поэтому ключевое слово побеждает ID той же длины,
+а после переименования ключевого слова старое слово распознаётся как ID.
+
+Фрагменты извлекаются за один проход по строкам файла:
+  - блоки ``` и ~~~ в Markdown с языком `vaibik`/`вайбик` или без языка;
+  - блоки `\"\"\"` в сценариях `.feature`;
+  - файлы `*.вайбик` и `*.vaibik` целиком.
+Блок без языка считается кодом Vaibik, если его первая лексема — ключевое слово
+или комментарий (блоки EBNF начинаются с имени правила и пропускаются).
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Pattern, Set, Tuple
+
+from .grammar import LexerToken
+
+SNIPPET_LANGUAGES = {"vaibik", "вайбик"}
+SNIPPET_EXTENSIONS = (".вайбик", ".vaibik")
+FENCES = ("```", "~~~")
+DOC_STRING = '"""'
+
+# Слово из заглавных букв: кандидат в ключевые слова
+UPPERCASE_WORD_PATTERN = re.compile(r"^[^\W\d_a-zа-яё]{2,}$")
+
+
+@dataclass
+class Snippet:
+    path: str
+    # Номер строки файла, с которой начинается текст фрагмента
+    line: int
+    text: str
+    # Язык указан явно (иначе фрагмент проверяется, только если похож на код Vaibik)
+    tagged: bool = False
+
+
+@dataclass
+class Lexeme:
+    kind: str
+    text: str
+    line: int
+
+
+@dataclass
+class ScanResult:
+    lexemes: List[Lexeme] = field(default_factory=list)
+    # Нераспознанные участки: (строка, текст)
+    unknown: List[Tuple[int, str]] = field(default_factory=list)
+
+
+def extract_snippets(path: str, lines: List[str]) -> Iterator[Snippet]:
+    """Фрагменты кода из файла за один проход по строкам"""
+    if path.endswith(SNIPPET_EXTENSIONS):
+        yield Snippet(path, 1, "\n".join(lines), tagged=True)
+        return
+
+    openings = (DOC_STRING, "```") if path.endswith(".feature") else FENCES
+    fence: Optional[str] = None
+    skip = tagged = False
+    start = 0
+    body: List[str] = []
+    for line_number, line in enumerate(lines, 1):
+        text = line.strip()
+        if fence is None:
+            fence = next((mark for mark in openings if text.startswith(mark)), None)
+            if fence is not None:
+                language = text[len(fence):].strip().lower()
+                skip = bool(language) and language not in SNIPPET_LANGUAGES
+                tagged = bool(language)
+                start = line_number + 1
+                body = []
+        elif text.startswith(fence) and not text[len(fence):].strip():
+            if not skip:
+                yield Snippet(path, start, "\n".join(body), tagged)
+            fence = None
+        elif not skip:
+            body.append(line)
+
+
+class VaibikScanner:
+    """Табличный сканер по токенам лексера (самое длинное совпадение, как в ANTLR)"""
+
+    def __init__(self, tokens: List[LexerToken]) -> None:
+        self.tokens = tokens
+        # Ключевые слова и знаки: строка -> (номер правила, имя токена)
+        self.literals: Dict[str, Tuple[int, str]] = {}
+        for index, token in enumerate(tokens):
+            if token.literal is not None:
+                self.literals.setdefault(token.literal, (index, token.name))
+
+        groups = []
+        self.rule_groups: List[Tuple[str, int, LexerToken]] = []
+        for index, token in enumerate(tokens):
+            if token.regex is not None:
+                group = f"t{index}"
+                groups.append(f"(?:(?=(?P<{group}>{token.regex})))?")
+                self.rule_groups.append((group, index, token))
+        if self.literals:
+            alternatives = "|".join(re.escape(literal) for literal in sorted(self.literals, key=len, reverse=True))
+            groups.append(f"(?:(?=(?P<literal>{alternatives})))?")
+        self.pattern: Pattern[str] = re.compile("".join(groups))
+        self.keywords: Set[str] = {
+            literal for literal in self.literals if UPPERCASE_WORD_PATTERN.match(literal.replace("-", ""))
+        }
+
+    def _longest(self, text: str, position: int) -> Tuple[int, Optional[LexerToken]]:
+        """Конец и токен самого длинного совпадения в позиции (None — ни одного)"""
+        match = self.pattern.match(text, position)
+        best_end = position
+        best_index = len(self.tokens)
+        best_token: Optional[LexerToken] = None
+        literal = match.group("literal") if self.literals else None
+        if literal is not None:
+            best_end = position + len(literal)
+            best_index = self.literals[literal][0]
+            best_token = self.tokens[best_index]
+        for group, index, token in self.rule_groups:
+            end = match.end(group)
+            if end > best_end or (end == best_end and end > position and index < best_index):
+                best_end, best_index, best_token = end, index, token
+        return best_end, best_token
+
+    def scan(self, text: str, first_line: int = 1) -> ScanResult:
+        """Лексемы текста; скрытые токены (пробелы, комментарии) пропускаются"""
+        result = ScanResult()
+        position = 0
+        line = first_line
+        length = len(text)
+        unknown_start = -1
+        longest = self._longest
+        while position < length:
+            end, token = longest(text, position)
+            if token is None:
+                if unknown_start < 0:
+                    unknown_start = position
+                position += 1
+                continue
+            if unknown_start >= 0:
+                result.unknown.append((line, text[unknown_start:position]))
+                line += text.count("\n", unknown_start, position)
+                unknown_start = -1
+            if not token.hidden:
+                result.lexemes.append(Lexeme(token.name, text[position:end], line))
+            line += text.count("\n", position, end)
+            position = end
+
+        if unknown_start >= 0:
+            result.unknown.append((line, text[unknown_start:]))
+        return result
+
+    def looks_like_code(self, text: str) -> bool:
+        """Текст начинается с ключевого слова или комментария"""
+        stripped = text.lstrip()
+        if not stripped:
+            return False
+        end, token = self._longest(stripped, 0)
+        if token is None:
+            return False
+        return token.hidden or stripped[:end] in self.keywords
+
+
+def unknown_keywords(scanner: VaibikScanner, lexemes: List[Lexeme], known: Set[str]) -> List[Lexeme]:
+    """Слова из заглавных букв, которые не являются ключевыми словами, известными
+    именами или объявленными во фрагменте именами.
+
+    Имя считается объявленным, если перед ним ключевое слово, а после — `=`, `(` или `;`
+    (`ПОЛТОРАШКА КОЭФФИЦИЕНТ = ...`, `ПРОКРАСТИНИРУЕМ ПОГНАЛИ()`), либо это параметр `ИМЯ: тип`.
+    """
+    declared: Set[str] = set()
+    candidates: List[Lexeme] = []
+    for index, lexeme in enumerate(lexemes):
+        if lexeme.text in scanner.literals or not UPPERCASE_WORD_PATTERN.match(lexeme.text):
+            continue
+        previous = lexemes[index - 1].text if index > 0 else ""
+        following = lexemes[index + 1].text if index + 1 < len(lexemes) else ""
+        if (previous in scanner.keywords and following in ("=", "(", ";")) \
+                or (previous in ("(", ",") and following == ":"):
+            declared.add(lexeme.text)
+        else:
+            candidates.append(lexeme)
+    return [lexeme for lexeme in candidates if lexeme.text not in declared and lexeme.text not in known]
+
+
+# Строковый литерал C# из заглавных букв: имя встроенной функции интерпретатора
+CSHARP_NAME_LITERAL_PATTERN = re.compile(r'"([^\W\d_a-zа-яё]{2,})"')
+
+
+def csharp_name_literals(text: str) -> Set[str]:
+    """Имена из заглавных букв в строковых литералах C# (встроенные функции)"""
+    return set(CSHARP_NAME_LITERAL_PATTERN.findall(text))
@@ -0,0 +1,142 @@
+"""
+Ссылки и якоря документации Markdown.
+
+Используется проверкой MarkdownLinkChecker (dushnila.py).
+
+Каждый файл .md разбирается один раз за проход по строкам: заголовки ATX
+(`## Заголовок`) и Setext (строка, подчёркнутая `===` или `---`) превращаются
+в якоря по правилам GitHub, к ним добавляются HTML-якоря `<a name="...">` и
+`id="..."`. Собираются относительные ссылки `[текст](путь#якорь)`, изображения и
+определения ссылок `[метка]: путь`. Блоки кода и встроенный код пропускаются,
+внешние ссылки (со схемой `https:`, `mailto:` и т. п.) не проверяются.
+
+Сводки файлов хранятся в общем хранилище результатов (results.ResultStore) по
+SHA содержимого, поэтому повторная проверка разбирает только изменённые файлы.
+"""
+
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .results import ResultStore
+from .source_scan import map_batches
+
+# Версия разбора: входит в ключ хранилища и меняется при изменении правил разбора
+PARSER_VERSION = "1"
+
+# Число файлов в одной задаче пула процессов
+BATCH_SIZE = 64
+
+FENCE_PATTERN = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+ATX_HEADING_PATTERN = re.compile(r"^ {0,3}#{1,6}(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$")
+SETEXT_UNDERLINE_PATTERN = re.compile(r"^ {0,3}(?:=+|-+)[ \t]*$")
+# Строка, которая не может быть текстом заголовка Setext: список, цитата, таблица, HTML
+NOT_PARAGRAPH_PATTERN = re.compile(r"^\s*(?:[-*+>|<#]|\d+[.)]\s)")
+HTML_ANCHOR_PATTERN = re.compile(r"""<[^>]*?\b(?:name|id)\s*=\s*["']([^"']+)["']""", re.I)
+CODE_SPAN_PATTERN = re.compile(r"(`+).*?\1")
+INLINE_LINK_PATTERN = re.compile(r"!?\[(?:[^\]\\]|\\.)*\]\(\s*(<[^>]*>|[^\s)]+)(?:\s+(?:\"[^\"]*\"|'[^']*'))?\s*\)")
+REFERENCE_DEFINITION_PATTERN = re.compile(r"^ {0,3}\[(?:[^\]\\]|\\.)+\]:\s*(<[^>]*>|\S+)")
+# Ссылка в заголовке: в якорь попадает только текст ссылки
+LINK_TEXT_PATTERN = re.compile(r"!?\[((?:[^\]\\]|\\.)*)\]\([^)]*\)")
+HTML_TAG_PATTERN = re.compile(r"<[^>]+>")
+# Символы, которые GitHub удаляет из якоря: всё, кроме букв, цифр, `_`, `-` и пробела
+SLUG_PUNCTUATION_PATTERN = re.compile(r"[^\w\- ]")
+# Ссылка со схемой (`https:`, `mailto:`) или протокольно-относительная
+EXTERNAL_PATTERN = re.compile(r"^(?:[A-Za-z][A-Za-z0-9+.-]*:|//)")
+
+
+@dataclass
+class MarkdownSummary:
+    """Якоря и относительные ссылки одного файла Markdown"""
+    anchors: List[str] = field(default_factory=list)
+    # (строка, цель ссылки без схемы: `путь`, `путь#якорь` или `#якорь`)
+    links: List[Tuple[int, str]] = field(default_factory=list)
+
+
+def github_slug(text: str) -> str:
+    """Якорь заголовка по правилам GitHub: строчные буквы, пробелы заменяются на `-`,
+    пунктуация (кроме `-` и `_`) удаляется"""
+    text = LINK_TEXT_PATTERN.sub(r"\1", text)
+    text = HTML_TAG_PATTERN.sub("", text).strip().lower()
+    return SLUG_PUNCTUATION_PATTERN.sub("", text).replace(" ", "-")
+
+
+def parse_markdown(text: str) -> MarkdownSummary:
+    """Якоря заголовков и относительные ссылки файла за один проход по строкам"""
+    summary = MarkdownSummary()
+    slug_counts: Dict[str, int] = {}
+
+    def add_heading(title: str) -> None:
+        slug = github_slug(title)
+        count = slug_counts.get(slug, 0)
+        slug_counts[slug] = count + 1
+        summary.anchors.append(f"{slug}-{count}" if count else slug)
+
+    fence: Optional[str] = None
+    previous = ""
+    for line_number, line in enumerate(text.splitlines(), 1):
+        fence_match = FENCE_PATTERN.match(line)
+        if fence is not None:
+            if fence_match and fence_match.group(1)[0] == fence[0] and len(fence_match.group(1)) >= len(fence) \
+                    and not line.strip().strip(fence[0]):
+                fence = None
+            previous = ""
+            continue
+        if fence_match:
+            fence = fence_match.group(1)
+            previous = ""
+            continue
+
+        heading = ATX_HEADING_PATTERN.match(line)
+        if heading:
+            add_heading(heading.group(1) or "")
+            previous = ""
+        elif previous and SETEXT_UNDERLINE_PATTERN.match(line):
+            add_heading(previous)
+            previous = ""
+        else:
+            previous = line.strip() if line.strip() and not NOT_PARAGRAPH_PATTERN.match(line) else ""
+
+        if "<" in line:
+            summary.anchors.extend(HTML_ANCHOR_PATTERN.findall(line))
+        if "[" not in line:
+            continue
+        code_free = CODE_SPAN_PATTERN.sub("", line) if "`" in line else line
+        targets = [match.group(1) for match in INLINE_LINK_PATTERN.finditer(code_free)]
+        definition = REFERENCE_DEFINITION_PATTERN.match(code_free)
+        if definition:
+            targets.append(definition.group(1))
+        for target in targets:
+            if target.startswith("<"):
+                target = target[1:-1]
+            if target and not EXTERNAL_PATTERN.match(target):
+                summary.links.append((line_number, target))
+    return summary
+
+
+def parse_markdown_data(data: bytes) -> Dict:
+    """Сводка файла по содержимому в виде словаря для JSON (для пула процессов)"""
+    return asdict(parse_markdown(data.decode("utf-8-sig", errors="replace")))
+
+
+class MarkdownCache:
+    """Кэш сводок файлов Markdown по SHA содержимого и версии разбора
+
+    Args:
+        store: Общее хранилище результатов (None — база в памяти процесса)
+    """
+
+    CHECKER = "markdown"
+
+    def __init__(self, store: Optional[ResultStore] = None) -> None:
+        self.store = store if store is not None else ResultStore()
+
+    def summaries(self, contents: Sequence[bytes]) -> List[MarkdownSummary]:
+        """Сводки файлов: из хранилища, остальные разбираются пакетами в пуле процессов"""
+        values = self.store.fetch_many(
+            self.CHECKER,
+            PARSER_VERSION,
+            contents,
+            lambda missing: map_batches(parse_markdown_data, missing, BATCH_SIZE),
+        )
+        return [MarkdownSummary(value["anchors"], [tuple(link) for link in value["links"]]) for value in values]
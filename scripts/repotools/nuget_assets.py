@@ -0,0 +1,196 @@
+"""
+Чтение файлов restore `obj/project.assets.json` для слоя NuGet пакетов.
+
+Используется скриптом print-solution-graph.py (флаг `--packages`).
+
+Файл project.assets.json может занимать десятки мегабайт (в основном это секция
+`libraries` со списками файлов пакетов), поэтому он не загружается через
+`json.load`: инкрементальный читатель разбирает поток блоками и выдаёт события
+(путь, событие, значение), а из них сохраняются только разрешённые версии пакетов,
+зависимости между пакетами и прямые зависимости проекта.
+
+Результат разбора кэшируется по SHA-256 содержимого файла: в памяти процесса
+и, при необходимости, в JSON файле между запусками.
+"""
+
+import hashlib
+import json
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+# Лексема JSON: пунктуация, строка (без кавычек) или число/литерал
+TOKEN_PATTERN = re.compile(
+    rb'[ \t\r\n]*(?:([{}\[\],:])|"([^"\\]*(?:\\.[^"\\]*)*)"|(-?[0-9][0-9.eE+-]*|true|false|null))'
+)
+WHITESPACE_PATTERN = re.compile(rb'[ \t\r\n]*')
+LITERALS = {b'true': True, b'false': False, b'null': None}
+
+JsonValue = Union[str, int, float, bool, None]
+
+
+def _tokens(stream: BinaryIO, chunk_size: int) -> Iterator[Tuple[bytes, JsonValue]]:
+    """Лексемы JSON из потока: ("{", None), ("string", "..."), ("value", 1) и т.д."""
+    buffer = b''
+    position = 0
+    final = False
+    while True:
+        match = TOKEN_PATTERN.match(buffer, position)
+        # Лексема на границе блока может быть обрезана: дочитываем поток
+        if not final and (match is None or match.end() == len(buffer)):
+            chunk = stream.read(chunk_size)
+            buffer = buffer[position:] + chunk
+            position = 0
+            final = not chunk
+            continue
+        if match is None:
+            if WHITESPACE_PATTERN.match(buffer, position).end() == len(buffer):
+                return
+            raise ValueError(f"Invalid JSON at offset {position}: {buffer[position:position + 20]!r}")
+
+        position = match.end()
+        punctuation, string, scalar = match.groups()
+        if punctuation is not None:
+            yield punctuation, None
+        elif string is not None:
+            text = string.decode('utf-8')
+            yield b'string', json.loads(f'"{text}"') if '\\' in text else text
+        elif scalar in LITERALS:
+            yield b'value', LITERALS[scalar]
+        else:
+            number = scalar.decode('ascii')
+            yield b'value', float(number) if any(c in number for c in '.eE') else int(number)
+
+
+def iter_events(stream: BinaryIO, chunk_size: int = 1 << 16) -> Iterator[Tuple[List[str], str, JsonValue]]:
+    """Инкрементально разбирает JSON и выдаёт события (путь, событие, значение)
+
+    Путь — список ключей от корня; элементы массивов обозначаются "item".
+    События: start_map, end_map, start_array, end_array, value.
+    Список пути переиспользуется между событиями, поэтому его нельзя сохранять.
+    """
+    path: List[str] = []
+    # Для каждого открытого контейнера: True — объект, False — массив
+    stack: List[bool] = []
+    expect_key = False
+    for kind, value in _tokens(stream, chunk_size):
+        if kind == b'{':
+            yield path, 'start_map', None
+            stack.append(True)
+            path.append('')
+            expect_key = True
+        elif kind == b'[':
+            yield path, 'start_array', None
+            stack.append(False)
+            path.append('item')
+        elif kind == b'}' or kind == b']':
+            stack.pop()
+            path.pop()
+            expect_key = False
+            yield path, 'end_map' if kind == b'}' else 'end_array', None
+        elif kind == b',':
+            expect_key = stack[-1]
+        elif kind == b':':
+            continue
+        elif expect_key:
+            path[-1] = value
+            expect_key = False
+        else:
+            yield path, 'value', value
+
+
+@dataclass
+class AssetsSummary:
+    """Пакеты из project.assets.json одного проекта"""
+    # Пакет -> разрешённые версии (по всем целевым платформам)
+    packages: Dict[str, List[str]] = field(default_factory=dict)
+    # Пакет -> пакеты, от которых он зависит
+    package_dependencies: Dict[str, List[str]] = field(default_factory=dict)
+    # Пакеты, на которые проект ссылается напрямую
+    direct: List[str] = field(default_factory=list)
+
+
+def parse_assets(path: Path) -> AssetsSummary:
+    """Разбирает project.assets.json, не загружая его в память целиком
+
+    Читаются `targets/<платформа>/<пакет>/<версия>` (тип и зависимости библиотек)
+    и `project/frameworks/<платформа>/dependencies` (прямые ссылки проекта).
+    """
+    versions: Dict[str, set] = {}
+    dependencies: Dict[str, set] = {}
+    library_types: Dict[str, str] = {}
+    direct = set()
+
+    with open(path, 'rb') as f:
+        for event_path, event, value in iter_events(f):
+            depth = len(event_path)
+            if depth < 3:
+                continue
+            section = event_path[0]
+            if section == 'targets':
+                library = event_path[2]
+                if depth == 4 and event_path[3] == 'type' and event == 'value':
+                    library_types[library] = value
+                elif depth == 5 and event_path[3] == 'dependencies' and event == 'value':
+                    dependencies.setdefault(library, set()).add(event_path[4])
+            elif (
+                section == 'project' and depth == 5 and event == 'start_map'
+                and event_path[1] == 'frameworks' and event_path[3] == 'dependencies'
+            ):
+                direct.add(event_path[4])
+
+    summary = AssetsSummary(direct=sorted(direct))
+    for library, library_type in library_types.items():
+        if library_type != 'package':
+            continue
+        name, _, version = library.partition('/')
+        versions.setdefault(name, set()).add(version)
+        summary.package_dependencies.setdefault(name, [])
+        for dependency in dependencies.get(library, ()):
+            if dependency not in summary.package_dependencies[name]:
+                summary.package_dependencies[name].append(dependency)
+    summary.packages = {name: sorted(found) for name, found in sorted(versions.items())}
+    for targets in summary.package_dependencies.values():
+        targets.sort()
+    return summary
+
+
+def file_hash(path: Path) -> str:
+    """SHA-256 содержимого файла (читается блоками)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AssetsCache:
+    """Кэш разобранных project.assets.json по хэшу содержимого
+
+    Args:
+        path: JSON файл для хранения кэша между запусками (None — только в памяти)
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+        self.entries: Dict[str, AssetsSummary] = {}
+        self.modified = False
+        if path is not None and path.is_file():
+            with open(path, encoding='utf-8') as f:
+                self.entries = {key: AssetsSummary(**value) for key, value in json.load(f).items()}
+
+    def get(self, key: str) -> Optional[AssetsSummary]:
+        return self.entries.get(key)
+
+    def put(self, key: str, summary: AssetsSummary) -> None:
+        self.entries[key] = summary
+        self.modified = True
+
+    def save(self) -> None:
+        """Записывает кэш в файл, если он задан и изменился"""
+        if self.path is None or not self.modified:
+            return
+        with open(self.path, 'w', encoding='utf-8', newline='\n') as f:
+            json.dump({key: asdict(value) for key, value in sorted(self.entries.items())}, f)
+        self.modified = False
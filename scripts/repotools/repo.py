@@ -0,0 +1,158 @@
+"""
+Репозиторий как контекст для нескольких проверок в одном процессе.
+
+Repo лениво вычисляет и кэширует список файлов под контролем версий, SHA их
+объектов в индексе git, прочитанные файлы, разобранное решение и граф
+зависимостей, поэтому проверки структуры и анализ графа, выполненные над
+одним Repo, не повторяют вызовы git и разбор файлов.
+"""
+
+import logging
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from . import file_access
+from .graph_analysis import ProjectGraph
+from .solution import CsprojInfo, CsprojParser, DependencyAnalyzer, Solution, load_solution
+
+
+def list_changed_files(directory: Path, revision_range: str) -> List[str]:
+    """Возвращает файлы, изменённые в диапазоне ревизий, относительно каталога directory"""
+    try:
+        result = subprocess.run(
+            ["git", "diff", "--name-only", "--relative", revision_range],
+            cwd=directory, capture_output=True, text=True, check=True
+        )
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to execute git diff: {e.stderr}") from e
+    except FileNotFoundError:
+        raise RuntimeError("Git is not installed or not in PATH") from None
+    return result.stdout.splitlines()
+
+
+def list_git_files(directory: Path) -> List[str]:
+    """Возвращает файлы под контролем версий относительно каталога directory"""
+    try:
+        # -z: пути с не-ASCII символами (test.вайбик) выводятся без кавычек и экранирования
+        result = subprocess.run(
+            ["git", "ls-files", "-z"], cwd=directory, capture_output=True, text=True, check=True
+        )
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to execute git ls-files: {e.stderr}") from e
+    except FileNotFoundError:
+        raise RuntimeError("Git is not installed or not in PATH") from None
+    return [file_path for file_path in result.stdout.split("\0") if file_path]
+
+
+def list_blob_shas(directory: Path) -> Dict[str, str]:
+    """Возвращает SHA объектов файлов в индексе git относительно каталога directory"""
+    try:
+        result = subprocess.run(
+            ["git", "ls-files", "-s", "-z"], cwd=directory, capture_output=True, text=True, check=True
+        )
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to execute git ls-files: {e.stderr}") from e
+    except FileNotFoundError:
+        raise RuntimeError("Git is not installed or not in PATH") from None
+    
+    shas: Dict[str, str] = {}
+    for entry in result.stdout.split("\0"):
+        if entry:
+            # Формат: <mode> <sha> <stage>\t<path>
+            info, _, file_path = entry.partition("\t")
+            shas[file_path] = info.split()[1]
+    return shas
+
+
+class Repo:
+    """Каталог репозитория с ленивыми кэшами
+
+    Пример:
+        with Repo(".") as repo:
+            report = check_project_structure(repo)
+            graph = repo.graph(include_tests=False)
+    """
+    
+    # Наибольший размер файла, читаемого read_text, если проверка не задаёт свой
+    MAX_FILE_SIZE = 1024 * 1024
+    
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path).resolve()
+        self._git_files: Optional[List[str]] = None
+        self._blob_shas: Optional[Dict[str, str]] = None
+        # (путь, кодировка) -> (размер файла в байтах, текст)
+        self._texts: Dict[Tuple[str, str], Tuple[int, str]] = {}
+        self._solution: Optional[Solution] = None
+        self._dependencies: Dict[bool, Dict[str, List[str]]] = {}
+    
+    def __enter__(self) -> "Repo":
+        return self
+    
+    def __exit__(self, *exc_info: object) -> None:
+        self.clear()
+    
+    def clear(self) -> None:
+        """Сбрасывает кэши (например, после изменения файлов)"""
+        self._git_files = None
+        self._blob_shas = None
+        self._texts.clear()
+        self._solution = None
+        self._dependencies.clear()
+    
+    @property
+    def git_files(self) -> List[str]:
+        """Файлы под контролем версий относительно корня"""
+        if self._git_files is None:
+            self._git_files = list_git_files(self.path)
+            logging.debug(f"Git files: {len(self._git_files)}")
+        return self._git_files
+    
+    @property
+    def blob_shas(self) -> Dict[str, str]:
+        """SHA объектов файлов в индексе git: путь -> SHA"""
+        if self._blob_shas is None:
+            self._blob_shas = list_blob_shas(self.path)
+        return self._blob_shas
+    
+    def read_text(self, relative_path: str, encoding: str = "utf-8", limit: int = MAX_FILE_SIZE) -> str:
+        """Читает текстовый файл относительно корня не больше limit байт; содержимое кэшируется
+
+        Файл больше limit байт, двоичный файл или не обычный файл — FileAccessError
+        (file_access). Переводы строк CRLF и CR заменяются на LF, как у Path.read_text.
+        """
+        key = (relative_path, encoding)
+        if key not in self._texts:
+            data = file_access.read_bytes(self.path / relative_path, limit)
+            text = file_access.decode_text(data, relative_path, encoding)
+            self._texts[key] = (len(data), text.replace("\r\n", "\n").replace("\r", "\n"))
+        size, text = self._texts[key]
+        if size > limit:
+            raise file_access.FileAccessError(f"{relative_path} is larger than {limit} bytes")
+        return text
+    
+    def csproj(self, relative_path: str) -> CsprojInfo:
+        """Сведения из файла .csproj (разбор кэшируется CsprojParser)"""
+        return CsprojParser.parse(self.path / relative_path)
+    
+    @property
+    def solution(self) -> Solution:
+        """Решение в корне репозитория"""
+        if self._solution is None:
+            self._solution = load_solution(self.path)
+        return self._solution
+    
+    def dependencies(self, include_tests: bool = True) -> Dict[str, List[str]]:
+        """Зависимости между проектами решения: проект -> проекты, от которых он зависит"""
+        if include_tests not in self._dependencies:
+            self._dependencies[include_tests] = DependencyAnalyzer.analyze(self.solution, include_tests)
+        return self._dependencies[include_tests]
+    
+    def graph(self, include_tests: bool = True) -> ProjectGraph:
+        """Граф зависимостей, включающий все проекты решения"""
+        dependencies = self.dependencies(include_tests)
+        return ProjectGraph({
+            name: dependencies.get(name, [])
+            for name, project in self.solution.projects.items()
+            if include_tests or not project.is_test
+        })
@@ -0,0 +1,127 @@
+"""
+Общее хранилище результатов проверок по содержимому файлов.
+
+Используется проверками dushnila.py (LICENSE, .editorconfig,
+Directory.Build.props, .sln, грамматики .g4, документация Markdown).
+
+Результат проверки файла зависит только от его содержимого, поэтому хранится
+по ключу (проверка, версия проверки, SHA объекта git). Студенческие репозитории
+создаются из одного шаблона, и большинство таких файлов в них побайтно
+совпадают: при проверке группы репозиториев с общим хранилищем каждый вариант
+файла разбирается один раз.
+
+Хранилище — база SQLite (модуль sqlite3 стандартной библиотеки) в режиме WAL:
+несколько процессов могут одновременно читать и дописывать её, запись ждёт
+освобождения блокировки до BUSY_TIMEOUT секунд. Совпадающие результаты,
+посчитанные параллельно, записываются один раз (`INSERT OR IGNORE`). Без файла
+база создаётся в памяти процесса. Значения хранятся в JSON.
+
+Версия проверки меняется при изменении её правил, и старые записи перестают
+использоваться.
+"""
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+# Сколько секунд ждать блокировку базы, занятую другим процессом
+BUSY_TIMEOUT = 60.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    checker TEXT NOT NULL,
+    version TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (checker, version, sha)
+) WITHOUT ROWID
+"""
+
+
+def blob_sha(data: bytes) -> str:
+    """SHA объекта git для содержимого файла (совпадает с `git hash-object`)"""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+class ResultStore:
+    """Хранилище результатов проверок по (проверка, версия, SHA содержимого)
+
+    Args:
+        path: Файл базы SQLite, общий для процессов (None — база в памяти)
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None) -> None:
+        self.path = path
+        self.connection = sqlite3.connect(
+            str(path) if path is not None else ":memory:", timeout=BUSY_TIMEOUT, isolation_level=None
+        )
+        if path is not None:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(SCHEMA)
+        # Значения, уже прочитанные или посчитанные в этом процессе
+        self.memory: Dict[Tuple[str, str, str], Any] = {}
+        self.lookups = 0
+        self.hits = 0
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Доля запросов, для которых результат уже был в хранилище"""
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def fetch(self, checker: str, version: str, data: bytes, compute: Callable[[bytes], Any]) -> Any:
+        """Результат проверки содержимого: из хранилища или compute(data)
+
+        compute должна возвращать значение, представимое в JSON. Возвращается
+        значение после преобразования в JSON и обратно (кортежи становятся списками),
+        одинаковое для найденных и посчитанных результатов.
+        """
+        return self.fetch_many(checker, version, [data], lambda contents: [compute(contents[0])])[0]
+
+    def fetch_many(
+        self,
+        checker: str,
+        version: str,
+        contents: Sequence[bytes],
+        compute_many: Callable[[List[bytes]], List[Any]],
+    ) -> List[Any]:
+        """Результаты для нескольких файлов; отсутствующие считаются одним вызовом
+        compute_many (например, в пуле процессов) и записываются одной транзакцией"""
+        keys = [(checker, version, blob_sha(data)) for data in contents]
+        self.lookups += len(keys)
+        missing: Dict[Tuple[str, str, str], bytes] = {}
+        for key, data in zip(keys, contents):
+            if key in self.memory or key in missing:
+                self.hits += 1
+                continue
+            row = self.connection.execute(
+                "SELECT value FROM results WHERE checker = ? AND version = ? AND sha = ?", key
+            ).fetchone()
+            if row is None:
+                missing[key] = data
+            else:
+                self.hits += 1
+                self.memory[key] = json.loads(row[0])
+
+        if missing:
+            encoded = [json.dumps(value, ensure_ascii=False) for value in compute_many(list(missing.values()))]
+            with self.connection:
+                self.connection.execute("BEGIN IMMEDIATE")
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO results (checker, version, sha, value) VALUES (?, ?, ?, ?)",
+                    [(*key, value) for key, value in zip(missing, encoded)],
+                )
+            for key, value in zip(missing, encoded):
+                self.memory[key] = json.loads(value)
+        return [self.memory[key] for key in keys]
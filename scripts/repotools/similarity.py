@@ -0,0 +1,326 @@
+"""
+Поиск похожих решений в группе студенческих репозиториев.
+
+Используется скриптом dushnila.py (флаг `--similarity`).
+
+Сравниваются файлы `.cs` под контролем версий из каталогов src/ и tests/
+(список файлов git, как у проверок структуры). Сгенерированные файлы
+(generated.find_generated_files: вывод ANTLR, `*.feature.cs`; комментарий
+<auto-generated>) не сравниваются.
+
+Файл разбирается лексером C# в последовательность лексем, в которой ключевые
+слова и пунктуация сохраняются, а идентификаторы и литералы заменяются общими
+метками: переименование переменных и смена строк не скрывают копирование.
+Шинглы (SHINGLE_SIZE лексем подряд) хэшируются в пуле процессов.
+
+После нормализации файлы с одинаковым устройством (узлы AST, шаблонные классы)
+совпадают почти целиком, хотя написаны независимо. Поэтому шинглы, которые
+встречаются в TEMPLATE_SHARE и более репозиториях группы (не меньше чем в трёх)
+или в репозитории-шаблоне, считаются общим каркасом и отбрасываются. Файлы, у
+которых осталось меньше MIN_SHINGLES шинглов, не сравниваются. Оставшиеся шинглы
+сворачиваются в подпись MinHash из NUM_PERM минимумов. Похожесть пары файлов
+оценивается долей совпавших позиций подписей (оценка коэффициента Жаккара).
+
+Попарное сравнение всех файлов всех репозиториев квадратично, поэтому пары-
+кандидаты ищутся LSH: подпись делится на BANDS полос, и файлы, у которых
+совпала хотя бы одна полоса, попадают в общую корзину. Число кандидатов растёт
+почти линейно с числом файлов; пары с похожестью выше (1 / BANDS) ** (1 / ROWS)
+находятся с высокой вероятностью. Общий каркас иначе заполнял бы корзины и делал
+число кандидатов квадратичным; без него корзины остаются малыми.
+
+Файлы, нормализованное содержимое которых совпадает в TEMPLATE_SHARE и более
+репозиториев группы (не меньше трёх), считаются файлами шаблона задания и не
+сравниваются.
+"""
+
+import hashlib
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from . import file_access, generated
+from .repo import Repo
+from .source_scan import map_batches
+
+# Лексемы C#: комментарии (в них ищется отметка <auto-generated>), пропускаемые
+# фрагменты, литералы (строки всех видов, символы, числа), слова и пунктуация
+SIMILARITY_TOKEN_PATTERN = re.compile(
+    r"""
+      (?P<comment>//[^\n]* | /\*.*?(?:\*/|\Z))
+    | (?P<skip>\ufeff | \s+ | \#[^\n]*)
+    | (?P<literal>\$*(?P<raw>"{3,}).*?(?:(?P=raw)|\Z)
+              | (?:\$@|@\$?)"(?:[^"]|"")*"?
+              | \$?"(?:[^"\\\n]|\\.)*"?
+              | '(?:[^'\\\n]|\\.)*'?
+              | \.?\d\w*(?:\.\d\w*)?)
+    | (?P<word>@?[^\W\d]\w*)
+    | (?P<punct>\S)
+    """,
+    re.S | re.X,
+)
+
+# Ключевые слова C#, включая контекстные: сохраняются при нормализации
+CSHARP_KEYWORDS = (
+    "abstract as base bool break byte case catch char checked class const continue decimal default "
+    "delegate do double else enum event explicit extern false finally fixed float for foreach goto if "
+    "implicit in int interface internal is lock long namespace new null object operator out override "
+    "params private protected public readonly ref return sbyte sealed short sizeof stackalloc static "
+    "string struct switch this throw true try typeof uint ulong unchecked unsafe ushort using virtual "
+    "void volatile while add and async await dynamic get init nameof not or partial record remove "
+    "required set value var when where with yield"
+).split()
+
+# Нормализованная лексема — один символ: ключевые слова, идентификаторы и литералы
+# кодируются символами из области частного использования Unicode, пунктуация — собой
+KEYWORD_CODES = {keyword: chr(0xE000 + index) for index, keyword in enumerate(CSHARP_KEYWORDS)}
+IDENTIFIER = chr(0xE000 + len(CSHARP_KEYWORDS))
+LITERAL = chr(0xE001 + len(CSHARP_KEYWORDS))
+
+# Число лексем в шингле
+SHINGLE_SIZE = 8
+# Файлы короче этого числа лексем не сравниваются (пустые классы, точки входа)
+MIN_TOKENS = 60
+# Файлы больше этого числа байт не читаются (file_access) и не сравниваются
+MAX_FILE_SIZE = 1024 * 1024
+# Файлы, у которых без общего каркаса осталось меньше шинглов, не сравниваются
+MIN_SHINGLES = 40
+
+# Подпись MinHash: NUM_PERM = BANDS * ROWS минимумов
+BANDS = 32
+ROWS = 4
+NUM_PERM = BANDS * ROWS
+
+# Пустые ячейки подписи до заполнения; значения ячеек меньше 2 ** 64 / NUM_PERM
+EMPTY = 1 << 64
+
+# Пары файлов с меньшей оценкой похожести не выводятся
+MIN_SIMILARITY = 0.6
+# Доля репозиториев группы, в которых файл или шингл должен встречаться, чтобы
+# считаться частью шаблона или общего каркаса
+TEMPLATE_SHARE = 0.5
+
+
+@dataclass
+class FileSignature:
+    """Нормализованный файл C#: число лексем, хэш лексем и хэши различных шинглов"""
+    tokens: int = 0
+    fingerprint: str = ""
+    shingles: Tuple[int, ...] = ()
+    # Файл помечен комментарием <auto-generated>
+    generated: bool = False
+
+
+@dataclass
+class FilePair:
+    """Похожие файлы двух репозиториев"""
+    similarity: float
+    left: str
+    right: str
+    # Число лексем меньшего из двух файлов
+    tokens: int = 0
+
+
+@dataclass
+class Match:
+    """Пара репозиториев с похожими файлами"""
+    left: str
+    right: str
+    files: List[FilePair] = field(default_factory=list)
+
+    @property
+    def score(self) -> float:
+        """Оценка числа скопированных лексем: похожесть файлов, взвешенная их размером
+
+        Совпадение нескольких коротких файлов весит меньше совпадения одного большого.
+        """
+        return sum(pair.similarity * pair.tokens for pair in self.files)
+
+
+def normalize_source(text: str) -> Tuple[str, bool]:
+    """Нормализованные лексемы файла (по символу на лексему) и признак <auto-generated>"""
+    codes = []
+    for match in SIMILARITY_TOKEN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind == "comment":
+            if "<auto-generated" in match.group():
+                return "", True
+        elif kind == "word":
+            codes.append(KEYWORD_CODES.get(match.group(), IDENTIFIER))
+        elif kind in ("literal", "raw"):
+            codes.append(LITERAL)
+        elif kind == "punct":
+            codes.append(match.group())
+    return "".join(codes), False
+
+
+def shingle_hashes(normalized: str) -> Tuple[int, ...]:
+    """64-битные хэши (blake2b) различных шинглов нормализованного файла"""
+    return tuple({
+        int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+        for shingle in {normalized[start:start + SHINGLE_SIZE] for start in range(len(normalized) - SHINGLE_SIZE + 1)}
+    })
+
+
+def minhash(shingles: Iterable[int]) -> Tuple[int, ...]:
+    """Подпись MinHash множества хэшей шинглов
+
+    Одна хэш-функция вместо NUM_PERM (one permutation hashing): хэш шингла
+    выбирает ячейку подписи остатком от деления на NUM_PERM, в ячейке хранится
+    наименьшее частное. Пустые ячейки (у коротких файлов) заполняются значением
+    ближайшей непустой ячейки справа по кругу со сдвигом на расстояние до неё
+    (densification), поэтому доля совпавших ячеек по-прежнему оценивает
+    коэффициент Жаккара.
+    """
+    signature = [EMPTY] * NUM_PERM
+    for shingle in shingles:
+        value, cell = divmod(shingle, NUM_PERM)
+        if value < signature[cell]:
+            signature[cell] = value
+
+    original = signature[:]
+    if EMPTY in original and any(value != EMPTY for value in original):
+        for cell, value in enumerate(original):
+            if value == EMPTY:
+                distance = 1
+                while original[(cell + distance) % NUM_PERM] == EMPTY:
+                    distance += 1
+                signature[cell] = original[(cell + distance) % NUM_PERM] + distance * EMPTY
+    return tuple(signature)
+
+
+def sign_source(path: str) -> FileSignature:
+    """Хэши шинглов файла; для коротких, слишком больших и нечитаемых файлов шинглов нет"""
+    try:
+        text = file_access.read_bytes(path, MAX_FILE_SIZE).decode("utf-8", "replace")
+    except (OSError, file_access.FileAccessError):
+        return FileSignature()
+    normalized, is_generated = normalize_source(text)
+    if is_generated or len(normalized) < MIN_TOKENS:
+        return FileSignature(len(normalized), generated=is_generated)
+    return FileSignature(
+        len(normalized), hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest(), shingle_hashes(normalized)
+    )
+
+
+def estimate_similarity(left: Tuple[int, ...], right: Tuple[int, ...]) -> float:
+    """Оценка коэффициента Жаккара по доле совпавших позиций подписей"""
+    return sum(1 for a, b in zip(left, right) if a == b) / NUM_PERM
+
+
+def candidate_pairs(signatures: Sequence[Tuple[int, ...]]) -> List[Tuple[int, int]]:
+    """Пары индексов подписей, совпавших хотя бы в одной полосе LSH"""
+    pairs = set()
+    for band in range(BANDS):
+        buckets: Dict[Tuple[int, ...], List[int]] = {}
+        for index, signature in enumerate(signatures):
+            buckets.setdefault(signature[band * ROWS:(band + 1) * ROWS], []).append(index)
+        for members in buckets.values():
+            for i, left in enumerate(members):
+                for right in members[i + 1:]:
+                    pairs.add((left, right))
+    return sorted(pairs)
+
+
+def source_files(repo: Repo) -> List[str]:
+    """Отслеживаемые файлы .cs из src/ и tests/ без сгенерированных"""
+    generated_files = generated.find_generated_files(repo.path, repo.git_files).sources
+    return [
+        file_path
+        for file_path in repo.git_files
+        if file_path.endswith(".cs") and file_path.startswith(("src/", "tests/")) and file_path not in generated_files
+    ]
+
+
+def cohort_signatures(
+    owners: Sequence[int], signed: Sequence[FileSignature], cohort_size: int
+) -> List[Tuple[Tuple[int, ...], int]]:
+    """Подписи MinHash файлов группы без файлов шаблона и общего каркаса
+
+    Args:
+        owners: Индекс репозитория каждого файла; индекс cohort_size — репозиторий-шаблон
+        signed: Хэши шинглов файлов (sign_source)
+        cohort_size: Число репозиториев группы
+
+    Returns:
+        Подпись и число лексем для каждого файла; пустая подпись, если файл не сравнивается
+    """
+    # Совпадающее содержимое во многих репозиториях — файл шаблона
+    repos_of: Dict[str, Set[int]] = {}
+    for index, signature in zip(owners, signed):
+        if signature.shingles and index < cohort_size:
+            repos_of.setdefault(signature.fingerprint, set()).add(index)
+    template_share = max(3, TEMPLATE_SHARE * cohort_size)
+    common = {fingerprint for fingerprint, repos in repos_of.items() if len(repos) >= template_share}
+
+    # Шинглы многих репозиториев и шаблона — общий каркас решений, а не копирование
+    repo_shingles: Dict[int, Set[int]] = {}
+    for index, signature in zip(owners, signed):
+        if signature.fingerprint not in common:
+            repo_shingles.setdefault(index, set()).update(signature.shingles)
+    frequency = Counter(shingle for index, shingles in repo_shingles.items() if index < cohort_size for shingle in shingles)
+    boilerplate = {shingle for shingle, count in frequency.items() if count >= template_share}
+    boilerplate |= repo_shingles.get(cohort_size, set())
+
+    signatures: List[Tuple[Tuple[int, ...], int]] = []
+    for signature in signed:
+        shingles = [shingle for shingle in signature.shingles if shingle not in boilerplate]
+        if signature.fingerprint in common or len(shingles) < MIN_SHINGLES:
+            signatures.append(((), signature.tokens))
+        else:
+            signatures.append((minhash(shingles), signature.tokens))
+    return signatures
+
+
+def find_similar(
+    paths: Sequence[Union[str, Path]],
+    template: Optional[Union[str, Path]] = None,
+    min_similarity: float = MIN_SIMILARITY,
+) -> List[Match]:
+    """Пары репозиториев с похожими файлами, по убыванию Match.score
+
+    В паре репозиториев каждый файл сопоставляется не больше чем одному файлу
+    другого репозитория — самому похожему из ещё не сопоставленных.
+
+    Args:
+        paths: Корни репозиториев группы
+        template: Репозиторий-шаблон задания; его шинглы отбрасываются как общий каркас
+        min_similarity: Наименьшая оценка похожести выводимой пары файлов
+    """
+    # (индекс репозитория, путь) для всех файлов; шаблон — репозиторий с индексом len(paths)
+    roots = [Repo(path) for path in paths] + ([Repo(template)] if template is not None else [])
+    files = [(index, file_path) for index, repo in enumerate(roots) for file_path in source_files(repo)]
+    signed = map_batches(sign_source, [str(roots[index].path / file_path) for index, file_path in files])
+
+    signatures = cohort_signatures([index for index, _ in files], signed, len(paths))
+    compared = [
+        (index, file_path, signature, tokens)
+        for (index, file_path), (signature, tokens) in zip(files, signatures)
+        if signature
+    ]
+    similar: List[Tuple[float, int, int]] = []
+    for left, right in candidate_pairs([signature for _, _, signature, _ in compared]):
+        if compared[left][0] == compared[right][0]:
+            continue
+        similarity = estimate_similarity(compared[left][2], compared[right][2])
+        if similarity >= min_similarity:
+            similar.append((similarity, left, right))
+
+    # Каждый файл выводится один раз, в паре с самым похожим файлом другого репозитория
+    matches: Dict[Tuple[int, int], Match] = {}
+    paired: Set[Tuple[int, int]] = set()
+    for similarity, left, right in sorted(similar, reverse=True):
+        other_left, other_right = (left, compared[right][0]), (right, compared[left][0])
+        if other_left in paired or other_right in paired:
+            continue
+        paired.update((other_left, other_right))
+        (left_repo, left_path, _, left_tokens), (right_repo, right_path, _, right_tokens) = sorted(
+            (compared[left], compared[right])
+        )
+        if (left_repo, right_repo) not in matches:
+            matches[left_repo, right_repo] = Match(str(paths[left_repo]), str(paths[right_repo]))
+        matches[left_repo, right_repo].files.append(
+            FilePair(similarity, left_path, right_path, min(left_tokens, right_tokens))
+        )
+    return sorted(matches.values(), key=lambda match: match.score, reverse=True)
@@ -0,0 +1,590 @@
+"""
+Модель решения .sln/.slnx и разбор файлов проектов.
+
+Решение разбирается SolutionParser (`.sln` — одним проходом регулярного выражения
+до блока `Global`, `.slnx` — потоковым XML-разбором), файлы `.csproj` — CsprojParser
+(потоковый expat с кэшем по пути, времени изменения и размеру), зависимости между
+проектами собирает DependencyAnalyzer.
+
+Публичные функции пакета:
+  load_solution(path) -> Solution   разбор решения в каталоге или по пути к файлу
+  analyze(solution)   -> ProjectGraph граф зависимостей между проектами решения
+"""
+
+import logging
+import os
+import posixpath
+import re
+import threading
+import xml.etree.ElementTree as ET
+import xml.parsers.expat as expat
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Pattern, Set, Tuple, Union
+
+from . import file_access
+from .graph_analysis import ProjectGraph
+
+
+@dataclass
+class Project:
+    """Класс для представления C# проекта"""
+    name: str
+    csproj_path: Path
+    relative_path: str
+    is_test: bool = field(default=False, init=False)
+    dependencies: Set[str] = field(default_factory=set, init=False)
+    guid: str = ""
+    folder: Optional[str] = None
+    
+    def __post_init__(self) -> None:
+        """Определяем, является ли проект тестовым"""
+        # Проверяем наличие 'tests/' в пути (регистронезависимо)
+        self.is_test = any(
+            part.lower() == 'tests' 
+            for part in self.csproj_path.parts
+        )
+
+
+@dataclass
+class Solution:
+    """Класс для представления решения .sln или .slnx"""
+    path: Path
+    directory: Path
+    projects: Dict[str, Project] = field(default_factory=dict)
+    # Папки решения: путь папки ("src", "src/Frontend") -> имена проектов в ней
+    folders: Dict[str, List[str]] = field(default_factory=dict)
+    
+    @property
+    def name(self) -> str:
+        """Имя решения (без расширения)"""
+        return self.path.stem
+
+
+class SolutionParser:
+    """Парсер файла решения .sln или .slnx"""
+    
+    # Регулярное выражение для извлечения записей проектов из .sln
+    # Формат: Project("{TypeGUID}") = "ProjectName", "RelativePath\Project.csproj", "{ProjectGUID}"
+    PROJECT_PATTERN: Pattern[str] = re.compile(
+        r'Project\("\{([^}]+)\}"\)\s*=\s*"([^"]+)"\s*,\s*"([^"]+)"\s*,\s*"\{([^}]+)\}"',
+        re.IGNORECASE
+    )
+    
+    # Начало блока Global, после которого объявлений проектов уже нет
+    GLOBAL_MARKER = '\nGlobal'
+    
+    # Единственная нужная секция блока Global — вложенность проектов в папки
+    NESTED_SECTION_PATTERN: Pattern[str] = re.compile(
+        r'GlobalSection\(NestedProjects\)[^\n]*\n(.*?)EndGlobalSection',
+        re.DOTALL
+    )
+    
+    # Формат строки секции NestedProjects: {ChildGUID} = {ParentGUID}
+    NESTED_ENTRY_PATTERN: Pattern[str] = re.compile(r'\{([^}]+)\}\s*=\s*\{([^}]+)\}')
+    
+    # GUID типа "Solution Folder"
+    SOLUTION_FOLDER_TYPE = "2150E333-8FDC-42A3-9474-1A3956D46DE8"
+    
+    # Наибольший размер файла решения (.sln на тысячи проектов занимает несколько МиБ);
+    # файлы больше, двоичные файлы и .slnx с DTD не разбираются (file_access)
+    MAX_SOLUTION_SIZE = 16 * 1024 * 1024
+    
+    @classmethod
+    def parse(cls, sln_path: Path) -> Solution:
+        """Парсит файл .sln или .slnx и возвращает объект Solution"""
+        logging.debug(f"Parsing solution file: {sln_path}")
+        
+        if not sln_path.exists():
+            raise FileNotFoundError(f"Solution file not found: {sln_path}")
+        
+        data = file_access.read_bytes(sln_path, cls.MAX_SOLUTION_SIZE)
+        if sln_path.suffix.lower() == '.slnx':
+            solution = cls._parse_slnx(sln_path, data, os.path.isfile)
+        else:
+            solution = cls._parse_sln(sln_path, cls._decode(sln_path, data), os.path.isfile)
+        
+        return cls._check_not_empty(solution)
+    
+    @classmethod
+    def parse_content(cls, sln_path: Path, data: bytes, file_exists: Callable[[Path], bool]) -> Solution:
+        """Парсит решение, прочитанное не из рабочего каталога (например, из объектов git)
+
+        Args:
+            sln_path: Путь к файлу решения, относительно которого вычисляются пути проектов
+            data: Содержимое файла решения
+            file_exists: Проверка существования файла проекта по вычисленному пути
+        """
+        logging.debug(f"Parsing solution content: {sln_path}")
+        
+        if sln_path.suffix.lower() == '.slnx':
+            solution = cls._parse_slnx(sln_path, data, file_exists)
+        else:
+            solution = cls._parse_sln(sln_path, cls._decode(sln_path, data), file_exists)
+        
+        return cls._check_not_empty(solution)
+    
+    @classmethod
+    def project_entries(cls, sln_path: Path, data: bytes) -> List[Tuple[str, str, str, str]]:
+        """Все записи проектов решения, включая папки и не-C# проекты, без проверки файлов
+
+        Для .sln просматривается только заголовок до блока Global; .slnx разбирается
+        без DTD (file_access.parse_xml), GUID в нём не записываются и остаются пустыми.
+
+        Returns:
+            Список кортежей (GUID типа, имя, нормализованный путь, GUID проекта)
+        """
+        if sln_path.suffix.lower() == '.slnx':
+            try:
+                root = file_access.parse_xml(data)
+            except ET.ParseError as e:
+                raise ValueError(f"Invalid XML in solution file: {sln_path}") from e
+            return [
+                ('', Path(path.replace('\\', '/')).stem, posixpath.normpath(path.replace('\\', '/')), '')
+                for path in (
+                    elem.get('Path', '') for elem in root.iter() if elem.tag.rsplit('}', 1)[-1] == 'Project'
+                )
+            ]
+        
+        content = cls._decode(sln_path, data)
+        return [
+            (type_guid.upper(), name, posixpath.normpath(relative_path.replace('\\', '/')), guid.upper())
+            for type_guid, name, relative_path, guid in cls._sln_entries(content)
+        ]
+    
+    @classmethod
+    def _sln_entries(cls, content: str) -> List[Tuple[str, str, str, str]]:
+        """Записи Project(...) заголовка .sln до блока Global"""
+        # Объявления проектов заканчиваются перед блоком Global:
+        # большие секции конфигураций сборки регулярным выражением не просматриваются
+        global_start = content.find(cls.GLOBAL_MARKER)
+        header_end = global_start if global_start != -1 else len(content)
+        return [match.groups() for match in cls.PROJECT_PATTERN.finditer(content, 0, header_end)]
+    
+    @classmethod
+    def _decode(cls, sln_path: Path, data: bytes) -> str:
+        """Декодирует содержимое .sln (UTF-8, возможно с BOM)"""
+        try:
+            return data.decode('utf-8-sig')
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Cannot read solution file (invalid encoding): {sln_path}") from e
+    
+    @classmethod
+    def _check_not_empty(cls, solution: Solution) -> Solution:
+        """Проверяет, что в решении нашлись C# проекты"""
+        if not solution.projects:
+            raise ValueError(f"No C# projects found in solution: {solution.path}")
+        
+        logging.debug(f"Found {len(solution.projects)} projects in solution")
+        return solution
+    
+    @classmethod
+    def _parse_sln(cls, sln_path: Path, content: str, file_exists: Callable[[Path], bool]) -> Solution:
+        """Разбирает классический .sln за один проход finditer по заголовку"""
+        solution = Solution(path=sln_path, directory=sln_path.parent)
+        global_start = content.find(cls.GLOBAL_MARKER)
+        
+        folder_names: Dict[str, str] = {}
+        project_guids: Dict[str, str] = {}
+        
+        for type_guid, project_name, relative_path, guid in cls._sln_entries(content):
+            guid = guid.upper()
+            
+            if type_guid.upper() == cls.SOLUTION_FOLDER_TYPE:
+                folder_names[guid] = project_name
+                continue
+            
+            # Пропускаем не-C# проекты
+            if not relative_path.lower().endswith('.csproj'):
+                logging.debug(f"Skipping non-C# project: {project_name}")
+                continue
+            
+            project = cls._create_project(sln_path, project_name, relative_path, file_exists)
+            project.guid = guid
+            solution.projects[project_name] = project
+            project_guids[guid] = project_name
+        
+        if global_start != -1 and folder_names:
+            parents = cls._parse_nested_projects(content, global_start)
+            cls._assign_folders(solution, folder_names, project_guids, parents)
+        
+        return solution
+    
+    @classmethod
+    def _parse_nested_projects(cls, content: str, global_start: int) -> Dict[str, str]:
+        """Читает секцию NestedProjects: GUID элемента -> GUID родительской папки"""
+        section = cls.NESTED_SECTION_PATTERN.search(content, global_start)
+        if not section:
+            return {}
+        
+        return {
+            child.upper(): parent.upper()
+            for child, parent in cls.NESTED_ENTRY_PATTERN.findall(
+                content, section.start(1), section.end(1)
+            )
+        }
+    
+    @classmethod
+    def _assign_folders(
+        cls,
+        solution: Solution,
+        folder_names: Dict[str, str],
+        project_guids: Dict[str, str],
+        parents: Dict[str, str],
+    ) -> None:
+        """Собирает полные пути папок и раскладывает по ним проекты"""
+        folder_paths: Dict[str, str] = {}
+        
+        def folder_path(guid: str) -> str:
+            # Поднимаемся по цепочке родителей; visited защищает
+            # от зацикленной секции NestedProjects
+            if guid in folder_paths:
+                return folder_paths[guid]
+            parts = []
+            visited: Set[str] = set()
+            current: Optional[str] = guid
+            while current in folder_names and current not in visited:
+                visited.add(current)
+                parts.append(folder_names[current])
+                current = parents.get(current)
+            folder_paths[guid] = '/'.join(reversed(parts))
+            return folder_paths[guid]
+        
+        for guid in folder_names:
+            solution.folders.setdefault(folder_path(guid), [])
+        
+        for guid, project_name in project_guids.items():
+            parent = parents.get(guid)
+            if parent in folder_names:
+                path = folder_path(parent)
+                solution.projects[project_name].folder = path
+                solution.folders[path].append(project_name)
+        
+        for projects in solution.folders.values():
+            projects.sort()
+    
+    @classmethod
+    def _parse_slnx(cls, slnx_path: Path, data: bytes, file_exists: Callable[[Path], bool]) -> Solution:
+        """Разбирает XML-решение .slnx без DTD (file_access.parse_xml)"""
+        solution = Solution(path=slnx_path, directory=slnx_path.parent)
+        
+        try:
+            root = file_access.parse_xml(data)
+        except ET.ParseError as e:
+            raise ValueError(f"Invalid XML in solution file: {slnx_path}") from e
+        
+        def visit(elem: ET.Element, folder: Optional[str]) -> None:
+            for child in elem:
+                tag = child.tag.rsplit('}', 1)[-1]
+                
+                if tag == 'Folder':
+                    # Имя папки в .slnx — полный путь вида "/src/Frontend/"
+                    path = child.get('Name', '').strip('/')
+                    solution.folders.setdefault(path, [])
+                    visit(child, path)
+                elif tag == 'Project':
+                    relative_path = child.get('Path', '')
+                    if not relative_path.lower().endswith('.csproj'):
+                        logging.debug(f"Skipping non-C# project: {relative_path}")
+                        continue
+                    
+                    project_name = Path(relative_path.replace('\\', '/')).stem
+                    project = cls._create_project(slnx_path, project_name, relative_path, file_exists)
+                    if folder is not None:
+                        project.folder = folder
+                        solution.folders[folder].append(project_name)
+                    solution.projects[project_name] = project
+                else:
+                    visit(child, folder)
+        
+        visit(root, None)
+        
+        for projects in solution.folders.values():
+            projects.sort()
+        
+        return solution
+    
+    @classmethod
+    def _create_project(
+        cls, sln_path: Path, project_name: str, relative_path: str, file_exists: Callable[[Path], bool]
+    ) -> Project:
+        """Создаёт проект, проверяя наличие его .csproj файла"""
+        # Преобразуем относительный путь в абсолютный
+        # Заменяем обратные слеши на прямые для кроссплатформенности
+        # (normpath вместо resolve: на тысячах проектов realpath заметно дороже)
+        normalized_path = relative_path.replace('\\', '/')
+        csproj_path = Path(os.path.normpath(os.path.join(sln_path.parent, normalized_path)))
+        
+        if not file_exists(csproj_path):
+            raise ValueError(f"Project file not found: {csproj_path}")
+        
+        logging.debug(f"Found project: {project_name} ({csproj_path})")
+        return Project(
+            name=project_name,
+            csproj_path=csproj_path,
+            relative_path=relative_path
+        )
+
+
+@dataclass
+class CsprojInfo:
+    """Сведения из файла .csproj, нужные для анализа зависимостей"""
+    # Значения атрибута Include элементов <ProjectReference>
+    references: List[str] = field(default_factory=list)
+    # Значения атрибута Project элементов <Import>
+    imports: List[str] = field(default_factory=list)
+    # Свойства из <PropertyGroup>: имя -> значение (последнее определение побеждает)
+    properties: Dict[str, str] = field(default_factory=dict)
+    # Пакеты <PackageReference Include>: имя -> версия (пустая, если не указана)
+    packages: Dict[str, str] = field(default_factory=dict)
+    # Переопределения версий <PackageReference Update> для унаследованных пакетов
+    package_updates: Dict[str, str] = field(default_factory=dict)
+    # Глобальные директивы <Using Include> (пространства имён)
+    usings: List[str] = field(default_factory=list)
+    
+    @property
+    def dependencies(self) -> Set[str]:
+        """Имена проектов, на которые ссылается проект"""
+        # Формат: ..\OtherProject\OtherProject.csproj или ../OtherProject/OtherProject.csproj
+        return {
+            posixpath.splitext(posixpath.basename(reference.replace('\\', '/')))[0]
+            for reference in self.references
+        }
+
+
+class CsprojParser:
+    """Парсер файлов .csproj для извлечения зависимостей между проектами"""
+    
+    # Наибольший размер файла проекта; файлы больше, двоичные файлы и XML с DTD
+    # не разбираются (file_access)
+    MAX_FILE_SIZE = 1024 * 1024
+    
+    # Разобранные файлы: путь -> ((mtime_ns, размер), сведения о проекте).
+    # Кэш общий для всех репозиториев процесса, поэтому ограничен CACHE_SIZE
+    # записями: при переполнении удаляется давно не использованная (LRU)
+    CACHE_SIZE = 4096
+    _cache: "OrderedDict[Path, Tuple[Tuple[int, int], CsprojInfo]]" = OrderedDict()
+    _cache_lock = threading.Lock()
+    
+    @classmethod
+    def parse(cls, csproj_path: Path) -> CsprojInfo:
+        """Разбирает файл .csproj; повторный разбор неизменённого файла берётся из кэша"""
+        try:
+            stat = os.stat(csproj_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Project file not found: {csproj_path}") from None
+        
+        key = (stat.st_mtime_ns, stat.st_size)
+        with cls._cache_lock:
+            cached = cls._cache.get(csproj_path)
+            if cached is not None and cached[0] == key:
+                cls._cache.move_to_end(csproj_path)
+                return cached[1]
+        
+        info = cls._parse_file(csproj_path)
+        with cls._cache_lock:
+            cls._cache[csproj_path] = (key, info)
+            cls._cache.move_to_end(csproj_path)
+            while len(cls._cache) > cls.CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        return info
+    
+    @classmethod
+    def parse_bytes(cls, csproj_path: Path, data: bytes) -> CsprojInfo:
+        """Разбирает содержимое .csproj, прочитанное не из рабочего каталога (например, из git)"""
+        return cls._parse_file(csproj_path, data)
+    
+    @classmethod
+    def _parse_file(cls, csproj_path: Path, data: Optional[bytes] = None) -> CsprojInfo:
+        """Потоковый разбор: читает только ProjectReference, Import и PropertyGroup
+
+        Обработчики событий expat вызываются только для начала элементов; обработчики
+        конца элементов и текста подключаются лишь внутри PropertyGroup. Дерево
+        документа не строится, поэтому разбор быстрее ET.parse и не зависит по памяти
+        от размера файла. Файл читается блоками не больше MAX_FILE_SIZE байт, DTD и
+        двоичное содержимое отклоняются (file_access.FileAccessError).
+        """
+        logging.debug(f"Parsing project file: {csproj_path}")
+        
+        info = CsprojInfo()
+        parser = expat.ParserCreate()
+        file_access.harden_parser(parser)
+        parser.buffer_text = True
+        text: List[str] = []
+        
+        def start_element(tag: str, attrs: Dict[str, str]) -> None:
+            # Пространство имён MSBuild объявляется по умолчанию (xmlns=...), поэтому
+            # без обработки пространств имён expat сообщает имена элементов без префикса
+            if tag == 'ProjectReference':
+                include_attr = attrs.get('Include')
+                if include_attr:
+                    info.references.append(include_attr)
+                    logging.debug(f"  Found dependency: {include_attr}")
+            elif tag == 'PackageReference':
+                if 'Include' in attrs:
+                    info.packages[attrs['Include']] = attrs.get('Version', '')
+                elif 'Update' in attrs:
+                    info.package_updates[attrs['Update']] = attrs.get('Version', '')
+            elif tag == 'Using':
+                include_attr = attrs.get('Include')
+                if include_attr:
+                    info.usings.append(include_attr)
+            elif tag == 'Import':
+                project_attr = attrs.get('Project')
+                if project_attr:
+                    info.imports.append(project_attr)
+            elif tag == 'PropertyGroup':
+                parser.StartElementHandler = start_property
+                parser.EndElementHandler = end_property
+                parser.CharacterDataHandler = text.append
+        
+        def start_property(name: str, attrs: Dict[str, str]) -> None:
+            text.clear()
+        
+        def end_property(tag: str) -> None:
+            if tag == 'PropertyGroup':
+                parser.StartElementHandler = start_element
+                parser.EndElementHandler = None
+                parser.CharacterDataHandler = None
+            else:
+                info.properties[tag] = ''.join(text).strip()
+            text.clear()
+        
+        parser.StartElementHandler = start_element
+        try:
+            if data is not None:
+                if len(data) > cls.MAX_FILE_SIZE:
+                    raise file_access.FileAccessError(f"{csproj_path} is larger than {cls.MAX_FILE_SIZE} bytes")
+                file_access.check_text(data, csproj_path)
+                parser.Parse(data, True)
+            else:
+                for chunk in file_access.iter_chunks(csproj_path, cls.MAX_FILE_SIZE):
+                    file_access.check_text(chunk, csproj_path)
+                    parser.Parse(chunk, False)
+                parser.Parse(b'', True)
+        except expat.ExpatError as e:
+            raise ValueError(f"Invalid XML in project file: {csproj_path}") from e
+        
+        return info
+    
+    @classmethod
+    def parse_dependencies(cls, csproj_path: Path) -> Set[str]:
+        """Извлекает зависимости на другие проекты из файла .csproj"""
+        return cls.parse(csproj_path).dependencies
+
+
+class DependencyAnalyzer:
+    """Анализатор зависимостей между проектами"""
+    
+    @classmethod
+    def analyze(
+        cls,
+        solution: Solution,
+        include_tests: bool = False,
+        parse_dependencies: Optional[Callable[[Project], Set[str]]] = None,
+    ) -> Dict[str, List[str]]:
+        """Анализирует зависимости между проектами в решении
+
+        Args:
+            solution: Решение
+            include_tests: Учитывать тестовые проекты
+            parse_dependencies: Источник зависимостей проекта; по умолчанию
+                файл .csproj читается из рабочего каталога
+        """
+        logging.debug("Analyzing project dependencies...")
+        
+        if parse_dependencies is None:
+            parse_dependencies = lambda project: CsprojParser.parse_dependencies(project.csproj_path)
+        
+        projects = []
+        for project_name, project in solution.projects.items():
+            # Пропускаем тестовые проекты, если не включен флаг
+            if project.is_test and not include_tests:
+                logging.debug(f"Skipping test project: {project_name}")
+                continue
+            projects.append(project)
+        
+        # Разбор выполняется последовательно: обработчики expat держат GIL, и пул
+        # потоков не ускорял холодный разбор. Повторный анализ берёт результаты из кэша
+        results: List[Tuple[str, Optional[Set[str]]]] = []
+        for project in projects:
+            try:
+                results.append((project.name, parse_dependencies(project)))
+            except Exception:
+                logging.exception(f"Failed to parse dependencies for project: {project.name}")
+                results.append((project.name, None))
+        
+        # Собираем зависимости для каждого проекта
+        dependencies: Dict[str, List[str]] = defaultdict(list)
+        
+        for project_name, deps in results:
+            if deps is None:
+                # Ошибка уже записана в лог; продолжаем анализ для других проектов
+                continue
+            
+            # Фильтруем зависимости, оставляя только проекты из текущего решения
+            for dep in sorted(deps):
+                if dep in solution.projects:
+                    dependencies[project_name].append(dep)
+                else:
+                    logging.debug(f"Dependency on external project: {dep} (not in solution)")
+        
+        return dict(dependencies)
+
+
+class ProjectFileIndex:
+    """Индекс принадлежности файлов проектам по каталогам их .csproj файлов"""
+    
+    def __init__(self, solution: Solution) -> None:
+        # Каталог проекта относительно каталога решения (в формате git) -> имя проекта
+        self.directories: Dict[str, str] = {}
+        for project in solution.projects.values():
+            directory = os.path.relpath(project.csproj_path.parent, solution.directory)
+            self.directories[Path(directory).as_posix()] = project.name
+    
+    def owner(self, file_path: str) -> Optional[str]:
+        """Возвращает проект, которому принадлежит файл (ближайший по вложенности каталог)"""
+        directory = posixpath.dirname(file_path)
+        while True:
+            project_name = self.directories.get(directory or '.')
+            if project_name is not None:
+                return project_name
+            if not directory:
+                return None
+            directory = posixpath.dirname(directory)
+
+
+def find_solution_file(directory: Path) -> Path:
+    """Находит файл .sln или .slnx в указанном каталоге"""
+    sln_files = list(directory.glob("*.sln")) + list(directory.glob("*.slnx"))
+    
+    if not sln_files:
+        raise FileNotFoundError(f"No .sln or .slnx files found in directory: {directory}")
+    
+    if len(sln_files) > 1:
+        raise ValueError(f"Multiple solution files found in directory: {directory}. Please specify which one to use.")
+    
+    return sln_files[0]
+
+
+def load_solution(path: Union[str, Path]) -> Solution:
+    """Разбирает решение: путь к файлу .sln/.slnx или каталог с единственным решением"""
+    path = Path(path).resolve()
+    if path.is_dir():
+        path = find_solution_file(path)
+    return SolutionParser.parse(path)
+
+
+def analyze(solution: Solution, include_tests: bool = True) -> ProjectGraph:
+    """Строит граф зависимостей между проектами решения
+
+    В граф входят все проекты (с учётом include_tests), в том числе не связанные
+    с другими проектами.
+    """
+    dependencies = DependencyAnalyzer.analyze(solution, include_tests)
+    return ProjectGraph({
+        name: dependencies.get(name, [])
+        for name, project in solution.projects.items()
+        if include_tests or not project.is_test
+    })
@@ -0,0 +1,308 @@
+"""
+Параллельное сканирование исходных файлов C#.
+
+Используется скриптом print-solution-graph.py (флаги `--metrics`, `--annotate`
+и `--check-references`).
+
+Файлы читаются как байты и не декодируются: строки считаются через
+`bytes.count(b"\\n")`, объявления типов — регулярным выражением по байтам.
+Этого достаточно для метрик размера и позволяет обрабатывать репозитории
+из сотен тысяч файлов. Файлы раздаются пакетами в пул процессов: подсчёт
+упирается в процессор, и потоки из-за GIL не ускорили бы его.
+
+Для проверки ссылок между проектами читается только заголовок файла: директивы
+`using`, `global using`, `extern alias` и объявления `namespace`. Лексер пропускает
+пробелы, комментарии, строки и директивы препроцессора и останавливается на первой
+лексеме, которая не может стоять в заголовке (модификатор, атрибут, объявление типа).
+Файл читается блоками (file_access.iter_chunks), и чтение прекращается вместе с
+заголовком: остаток большого файла не читается.
+
+Для проверки пространств имён и имён файлов (dushnila.py) читаются первые
+DECLARATION_SCAN_SIZE байт файла до первого типа верхнего уровня: объявление
+namespace (блочное или на весь файл) и имя типа. Лексер понимает комментарии, обычные, буквальные,
+интерполированные и необработанные строки и символьные литералы, поэтому ключевые
+слова в них и в атрибутах не принимаются за объявления.
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from . import file_access
+
+# Объявление типа: class/struct/interface/enum/record и имя типа.
+# Подсчёт приблизительный: комментарии и строки не исключаются,
+# а `record struct`/`record class` и ограничение `where T : class` не считаются дважды
+TYPE_DECLARATION_PATTERN = re.compile(
+    rb'\b(?:class|struct|interface|enum|record)\s+(?!class\b|struct\b|where\b)[A-Za-z_]\w*'
+)
+
+# Лексемы заголовка файла C#: пропускаемые фрагменты (BOM, пробелы, комментарии,
+# строки, директивы препроцессора), квалифицированные имена и значимая пунктуация.
+# Любой другой символ означает конец заголовка
+HEADER_TOKEN_PATTERN = re.compile(
+    rb"""
+      (?P<skip>\xef\xbb\xbf | \s+ | //[^\n]* | /\*.*?(?:\*/|\Z) | \#[^\n]*
+              | @?"(?:[^"\\]|\\.)*(?:"|\\?\Z))
+    | (?P<word>@?[A-Za-z_][\w.]*(?:::[A-Za-z_][\w.]*)?)
+    | (?P<punct>[;{}=])
+    | (?P<other>.)
+    """,
+    re.S | re.X,
+)
+
+# Лексемы начала файла C# для поиска namespace и типов верхнего уровня:
+# комментарии отдельно от остальных пропускаемых фрагментов (в них ищется
+# отметка <auto-generated>), строки всех видов, слова и фигурные скобки
+DECLARATION_TOKEN_PATTERN = re.compile(
+    r"""
+      (?P<comment>//[^\n]* | /\*.*?(?:\*/|\Z))
+    | (?P<skip>\ufeff | \s+ | \#[^\n]*
+              | \$*(?P<raw>"{3,}).*?(?:(?P=raw)|\Z)
+              | (?:\$@|@\$?)"(?:[^"]|"")*"?
+              | \$?"(?:[^"\\\n]|\\.)*"?
+              | '(?:[^'\\\n]|\\.)*'?)
+    | (?P<word>@?[^\W\d]\w*(?:\.[^\W\d]\w*)*)
+    | (?P<punct>[{};])
+    | (?P<other>.)
+    """,
+    re.S | re.X,
+)
+
+TYPE_KEYWORDS = ('class', 'struct', 'interface', 'enum', 'record')
+
+# Сколько байт начала файла читается для поиска объявлений
+DECLARATION_SCAN_SIZE = 8192
+
+# Лексема, которая заканчивается ближе этого числа байт к концу прочитанного
+# (`Name` перед `::Type`), может продолжаться в следующем блоке файла
+HEADER_LOOKAHEAD = 3
+
+# Заголовок файла длиннее этого числа байт не дочитывается
+HEADER_SCAN_LIMIT = 1024 * 1024
+
+# Число файлов в одной задаче пула процессов
+BATCH_SIZE = 256
+
+Item = TypeVar('Item')
+Result = TypeVar('Result')
+
+
+@dataclass
+class SourceCounts:
+    """Размер одного исходного файла"""
+    lines: int = 0
+    bytes: int = 0
+    types: int = 0
+
+
+def count_source(path: str) -> SourceCounts:
+    """Считает строки, байты и объявления типов в файле
+
+    Отслеживаемый, но удалённый из рабочего каталога файл считается пустым.
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return SourceCounts()
+    lines = data.count(b'\n')
+    # Последняя строка без завершающего перевода строки тоже считается
+    if data and not data.endswith(b'\n'):
+        lines += 1
+    return SourceCounts(lines, len(data), len(TYPE_DECLARATION_PATTERN.findall(data)))
+
+
+@dataclass
+class SourceHeader:
+    """Пространства имён, объявленные и подключённые в заголовке файла"""
+    namespaces: List[str] = field(default_factory=list)
+    usings: List[str] = field(default_factory=list)
+
+
+def _header_tokens(chunks: Iterable[bytes]) -> Iterator[Tuple[str, str]]:
+    """Значимые лексемы заголовка: ("word", "Ast.Nodes"), ("punct", ";"), ("other", "[")
+
+    Следующий блок читается, только когда лексемы прочитанных блоков закончились.
+    Лексема у конца прочитанного разбирается заново вместе со следующим блоком.
+    """
+    chunks = iter(chunks)
+    data = b''
+    position = 0
+    finished = False
+    while not finished:
+        chunk = next(chunks, None)
+        if chunk is None:
+            finished = True
+        else:
+            data = data[position:] + chunk
+            position = 0
+        for match in HEADER_TOKEN_PATTERN.finditer(data, position):
+            if not finished and match.end() + HEADER_LOOKAHEAD > len(data):
+                break
+            position = match.end()
+            kind = match.lastgroup
+            if kind != 'skip':
+                yield kind, match.group().decode('utf-8', 'replace')
+
+
+def scan_header(path: str) -> SourceHeader:
+    """Читает директивы using и объявления namespace до первого объявления в файле
+
+    Для `using Alias = X.Y;` и `using static X.Y;` записывается X.Y. Имена с
+    квалификатором `global::` записываются без него.
+    """
+    header = SourceHeader()
+    chunks = file_access.iter_chunks(path, HEADER_SCAN_LIMIT)
+    try:
+        _read_header(_header_tokens(chunks), header)
+    except (OSError, ValueError):
+        # Нечитаемый файл или слишком длинный заголовок: остаётся прочитанное
+        pass
+    finally:
+        chunks.close()
+    return header
+
+
+def _read_header(tokens: Iterator[Tuple[str, str]], header: SourceHeader) -> None:
+    """Заполняет header директивами и объявлениями из лексем до конца заголовка"""
+
+    def next_word() -> Optional[str]:
+        kind, value = next(tokens, ('other', ''))
+        return value if kind == 'word' else None
+
+    for kind, value in tokens:
+        if kind == 'punct' and value in '{;':
+            # Открывающая скобка блочного namespace или пустая директива
+            continue
+        if kind != 'word' or value not in ('global', 'using', 'namespace', 'extern'):
+            break
+        if value == 'global':
+            continue
+        name = next_word()
+        if name is None:
+            break
+        if value == 'namespace':
+            header.namespaces.append(name)
+            continue
+        if value == 'extern':
+            # extern alias X;
+            for kind, token in tokens:
+                if kind == 'punct' and token == ';':
+                    break
+            continue
+        terminated = False
+        if name == 'static':
+            name = next_word()
+        else:
+            kind, token = next(tokens, ('other', ''))
+            if kind == 'punct' and token == '=':
+                name = next_word()
+            elif kind == 'punct' and token == ';':
+                terminated = True
+            else:
+                break
+        if name is None:
+            break
+        header.usings.append(name.split('::')[-1])
+        if not terminated:
+            # Остаток директивы (например, аргументы обобщённого псевдонима) пропускается
+            for kind, token in tokens:
+                if kind == 'punct' and token == ';':
+                    break
+
+
+@dataclass
+class SourceDeclarations:
+    """Пространство имён и первый тип верхнего уровня в файле"""
+    namespace: Optional[str] = None
+    type_name: Optional[str] = None
+    # Файл помечен комментарием <auto-generated>
+    generated: bool = False
+
+
+def scan_declarations(path: str) -> SourceDeclarations:
+    """Читает объявление namespace и имя первого типа верхнего уровня из начала файла
+
+    Разбор останавливается на имени типа. Типы из вложенных блоков (например,
+    внутри инструкций верхнего уровня) не учитываются.
+    """
+    declarations = SourceDeclarations()
+    try:
+        with open(path, 'rb') as f:
+            text = f.read(DECLARATION_SCAN_SIZE).decode('utf-8', 'replace')
+    except OSError:
+        return declarations
+
+    depth = 0
+    # Глубина скобок, на которой объявляются типы верхнего уровня
+    top_depth = 0
+    expect_namespace = False
+    expect_type = False
+    for match in DECLARATION_TOKEN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        value = match.group()
+        if kind == 'comment':
+            if '<auto-generated' in value:
+                declarations.generated = True
+                break
+            continue
+        if kind in ('skip', 'raw'):
+            continue
+        if kind == 'punct':
+            if value == '{':
+                depth += 1
+                if expect_namespace:
+                    top_depth = depth
+            elif value == '}':
+                depth -= 1
+                if depth < top_depth:
+                    top_depth = depth
+            expect_namespace = expect_type = False
+            continue
+        if kind != 'word' or depth != top_depth:
+            expect_type = False
+            continue
+        if expect_type:
+            # record class/record struct: имя идёт после второго ключевого слова
+            if value not in ('class', 'struct'):
+                declarations.type_name = value.lstrip('@')
+                break
+        elif expect_namespace:
+            if declarations.namespace is None:
+                declarations.namespace = value
+        elif value == 'namespace' and depth == 0:
+            expect_namespace = True
+        elif value in TYPE_KEYWORDS:
+            expect_type = True
+    return declarations
+
+
+def _run_batch(function: Callable[[Item], Result], items: Sequence[Item]) -> List[Result]:
+    return [function(item) for item in items]
+
+
+def map_batches(
+    function: Callable[[Item], Result], items: Sequence[Item], batch_size: int = BATCH_SIZE
+) -> List[Result]:
+    """Применяет function к элементам в пуле процессов, сохраняя порядок результатов
+
+    function должна быть функцией уровня модуля (передаётся в процессы по имени).
+    На одном ядре или для одного пакета пул не создаётся. Если ожидание прервано
+    (file_access.CheckTimeoutError, KeyboardInterrupt), ещё не начатые пакеты
+    отменяются и завершение работающих не ожидается.
+    """
+    batches = [items[start:start + batch_size] for start in range(0, len(items), batch_size)]
+    if len(batches) > 1 and (os.cpu_count() or 1) > 1:
+        executor = ProcessPoolExecutor()
+        try:
+            parsed = list(executor.map(_run_batch, [function] * len(batches), batches))
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+    else:
+        parsed = [_run_batch(function, batch) for batch in batches]
+    return [result for batch in parsed for result in batch]
@@ -0,0 +1,1524 @@
+"""
+NOTE: Этот модуль создан ИИ-моделью.
+
+Проверка структуры студенческого C# проекта.
+
+Проверяет структуру каталогов, расположение файлов, наличие необходимых
+файлов конфигурации и соответствие требованиям к содержимому.
+
+Публичная функция пакета:
+  check_project_structure(path) -> Report   путь к корню проекта или Repo
+
+Командная строка — скрипт dushnila.py (функция main этого модуля).
+"""
+
+import argparse
+import datetime
+import fnmatch
+import logging
+import pathlib
+import posixpath
+import re
+import sys
+import urllib.parse
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Pattern, Set, Tuple, Union
+
+from . import editorconfig, file_access, generated, gherkin, grammar, lexicon, markdown, similarity
+from .graph_analysis import ProjectGraph
+from .repo import Repo
+from .results import ResultStore
+from .solution import CsprojParser, SolutionParser
+from .source_scan import map_batches, scan_declarations
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Обработка аргументов командной строки.
+
+    Returns:
+        Разобранные аргументы командной строки
+    """
+    parser = argparse.ArgumentParser(description="Проверка структуры студенческого C# проекта")
+    parser.add_argument(
+        "path", nargs="?", default=".", help="Путь к корню проекта (по умолчанию: текущий каталог)"
+    )
+    parser.add_argument("--verbose", action="store_true", help="Вывод отладочных сообщений")
+    parser.add_argument(
+        "--update-generated",
+        action="store_true",
+        help="Записать SHA исходников и сгенерированных файлов в generated-files.txt и выйти",
+    )
+    parser.add_argument(
+        "--result-store",
+        metavar="FILE",
+        help="База SQLite с результатами проверок файлов по SHA содержимого, общая для запусков и процессов",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=file_access.CHECK_TIMEOUT,
+        metavar="SECONDS",
+        help=f"Ограничение времени каждой проверки, 0 — без ограничения (по умолчанию: {file_access.CHECK_TIMEOUT:g})",
+    )
+    parser.add_argument(
+        "--similarity",
+        nargs="+",
+        metavar="REPO",
+        help="Вместо проверки структуры найти похожие файлы .cs в репозиториях группы и выйти",
+    )
+    parser.add_argument(
+        "--template", metavar="REPO", help="Репозиторий-шаблон задания: похожие на его файлы не сравниваются"
+    )
+    parser.add_argument(
+        "--top", type=int, default=10, help="Сколько пар репозиториев выводить с --similarity (по умолчанию: 10)"
+    )
+    return parser.parse_args()
+
+
+def setup_logging(verbose: bool) -> None:
+    """Настройка логирования.
+
+    Args:
+        verbose: Флаг вывода отладочных сообщений
+    """
+    level = logging.DEBUG if verbose else logging.INFO
+    logging.basicConfig(level=level, format="%(levelname)s: %(message)s", datefmt="%H:%M:%S")
+
+
+@dataclass
+class Report:
+    """Результат проверки структуры проекта."""
+
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def error_count(self) -> int:
+        return len(self.errors)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def log_summary(self) -> None:
+        """Вывести итоговое сообщение."""
+        if self.error_count > 0:
+            logging.error(f"Проверка проекта не пройдена. Найдено ошибок: {self.error_count}")
+        else:
+            logging.info("Проверка проекта пройдена успешно. Ошибок не найдено.")
+
+
+class ErrorReporter:
+    """Центральный отчётчик ошибок: логирует и собирает ошибки."""
+
+    def __init__(self) -> None:
+        self.errors: List[str] = []
+
+    @property
+    def error_count(self) -> int:
+        return len(self.errors)
+
+    def error(self, message: str) -> None:
+        """Зарегистрировать ошибку."""
+        logging.error(message)
+        self.errors.append(message)
+
+    def report(self) -> Report:
+        """Собранные ошибки в виде отчёта."""
+        return Report(list(self.errors))
+
+
+class FindingCollector(ErrorReporter):
+    """Собирает замечания проверки содержимого одного файла без вывода в лог.
+
+    Замечания сохраняются в общем хранилище результатов и выводятся функцией
+    replay_findings при каждой проверке файла с тем же содержимым.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.findings: List[List[str]] = []
+
+    def error(self, message: str) -> None:
+        self.errors.append(message)
+        self.findings.append(["error", message])
+
+    def warning(self, message: str) -> None:
+        self.findings.append(["warning", message])
+
+
+def stored_findings(
+    store: ResultStore,
+    checker: str,
+    version: str,
+    data: bytes,
+    check: Callable[[bytes, FindingCollector], None],
+) -> List[List[str]]:
+    """Замечания check по содержимому файла: из хранилища или после проверки."""
+
+    def compute(content: bytes) -> Any:
+        collector = FindingCollector()
+        check(content, collector)
+        return collector.findings
+
+    return store.fetch(checker, version, data, compute)
+
+
+def replay_findings(findings: List[List[str]], error_reporter: ErrorReporter) -> None:
+    """Вывести сохранённые замечания: ошибки — в отчёт, предупреждения — в лог."""
+    for severity, message in findings:
+        if severity == "error":
+            error_reporter.error(message)
+        else:
+            logging.warning(message)
+
+
+class BuildPropsChecker:
+    """Класс для проверки файла Directory.Build.props
+
+    Файл читается не больше MAX_FILE_SIZE байт и разбирается без DTD
+    (file_access.parse_xml), поэтому сущности XML не раскрываются.
+    """
+
+    FILE_NAME = "Directory.Build.props"
+    CHECKER = "build-props"
+    VERSION = "2"
+    MAX_FILE_SIZE = 256 * 1024
+
+    REQUIRED_PACKAGES = [
+        "Microsoft.CodeAnalysis.NetAnalyzers",
+        "Roslynator.Analyzers",
+        "StyleCop.Analyzers",
+        "xunit.analyzers",
+    ]
+
+    def __init__(self, store: Optional[ResultStore] = None) -> None:
+        self.store = store if store is not None else ResultStore()
+
+    def check(self, project_path: pathlib.Path, error_reporter: ErrorReporter) -> None:
+        file_path = project_path / self.FILE_NAME
+        if not file_path.exists():
+            error_reporter.error(f"Отсутствует файл {self.FILE_NAME} в корне проекта")
+            return
+
+        try:
+            data = file_access.read_bytes(file_path, self.MAX_FILE_SIZE)
+        except (OSError, file_access.FileAccessError) as e:
+            error_reporter.error(f"Ошибка при проверке файла {self.FILE_NAME}: {str(e)}")
+            return
+        replay_findings(stored_findings(self.store, self.CHECKER, self.VERSION, data, self._check_content), error_reporter)
+
+    def _check_content(self, data: bytes, error_reporter: ErrorReporter) -> None:
+        try:
+            root = self._parse_xml(data)
+            self._check_property_group(root, error_reporter)
+            self._check_package_references(root, error_reporter)
+        except Exception as e:
+            error_reporter.error(f"Ошибка при проверке файла {self.FILE_NAME}: {str(e)}")
+
+    def _parse_xml(self, data: bytes) -> ET.Element:
+        try:
+            return file_access.parse_xml(data)
+        except ET.ParseError as e:
+            raise Exception(f"XML parsing error: {str(e)}") from e
+
+    def _check_property_group(self, root: ET.Element, error_reporter: ErrorReporter) -> None:
+        required_properties = [
+            "NuGetAudit",
+            "WarningsAsErrors",
+            "_SkipUpgradeNetAnalyzersNuGetWarning",
+        ]
+
+        property_groups = root.findall("PropertyGroup")
+        if not property_groups:
+            error_reporter.error(f"Отсутствует узел PropertyGroup в {self.FILE_NAME}")
+            return
+
+        for prop_group in property_groups:
+            for prop in required_properties:
+                if prop_group.find(prop) is None:
+                    error_reporter.error(
+                        f"Отсутствует свойство {prop} в PropertyGroup файла {self.FILE_NAME}"
+                    )
+
+    def _check_package_references(self, root: ET.Element, error_reporter: ErrorReporter) -> None:
+        item_groups = root.findall("ItemGroup")
+        found_packages = []
+
+        for item_group in item_groups:
+            package_refs = item_group.findall("PackageReference")
+            for package_ref in package_refs:
+                include = package_ref.get("Include")
+                if include:
+                    found_packages.append(include)
+
+        for package in self.REQUIRED_PACKAGES:
+            if package not in found_packages:
+                error_reporter.error(
+                    f"Отсутствует пакет {package} в PackageReference файла {self.FILE_NAME}"
+                )
+
+
+class DocsDirectoryChecker:
+    """Класс для проверки структуры каталога docs/"""
+
+    def check(self, git_files: List[str], error_reporter: ErrorReporter) -> None:
+        self._check_allowed_subdirectories(git_files, error_reporter)
+        self._check_markdown_only_dirs(git_files, error_reporter)
+
+    def _check_allowed_subdirectories(
+        self, git_files: List[str], error_reporter: ErrorReporter
+    ) -> None:
+        allowed_subdirs = {"specification", "theory", "competitors", "examples"}
+
+        docs_dirs = set()
+        for file_path in git_files:
+            if file_path.startswith("docs/"):
+                parts = file_path.split("/")
+                if len(parts) > 2:
+                    docs_dirs.add(parts[1])
+
+        for subdir in docs_dirs:
+            if subdir not in allowed_subdirs:
+                error_reporter.error(f"Недопустимый подкаталог docs/{subdir}")
+
+    def _check_markdown_only_dirs(
+        self, git_files: List[str], error_reporter: ErrorReporter
+    ) -> None:
+        markdown_only_dirs = ["docs/specification"]
+        excluded_dirs = ["docs/specification/examples"]
+
+        for file_path in git_files:
+            for dir_path in markdown_only_dirs:
+                if file_path.startswith(dir_path + "/") and not any(
+                    file_path.startswith(e + "/") for e in excluded_dirs
+                ):
+                    if not file_path.endswith(".md"):
+                        error_reporter.error(
+                            f"Недопустимый файл {file_path} в каталоге {dir_path}, разрешены только .md файлы"
+                        )
+
+
+class MarkdownLinkChecker:
+    """Класс для проверки относительных ссылок и якорей в документации Markdown
+
+    Все отслеживаемые файлы .md разбираются один раз (модуль markdown, пул
+    процессов, общее хранилище результатов) в общий индекс якорей заголовков. Цель
+    каждой ссылки ищется в множестве файлов и каталогов git, якорь — в индексе.
+    Файлы больше MAX_FILE_SIZE байт не разбираются (file_access).
+    """
+
+    MAX_FILE_SIZE = 1024 * 1024
+
+    def __init__(self, store: Optional[ResultStore] = None) -> None:
+        self.cache = markdown.MarkdownCache(store)
+
+    def check(self, repo: Repo, error_reporter: ErrorReporter) -> None:
+        markdown_files: List[str] = []
+        contents: List[bytes] = []
+        for file_path in repo.git_files:
+            if not file_path.endswith(".md"):
+                continue
+            try:
+                contents.append(file_access.read_bytes(repo.path / file_path, self.MAX_FILE_SIZE))
+            except (OSError, file_access.FileAccessError) as e:
+                error_reporter.error(f"Ошибка при чтении файла {file_path}: {str(e)}")
+                continue
+            markdown_files.append(file_path)
+
+        summaries = self.cache.summaries(contents)
+        anchors = {file_path: set(summary.anchors) for file_path, summary in zip(markdown_files, summaries)}
+        tracked_paths = set(repo.git_files)
+        for file_path in repo.git_files:
+            directory = posixpath.dirname(file_path)
+            while directory and directory not in tracked_paths:
+                tracked_paths.add(directory)
+                directory = posixpath.dirname(directory)
+
+        for file_path, summary in zip(markdown_files, summaries):
+            for line, target in summary.links:
+                message = self._check_link(file_path, target, tracked_paths, anchors)
+                if message:
+                    error_reporter.error(f"Ссылка {file_path}:{line}: {message}")
+
+    def _check_link(
+        self, file_path: str, target: str, tracked_paths: Set[str], anchors: Dict[str, Set[str]]
+    ) -> Optional[str]:
+        """Текст ошибки для ссылки или None, если цель существует"""
+        path, _, fragment = target.partition("#")
+        path = urllib.parse.unquote(path.split("?", 1)[0])
+        if not path:
+            resolved = file_path
+        elif path.startswith("/"):
+            resolved = posixpath.normpath(path.lstrip("/"))
+        else:
+            resolved = posixpath.normpath(posixpath.join(posixpath.dirname(file_path), path))
+
+        if resolved == ".." or resolved.startswith("../"):
+            return f"{target} указывает за пределы репозитория"
+        if resolved != "." and resolved not in tracked_paths:
+            return f"{target}: файл {resolved} не найден в репозитории"
+        # Якоря заголовков записаны строчными буквами, HTML-якоря сравниваются точно
+        fragment = urllib.parse.unquote(fragment)
+        if fragment and resolved in anchors and not {fragment, fragment.lower()} & anchors[resolved]:
+            return f"{target}: в {resolved} нет заголовка с якорем #{fragment}"
+        return None
+
+
+class CsProjectChecker:
+    """Класс для проверки sln и csproj файлов"""
+
+    CHECKER = "solution-entries"
+    VERSION = "2"
+    MAX_SOLUTION_SIZE = SolutionParser.MAX_SOLUTION_SIZE
+
+    def __init__(self, store: Optional[ResultStore] = None) -> None:
+        # Граф ProjectReference: нормализованный путь .csproj -> пути проектов-зависимостей
+        self.reference_graph: Dict[str, List[str]] = {}
+        self.store = store if store is not None else ResultStore()
+
+    def check(
+        self, project_path: pathlib.Path, git_files: List[str], error_reporter: ErrorReporter
+    ) -> None:
+        csproj_index = self._build_csproj_index(git_files)
+        self._check_csproj_exists(csproj_index, error_reporter)
+        sln_files = self._check_solution_file(project_path, error_reporter)
+        if len(sln_files) == 1:
+            self._check_solution_consistency(sln_files[0], csproj_index, error_reporter)
+        self._check_reference_cycles(project_path, csproj_index, error_reporter)
+        self._check_project_locations(git_files, error_reporter)
+        self._check_cs_files_location(git_files, error_reporter)
+
+    def _build_csproj_index(self, git_files: List[str]) -> Dict[str, str]:
+        """Построить индекс отслеживаемых .csproj: нормализованный путь -> путь в git."""
+        return {
+            posixpath.normpath(file_path): file_path
+            for file_path in git_files
+            if file_path.endswith(".csproj")
+        }
+
+    def _check_csproj_exists(
+        self, csproj_index: Dict[str, str], error_reporter: ErrorReporter
+    ) -> None:
+        if not csproj_index:
+            error_reporter.error("В проекте не найдено ни одного файла .csproj")
+
+    def _check_solution_file(
+        self, project_path: pathlib.Path, error_reporter: ErrorReporter
+    ) -> List[pathlib.Path]:
+        sln_files = sorted([*project_path.glob("*.sln"), *project_path.glob("*.slnx")])
+
+        if not sln_files:
+            error_reporter.error("В корне проекта отсутствует файл решения (.sln или .slnx)")
+        elif len(sln_files) > 1:
+            error_reporter.error("В корне проекта найдено несколько файлов решения (.sln или .slnx)")
+        return sln_files
+
+    def _parse_solution_entries(self, sln_path: pathlib.Path) -> List[Tuple[str, str, str, str]]:
+        """Извлечь записи проектов из .sln или .slnx (SolutionParser.project_entries).
+
+        Файл читается не больше MAX_SOLUTION_SIZE байт; записи хранятся в общем
+        хранилище результатов по SHA содержимого файла.
+
+        Returns:
+            Список кортежей (GUID типа, имя, нормализованный путь, GUID проекта)
+        """
+        data = file_access.read_bytes(sln_path, self.MAX_SOLUTION_SIZE)
+        entries = self.store.fetch(
+            self.CHECKER, f"{self.VERSION}:{sln_path.suffix.lower()}", data,
+            lambda content: SolutionParser.project_entries(sln_path, content),
+        )
+        return [tuple(entry) for entry in entries]
+
+    def _check_solution_consistency(
+        self,
+        sln_path: pathlib.Path,
+        csproj_index: Dict[str, str],
+        error_reporter: ErrorReporter,
+    ) -> None:
+        """Сверить проекты из .sln с отслеживаемыми .csproj в обе стороны.
+
+        Каждая проверка — один проход с поиском по словарю: отсутствующие файлы
+        проектов, проекты вне решения, повторяющиеся GUID и несовпадение имени
+        проекта с именем файла.
+        """
+        try:
+            entries = self._parse_solution_entries(sln_path)
+        except (OSError, UnicodeDecodeError, file_access.FileAccessError) as e:
+            error_reporter.error(f"Ошибка при чтении файла решения {sln_path.name}: {str(e)}")
+            return
+
+        sln_name = sln_path.name
+        guid_index: Dict[str, str] = {}
+        sln_projects: Set[str] = set()
+
+        for _, name, relative_path, project_guid in entries:
+            # В .slnx GUID проектов не записываются
+            if project_guid and project_guid in guid_index:
+                error_reporter.error(
+                    f"В {sln_name} проекты {guid_index[project_guid]} и {name} имеют одинаковый GUID {{{project_guid}}}"
+                )
+            elif project_guid:
+                guid_index[project_guid] = name
+
+            if not relative_path.lower().endswith(".csproj"):
+                continue
+
+            sln_projects.add(relative_path)
+            if relative_path not in csproj_index:
+                error_reporter.error(
+                    f"Проект {name} из {sln_name} ссылается на отсутствующий файл {relative_path}"
+                )
+
+            file_stem = posixpath.splitext(posixpath.basename(relative_path))[0]
+            if name != file_stem:
+                error_reporter.error(
+                    f"Имя проекта {name} в {sln_name} не совпадает с именем файла {relative_path}"
+                )
+
+        for normalized_path, file_path in sorted(csproj_index.items()):
+            if normalized_path not in sln_projects:
+                error_reporter.error(f"Файл проекта {file_path} не добавлен в решение {sln_name}")
+
+    def _check_reference_cycles(
+        self,
+        project_path: pathlib.Path,
+        csproj_index: Dict[str, str],
+        error_reporter: ErrorReporter,
+    ) -> None:
+        """Проверить отсутствие циклов в графе ProjectReference между отслеживаемыми проектами."""
+        self.reference_graph = self._build_reference_graph(project_path, csproj_index)
+        for cycle in ProjectGraph(self.reference_graph).cycles():
+            error_reporter.error(
+                f"Циклическая зависимость между проектами: {' -> '.join(cycle)}"
+            )
+
+    def _build_reference_graph(
+        self, project_path: pathlib.Path, csproj_index: Dict[str, str]
+    ) -> Dict[str, List[str]]:
+        """Построить граф ProjectReference между отслеживаемыми проектами."""
+        dependencies: Dict[str, List[str]] = {}
+
+        for normalized_path, file_path in csproj_index.items():
+            try:
+                # Разбор кэшируется CsprojParser и переиспользуется анализом графа решения
+                includes = CsprojParser.parse(project_path / file_path).references
+            except (OSError, UnicodeDecodeError, file_access.FileAccessError):
+                # Нечитаемые файлы проектов не участвуют в построении графа
+                continue
+
+            project_dir = posixpath.dirname(normalized_path)
+            references = []
+            for include in includes:
+                reference = posixpath.normpath(
+                    posixpath.join(project_dir, include.replace("\\", "/"))
+                )
+                if reference in csproj_index:
+                    references.append(reference)
+            dependencies[normalized_path] = references
+        return dependencies
+
+    def _check_project_locations(self, git_files: List[str], error_reporter: ErrorReporter) -> None:
+        for file_path in git_files:
+            if file_path.endswith(".csproj"):
+                if not (file_path.startswith("src/") or file_path.startswith("tests/")):
+                    error_reporter.error(
+                        f"Файл проекта {file_path} должен находиться в каталогах src/ или tests/"
+                    )
+
+    def _check_cs_files_location(self, git_files: List[str], error_reporter: ErrorReporter) -> None:
+        for file_path in git_files:
+            if file_path.endswith(".cs"):
+                if not (
+                    file_path.startswith("src/")
+                    or file_path.startswith("tests/")
+                    or file_path.startswith("docs/examples/")
+                    or file_path.startswith("docs/competitors/")
+                ):
+                    error_reporter.error(
+                        f"C# файл {file_path} должен находиться в каталогах src/, tests/, docs/examples/ или docs/competitors/"
+                    )
+
+
+class NamespaceChecker:
+    """Класс для проверки пространств имён и имён файлов C#
+
+    Пространство имён файла должно совпадать с путём его каталога относительно
+    проекта (корень — RootNamespace из .csproj или имя проекта), имя файла — с
+    первым типом верхнего уровня. Читается только начало файлов
+    (source_scan.scan_declarations) в пуле процессов. Сгенерированные файлы
+    (generated.find_generated_files, комментарий <auto-generated>) пропускаются.
+    Несовпадения выводятся как предупреждения, как у анализаторов IDE0130 и SA1649.
+    """
+
+    def check(self, repo: Repo, error_reporter: ErrorReporter) -> None:
+        generated_files = generated.find_generated_files(repo.path, repo.git_files).sources
+        projects = {
+            posixpath.dirname(file_path): file_path for file_path in repo.git_files if file_path.endswith(".csproj")
+        }
+        source_files = [
+            file_path
+            for file_path in repo.git_files
+            if file_path.endswith(".cs") and file_path not in generated_files
+        ]
+        declarations = map_batches(scan_declarations, [str(repo.path / file_path) for file_path in source_files])
+
+        root_namespaces: Dict[str, str] = {}
+        for file_path, declaration in zip(source_files, declarations):
+            if declaration.generated:
+                continue
+            directory = posixpath.dirname(file_path)
+            project_dir = directory
+            while project_dir not in projects and project_dir:
+                project_dir = posixpath.dirname(project_dir)
+            if project_dir not in projects:
+                continue
+            if project_dir not in root_namespaces:
+                root_namespaces[project_dir] = self._root_namespace(repo, projects[project_dir])
+
+            expected = root_namespaces[project_dir]
+            if directory != project_dir:
+                expected += "." + posixpath.relpath(directory, project_dir).replace("/", ".")
+            if declaration.namespace is not None and declaration.namespace != expected:
+                logging.warning(
+                    f"Файл {file_path}: пространство имён {declaration.namespace} не соответствует каталогу (ожидалось {expected})"
+                )
+
+            file_type = re.split(r"[.{`]", posixpath.basename(file_path))[0]
+            if declaration.type_name is not None and declaration.type_name != file_type:
+                logging.warning(f"Файл {file_path}: имя файла не совпадает с именем типа {declaration.type_name}")
+
+    def _root_namespace(self, repo: Repo, csproj_path: str) -> str:
+        try:
+            root_namespace = repo.csproj(csproj_path).properties.get("RootNamespace")
+        except (OSError, UnicodeDecodeError, file_access.FileAccessError):
+            root_namespace = None
+        return root_namespace or pathlib.PurePosixPath(csproj_path).stem
+
+
+class LayeringChecker:
+    """Класс для проверки правил зависимостей между проектами
+
+    Правила читаются из необязательного файла в корне проекта, по одному в строке:
+
+        Lexer !-> Execution Interpreter   # Lexer не должен зависеть от них даже транзитивно
+        tests/* -> *                      # тестам разрешено зависеть от чего угодно
+
+    Шаблоны (glob) сопоставляются с именем проекта и с путём его каталога.
+    Правило `->` разрешает зависимости и имеет приоритет над запрещающими `!->`.
+    Достижимость всех проектов считается один раз в виде битовых строк, поэтому
+    проверка правила — несколько операций над целыми числами.
+    """
+
+    FILE_NAME = "dependency-rules.txt"
+    MAX_FILE_SIZE = 256 * 1024
+    RULE_PATTERN: Pattern[str] = re.compile(r"^(\S+)\s+(!?->)\s+(\S.*)$")
+
+    def check(
+        self,
+        project_path: pathlib.Path,
+        reference_graph: Dict[str, List[str]],
+        error_reporter: ErrorReporter,
+    ) -> None:
+        rules_path = project_path / self.FILE_NAME
+        if not rules_path.exists():
+            return
+
+        try:
+            lines = file_access.read_text(rules_path, self.MAX_FILE_SIZE, "utf-8-sig").splitlines()
+        except (OSError, UnicodeDecodeError, file_access.FileAccessError) as e:
+            error_reporter.error(f"Ошибка при чтении файла {self.FILE_NAME}: {str(e)}")
+            return
+
+        rules = self._parse_rules(lines, error_reporter)
+        if rules and reference_graph:
+            self._check_rules(rules, reference_graph, error_reporter)
+
+    def _parse_rules(
+        self, lines: List[str], error_reporter: ErrorReporter
+    ) -> List[Tuple[int, bool, str, List[str]]]:
+        """Разобрать правила.
+
+        Returns:
+            Список кортежей (номер строки, разрешающее ли правило, шаблон источника, шаблоны целей)
+        """
+        rules = []
+        for line_number, line in enumerate(lines, 1):
+            text = line.split("#", 1)[0].strip()
+            if not text:
+                continue
+            match = self.RULE_PATTERN.match(text)
+            if not match:
+                error_reporter.error(
+                    f"Некорректное правило в {self.FILE_NAME}:{line_number}: {line.strip()}"
+                )
+                continue
+            source, arrow, targets = match.groups()
+            rules.append((line_number, arrow == "->", source, targets.split()))
+        return rules
+
+    def _check_rules(
+        self,
+        rules: List[Tuple[int, bool, str, List[str]]],
+        reference_graph: Dict[str, List[str]],
+        error_reporter: ErrorReporter,
+    ) -> None:
+        graph = ProjectGraph(reference_graph)
+        reach = graph.reachability()
+        display_names = [posixpath.splitext(posixpath.basename(node))[0] for node in graph.names]
+
+        # Ключи сопоставления узла: имя проекта и каталог проекта
+        keys: Dict[str, int] = {}
+        for node, path in enumerate(graph.names):
+            for key in (display_names[node], posixpath.dirname(path)):
+                keys[key] = keys.get(key, 0) | (1 << node)
+        pattern_cache: Dict[str, int] = {}
+
+        def match_bits(pattern: str) -> int:
+            if pattern not in pattern_cache:
+                if not any(char in pattern for char in "*?["):
+                    pattern_cache[pattern] = keys.get(pattern, 0)
+                else:
+                    regex = re.compile(fnmatch.translate(pattern))
+                    bits = 0
+                    for key, key_bits in keys.items():
+                        if regex.match(key):
+                            bits |= key_bits
+                    pattern_cache[pattern] = bits
+                if not pattern_cache[pattern]:
+                    logging.warning(f"Шаблон {pattern} в {self.FILE_NAME} не соответствует ни одному проекту")
+            return pattern_cache[pattern]
+
+        # Разрешённые цели для каждого проекта
+        allowed: Dict[int, int] = {}
+        for _, is_allow, source, targets in rules:
+            if not is_allow:
+                continue
+            target_bits = 0
+            for target in targets:
+                target_bits |= match_bits(target)
+            for name in graph.names_from_bits(match_bits(source)):
+                allowed[graph.ids[name]] = allowed.get(graph.ids[name], 0) | target_bits
+
+        for line_number, is_allow, source, targets in rules:
+            if is_allow:
+                continue
+            target_bits = 0
+            for target in targets:
+                target_bits |= match_bits(target)
+            for name in graph.names_from_bits(match_bits(source)):
+                node = graph.ids[name]
+                violations = reach[node] & target_bits & ~allowed.get(node, 0)
+                for target in graph.names_from_bits(violations):
+                    path = graph.shortest_path(name, target)
+                    path_names = " -> ".join(display_names[graph.ids[step]] for step in path)
+                    error_reporter.error(
+                        f"Нарушено правило {self.FILE_NAME}:{line_number} "
+                        f"({source} !-> {' '.join(targets)}): {path_names}"
+                    )
+
+
+class TestPairingChecker:
+    """Класс для проверки соответствия проектов src/ и тестовых проектов tests/
+
+    Соглашения об именах читаются из необязательного файла в корне проекта:
+
+        tests/{name}.UnitTests            # каталог тестов проекта src/<name>
+        tests/{name}.Specs
+        untested: Ast Runtime             # проекты без тестов: предупреждение вместо ошибки
+
+    Проект из src/ считается покрытым, если существует тестовый проект в каталоге
+    по одному из шаблонов и он напрямую ссылается на этот проект. Тестовый проект,
+    который не ссылается ни на один проект из src/, считается ошибкой.
+    Каталоги проектов индексируются один раз, поэтому каждый шаблон проверяется
+    поиском по словарю.
+    """
+
+    FILE_NAME = "test-conventions.txt"
+    UNTESTED_PREFIX = "untested:"
+    MAX_FILE_SIZE = 256 * 1024
+
+    def check(
+        self,
+        project_path: pathlib.Path,
+        git_files: List[str],
+        reference_graph: Dict[str, List[str]],
+        error_reporter: ErrorReporter,
+    ) -> None:
+        conventions_path = project_path / self.FILE_NAME
+        if not conventions_path.exists():
+            return
+
+        try:
+            lines = file_access.read_text(conventions_path, self.MAX_FILE_SIZE, "utf-8-sig").splitlines()
+        except (OSError, UnicodeDecodeError, file_access.FileAccessError) as e:
+            error_reporter.error(f"Ошибка при чтении файла {self.FILE_NAME}: {str(e)}")
+            return
+
+        templates, untested = self._parse_conventions(lines, error_reporter)
+        source_projects, test_projects = self._build_project_index(git_files)
+        self._check_test_references(source_projects, test_projects, reference_graph, error_reporter)
+        self._check_source_coverage(
+            templates, untested, source_projects, test_projects, reference_graph, error_reporter
+        )
+
+    def _parse_conventions(
+        self, lines: List[str], error_reporter: ErrorReporter
+    ) -> Tuple[List[str], Set[str]]:
+        """Разобрать соглашения.
+
+        Returns:
+            Кортеж (шаблоны каталогов тестовых проектов, проекты без тестов)
+        """
+        templates: List[str] = []
+        untested: Set[str] = set()
+        for line_number, line in enumerate(lines, 1):
+            text = line.split("#", 1)[0].strip()
+            if not text:
+                continue
+            if text.startswith(self.UNTESTED_PREFIX):
+                untested.update(text[len(self.UNTESTED_PREFIX):].split())
+            elif "{name}" in text and len(text.split()) == 1:
+                templates.append(posixpath.normpath(text))
+            else:
+                error_reporter.error(
+                    f"Некорректная строка в {self.FILE_NAME}:{line_number}: {line.strip()}"
+                )
+        return templates, untested
+
+    def _build_project_index(self, git_files: List[str]) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """Построить индекс проектов src/ и tests/.
+
+        Returns:
+            Кортеж словарей (имя проекта src/ -> путь .csproj, каталог тестового проекта -> путь .csproj)
+        """
+        source_projects: Dict[str, str] = {}
+        test_projects: Dict[str, str] = {}
+        for file_path in git_files:
+            if not file_path.endswith(".csproj"):
+                continue
+            normalized_path = posixpath.normpath(file_path)
+            if normalized_path.startswith("src/"):
+                name = posixpath.splitext(posixpath.basename(normalized_path))[0]
+                source_projects[name] = normalized_path
+            elif normalized_path.startswith("tests/"):
+                test_projects[posixpath.dirname(normalized_path)] = normalized_path
+        return source_projects, test_projects
+
+    def _check_test_references(
+        self,
+        source_projects: Dict[str, str],
+        test_projects: Dict[str, str],
+        reference_graph: Dict[str, List[str]],
+        error_reporter: ErrorReporter,
+    ) -> None:
+        source_paths = set(source_projects.values())
+        for test_dir, test_path in sorted(test_projects.items()):
+            if not any(reference in source_paths for reference in reference_graph.get(test_path, [])):
+                error_reporter.error(
+                    f"Тестовый проект {test_dir} не ссылается ни на один проект из src/"
+                )
+
+    def _check_source_coverage(
+        self,
+        templates: List[str],
+        untested: Set[str],
+        source_projects: Dict[str, str],
+        test_projects: Dict[str, str],
+        reference_graph: Dict[str, List[str]],
+        error_reporter: ErrorReporter,
+    ) -> None:
+        for name in sorted(untested - source_projects.keys()):
+            logging.warning(f"Проект {name} из {self.FILE_NAME} не найден в src/")
+
+        for name, source_path in sorted(source_projects.items()):
+            expected = [template.replace("{name}", name) for template in templates]
+            existing = [test_dir for test_dir in expected if test_dir in test_projects]
+            covering = [
+                test_dir for test_dir in existing
+                if source_path in reference_graph.get(test_projects[test_dir], [])
+            ]
+            for test_dir in existing:
+                if test_dir not in covering:
+                    error_reporter.error(
+                        f"Тестовый проект {test_dir} не ссылается на проект {source_path}"
+                    )
+            if covering or existing:
+                continue
+
+            expected_dirs = ", ".join(expected)
+            if name in untested:
+                logging.warning(f"Проект src/{name} не покрыт тестами (ожидался один из: {expected_dirs})")
+            else:
+                error_reporter.error(
+                    f"Для проекта src/{name} нет тестового проекта (ожидался один из: {expected_dirs})"
+                )
+
+
+class GeneratedFilesChecker:
+    """Класс для проверки актуальности сгенерированных файлов ANTLR и Reqnroll
+
+    Исходники (`*.g4`, `*.feature`) сопоставляются со сгенерированными файлами
+    по индексу git, а SHA их объектов сверяются с манифестом generated-files.txt.
+    Изменённый после генерации исходник, сгенерированный файл без исходника или
+    изменённый вручную сгенерированный файл обнаруживаются без запуска Java и dotnet.
+    Проверка выполняется, если манифест есть в корне проекта.
+    """
+
+    MAX_FILE_SIZE = 256 * 1024
+
+    def check(self, repo: Repo, error_reporter: ErrorReporter) -> None:
+        manifest_path = repo.path / generated.MANIFEST_NAME
+        if not manifest_path.exists():
+            return
+
+        try:
+            lines = repo.read_text(generated.MANIFEST_NAME, "utf-8-sig", self.MAX_FILE_SIZE).splitlines()
+            blob_shas = repo.blob_shas
+        except (OSError, UnicodeDecodeError, file_access.FileAccessError, RuntimeError) as e:
+            error_reporter.error(f"Ошибка при чтении файла {generated.MANIFEST_NAME}: {str(e)}")
+            return
+
+        entries, invalid = generated.parse_manifest(lines)
+        for line_number in invalid:
+            error_reporter.error(f"Некорректная строка в {generated.MANIFEST_NAME}:{line_number}")
+
+        files = generated.find_generated_files(repo.path, repo.git_files)
+        errors_before = error_reporter.error_count
+        self._check_pairs(files, error_reporter)
+        self._check_hashes(files, entries, blob_shas, error_reporter)
+        if error_reporter.error_count > errors_before:
+            logging.info(
+                f"После генерации обновите {generated.MANIFEST_NAME}: python dushnila.py --update-generated"
+            )
+
+    def _check_pairs(self, files: generated.GeneratedFiles, error_reporter: ErrorReporter) -> None:
+        for source in files.missing:
+            error_reporter.error(f"Для {source} нет сгенерированных файлов")
+        for file_path, source in files.orphaned:
+            error_reporter.error(f"Сгенерированный файл {file_path} остался без исходника {source}")
+
+    def _check_hashes(
+        self,
+        files: generated.GeneratedFiles,
+        entries: Dict[str, Tuple[str, str, str]],
+        blob_shas: Dict[str, str],
+        error_reporter: ErrorReporter,
+    ) -> None:
+        orphaned = {file_path for file_path, _ in files.orphaned}
+        for file_path, source in sorted(files.sources.items()):
+            if file_path in orphaned:
+                continue
+            entry = entries.get(file_path)
+            if entry is None or entry[0] != source:
+                error_reporter.error(
+                    f"Сгенерированный файл {file_path} не записан в {generated.MANIFEST_NAME}"
+                )
+            elif blob_shas.get(source) != entry[1]:
+                error_reporter.error(
+                    f"Сгенерированный файл {file_path} устарел: {source} изменён после генерации"
+                )
+            elif blob_shas.get(file_path) != entry[2]:
+                error_reporter.error(
+                    f"Сгенерированный файл {file_path} изменён вручную после генерации из {source}"
+                )
+
+        for file_path in sorted(entries.keys() - files.sources.keys()):
+            error_reporter.error(
+                f"Запись {generated.MANIFEST_NAME} для отсутствующего сгенерированного файла {file_path}"
+            )
+
+    def update_manifest(self, repo: Repo) -> int:
+        """Записать манифест по текущему индексу git.
+
+        Returns:
+            Число записанных сгенерированных файлов
+        """
+        files = generated.find_generated_files(repo.path, repo.git_files)
+        content = generated.format_manifest(files, repo.blob_shas)
+        with open(repo.path / generated.MANIFEST_NAME, "w", encoding="utf-8", newline="\n") as f:
+            f.write(content)
+        return sum(1 for line in content.splitlines() if not line.startswith("#"))
+
+
+class GrammarChecker:
+    """Класс для статической проверки грамматик ANTLR (*.g4)
+
+    Грамматики разбираются модулем grammar без запуска ANTLR: неопределённые
+    и неиспользуемые правила и токены, неподдерживаемая левая рекурсия,
+    перекрытые токены-литералы. Сводки грамматик хранятся в общем хранилище результатов.
+    Грамматики больше MAX_FILE_SIZE байт не разбираются (file_access).
+    """
+
+    MAX_FILE_SIZE = 1024 * 1024
+
+    def __init__(self, store: Optional[ResultStore] = None) -> None:
+        self.cache = grammar.GrammarCache(store)
+
+    def check(self, repo: Repo, error_reporter: ErrorReporter) -> None:
+        summaries: Dict[str, grammar.GrammarSummary] = {}
+        for file_path in repo.git_files:
+            if not file_path.endswith(".g4"):
+                continue
+            try:
+                data = file_access.read_bytes(repo.path / file_path, self.MAX_FILE_SIZE)
+            except (OSError, file_access.FileAccessError) as e:
+                error_reporter.error(f"Ошибка при чтении грамматики {file_path}: {str(e)}")
+                continue
+            summaries[file_path] = self.cache.summary(data)
+
+        vocabulary_diagnostics = grammar.check_vocabularies(summaries)
+        for file_path, summary in summaries.items():
+            diagnostics = summary.diagnostics + vocabulary_diagnostics.get(file_path, [])
+            for severity, line, message in sorted(diagnostics, key=lambda diagnostic: diagnostic[1]):
+                location = f"{file_path}:{line}" if line else file_path
+                if severity == "error":
+                    error_reporter.error(f"Грамматика {location}: {message}")
+                else:
+                    logging.warning(f"Грамматика {location}: {message}")
+
+
+class FeatureChecker:
+    """Класс для проверки сценариев Gherkin (*.feature) и привязок шагов
+
+    Файлы .feature разбираются модулем gherkin в пуле процессов. Шаги сверяются
+    с привязками [Given]/[When]/[Then] из файлов C# того же проекта.
+    Имена сценариев должны быть уникальны во всех файлах. Файлы привязок больше
+    MAX_FILE_SIZE байт не читаются (file_access).
+    """
+
+    MAX_FILE_SIZE = 1024 * 1024
+
+    def check(self, repo: Repo, error_reporter: ErrorReporter) -> None:
+        feature_files = [file_path for file_path in repo.git_files if file_path.endswith(".feature")]
+        if not feature_files:
+            return
+
+        documents = map_batches(
+            gherkin.parse_feature_file,
+            [str(repo.path / file_path) for file_path in feature_files],
+            gherkin.BATCH_SIZE,
+        )
+        scenario_names: Dict[str, str] = {}
+        for file_path, document in zip(feature_files, documents):
+            for line, message in document.errors:
+                error_reporter.error(f"Сценарий {file_path}:{line}: {message}")
+            for scenario in document.scenarios:
+                location = f"{file_path}:{scenario.line}"
+                if scenario.name in scenario_names:
+                    error_reporter.error(
+                        f"Сценарий {location}: имя {scenario.name} уже используется в {scenario_names[scenario.name]}"
+                    )
+                else:
+                    scenario_names[scenario.name] = location
+
+        self._check_steps(repo, feature_files, documents, error_reporter)
+
+    def _project_dir(self, file_path: str, project_dirs: List[str]) -> str:
+        """Каталог ближайшего проекта, содержащего файл"""
+        for directory in project_dirs:
+            if file_path.startswith(directory + "/"):
+                return directory
+        return posixpath.dirname(file_path)
+
+    def _check_steps(
+        self,
+        repo: Repo,
+        feature_files: List[str],
+        documents: List[gherkin.FeatureDocument],
+        error_reporter: ErrorReporter,
+    ) -> None:
+        # Более глубокие каталоги проектов проверяются раньше
+        project_dirs = sorted(
+            {posixpath.dirname(file_path) for file_path in repo.git_files if file_path.endswith(".csproj")},
+            key=len,
+            reverse=True,
+        )
+        features_by_project: Dict[str, List[Tuple[str, gherkin.FeatureDocument]]] = {}
+        for file_path, document in zip(feature_files, documents):
+            project = self._project_dir(file_path, project_dirs)
+            features_by_project.setdefault(project, []).append((file_path, document))
+
+        for project, features in sorted(features_by_project.items()):
+            bindings: List[gherkin.Binding] = []
+            for file_path in repo.git_files:
+                if file_path.startswith(project + "/") and file_path.endswith(".cs") \
+                        and not file_path.endswith(".feature.cs"):
+                    try:
+                        text = repo.read_text(file_path, "utf-8-sig", self.MAX_FILE_SIZE)
+                    except (OSError, UnicodeDecodeError, file_access.FileAccessError):
+                        continue
+                    bindings.extend(gherkin.parse_bindings(file_path, text))
+
+            matcher = gherkin.StepMatcher(bindings)
+            for binding, message in matcher.errors:
+                error_reporter.error(f"Привязка {binding.path}:{binding.line}: {message}")
+
+            used = set()
+            for file_path, document in features:
+                for scenario in document.scenarios:
+                    for step in scenario.steps:
+                        binding = matcher.match(step)
+                        if binding is None:
+                            error_reporter.error(
+                                f"Сценарий {file_path}:{step.line}: для шага \"{step.text}\" нет привязки {step.kind.capitalize()}"
+                            )
+                        else:
+                            used.add(id(binding))
+            for binding in bindings:
+                if id(binding) not in used:
+                    logging.warning(f"Привязка {binding.path}:{binding.line} \"{binding.pattern}\" не используется в сценариях")
+
+
+class LexiconChecker:
+    """Класс для проверки фрагментов кода Vaibik в документации и сценариях
+
+    Сканер строится один раз по правилам лексера (*Lexer.g4). Фрагменты берутся
+    из блоков кода Markdown, строк документации в сценариях и файлов *.вайбик.
+    Ключевые слова, которых нет в лексере, встроенных функциях (строковые
+    литералы в src/**/*.cs) и объявлениях фрагмента, считаются ошибкой.
+    """
+
+    SNIPPET_SUFFIXES = (".md", ".feature") + lexicon.SNIPPET_EXTENSIONS
+    MAX_FILE_SIZE = 1024 * 1024
+
+    def check(self, repo: Repo, error_reporter: ErrorReporter) -> None:
+        lexer_files = [file_path for file_path in repo.git_files if file_path.endswith("Lexer.g4")]
+        if len(lexer_files) != 1:
+            return
+        try:
+            text = grammar.decode_grammar(file_access.read_bytes(repo.path / lexer_files[0], self.MAX_FILE_SIZE))
+        except (OSError, file_access.FileAccessError) as e:
+            error_reporter.error(f"Ошибка при чтении грамматики {lexer_files[0]}: {str(e)}")
+            return
+        try:
+            tokens = grammar.lexer_tokens(text)
+        except ValueError as e:
+            error_reporter.error(f"Фрагменты Vaibik не проверены: ошибка разбора грамматики {lexer_files[0]}: {e}")
+            return
+        scanner = lexicon.VaibikScanner(tokens)
+        known = self._builtin_names(repo)
+
+        for file_path in repo.git_files:
+            if not file_path.endswith(self.SNIPPET_SUFFIXES):
+                continue
+            try:
+                lines = repo.read_text(file_path, "utf-8-sig", self.MAX_FILE_SIZE).splitlines()
+            except (OSError, UnicodeDecodeError, file_access.FileAccessError):
+                continue
+            for snippet in lexicon.extract_snippets(file_path, lines):
+                if not snippet.tagged and not scanner.looks_like_code(snippet.text):
+                    continue
+                result = scanner.scan(snippet.text, snippet.line)
+                for line, fragment in result.unknown:
+                    error_reporter.error(f"Фрагмент Vaibik {file_path}:{line}: неизвестная лексема «{fragment.strip()}»")
+                for lexeme in lexicon.unknown_keywords(scanner, result.lexemes, known):
+                    error_reporter.error(
+                        f"Фрагмент Vaibik {file_path}:{lexeme.line}: неизвестное ключевое слово {lexeme.text}"
+                    )
+
+    def _builtin_names(self, repo: Repo) -> Set[str]:
+        names: Set[str] = set()
+        for file_path in repo.git_files:
+            if file_path.startswith("src/") and file_path.endswith(".cs"):
+                try:
+                    names |= lexicon.csharp_name_literals(repo.read_text(file_path, "utf-8-sig", self.MAX_FILE_SIZE))
+                except (OSError, UnicodeDecodeError, file_access.FileAccessError):
+                    continue
+        return names
+
+
+class EditorConfigChecker:
+    """Класс для проверки файла .editorconfig
+
+    Файл разбирается модулем editorconfig в индексированную модель: ссылки правил
+    именования на группы символов и стили, идентификаторы диагностик (по каталогу
+    правил анализаторов из BuildPropsChecker.REQUIRED_PACKAGES), повторы и
+    переопределения ключей проверяются за один проход по модели.
+    """
+
+    CHECKER = "editorconfig"
+    VERSION = "3"
+    MAX_FILE_SIZE = 256 * 1024
+
+    def __init__(self, store: Optional[ResultStore] = None) -> None:
+        self.store = store if store is not None else ResultStore()
+
+    def check(self, project_path: pathlib.Path, error_reporter: ErrorReporter) -> None:
+        if not self._check_file_exists(project_path):
+            error_reporter.error("Отсутствует файл .editorconfig в корне проекта")
+            return
+
+        try:
+            data = file_access.read_bytes(project_path / ".editorconfig", self.MAX_FILE_SIZE)
+        except (OSError, file_access.FileAccessError) as e:
+            error_reporter.error(f"Ошибка при проверке файла .editorconfig: {str(e)}")
+            return
+        replay_findings(stored_findings(self.store, self.CHECKER, self.VERSION, data, self._check_content), error_reporter)
+
+    def _check_content(self, data: bytes, error_reporter: FindingCollector) -> None:
+        try:
+            text = file_access.decode_text(data, ".editorconfig", "utf-8-sig")
+            config = editorconfig.parse_editorconfig(text.splitlines())
+            content = config.values()
+            self._check_root_setting(content, error_reporter)
+            self._check_cs_indentation(content, error_reporter)
+            self._check_naming_rules(content, error_reporter)
+            self._check_references(config, error_reporter)
+        except Exception as e:
+            error_reporter.error(f"Ошибка при проверке файла .editorconfig: {str(e)}")
+
+    def _check_file_exists(self, project_path: pathlib.Path) -> bool:
+        return (project_path / ".editorconfig").exists()
+
+    def _check_references(self, config: editorconfig.EditorConfig, error_reporter: FindingCollector) -> None:
+        catalog = editorconfig.rule_catalog(BuildPropsChecker.REQUIRED_PACKAGES)
+        problems = config.problems + editorconfig.check_references(config, catalog)
+        for severity, line, message in sorted(problems, key=lambda problem: problem[1]):
+            if severity == "error":
+                error_reporter.error(f".editorconfig:{line}: {message}")
+            else:
+                error_reporter.warning(f".editorconfig:{line}: {message}")
+
+    def _check_root_setting(
+        self, content: Dict[str, Dict[str, str]], error_reporter: ErrorReporter
+    ) -> None:
+        if "root" not in content or content["root"].get("root") != "true":
+            error_reporter.error("Отсутствует настройка root = true в файле .editorconfig")
+
+    def _check_cs_indentation(
+        self, content: Dict[str, Dict[str, str]], error_reporter: ErrorReporter
+    ) -> None:
+        cs_settings = {}
+        for section in content:
+            if "*.cs" in section:
+                cs_settings.update(content[section])
+
+        if not cs_settings:
+            error_reporter.error("Отсутствует секция для *.cs файлов в .editorconfig")
+            return
+
+        if cs_settings.get("indent_size") != "4":
+            error_reporter.error("Неверная настройка indent_size для *.cs файлов, должно быть 4")
+        if cs_settings.get("tab_width") != "4":
+            error_reporter.error("Неверная настройка tab_width для *.cs файлов, должно быть 4")
+
+    def _check_naming_rules(
+        self, content: Dict[str, Dict[str, str]], error_reporter: ErrorReporter
+    ) -> None:
+        all_settings = {}
+        for section in content.values():
+            all_settings.update(section)
+
+        def check_prefix_exists(prefix: str) -> None:
+            if not any(key.startswith(prefix) for key in all_settings):
+                error_reporter.error(f"Нет ни одного правила {prefix}* в .editorconfig")
+
+        for prefix in [
+            "dotnet_naming_rule.",
+            "dotnet_naming_symbols.",
+            "dotnet_naming_style.",
+            "dotnet_diagnostic.",
+        ]:
+            check_prefix_exists(prefix)
+
+
+class IgnoreChecker:
+    """Класс для проверки отсутствия файлов под контролем версий"""
+
+    def check(self, git_files: List[str], error_reporter: ErrorReporter) -> None:
+        self._check_build_artifacts(git_files, error_reporter)
+        self._check_ide_files(git_files, error_reporter)
+
+    def _check_build_artifacts(self, git_files: List[str], error_reporter: ErrorReporter) -> None:
+        build_extensions = [".dll", ".exe", ".pdb", ".cache"]
+
+        for file_path in git_files:
+            for ext in build_extensions:
+                if file_path.endswith(ext):
+                    error_reporter.error(
+                        f"Файл продукта сборки {file_path} не должен быть под контролем версий"
+                    )
+
+    def _check_ide_files(self, git_files: List[str], error_reporter: ErrorReporter) -> None:
+        ide_patterns = [".vscode/", ".vs/", ".idea/", ".suo", ".user", ".DotSettings.user"]
+
+        for file_path in git_files:
+            for pattern in ide_patterns:
+                if pattern in file_path:
+                    error_reporter.error(
+                        f"Файл настроек IDE {file_path} не должен быть под контролем версий"
+                    )
+
+
+class ReadmeChecker:
+    """Класс для проверки файла README.md"""
+
+    MAX_FILE_SIZE = 1024 * 1024
+
+    def check(self, repo: Repo, error_reporter: ErrorReporter) -> None:
+        """Проверить наличие и содержимое файла README.md.
+
+        Args:
+            repo: Проверяемый репозиторий
+            error_reporter: Отчётчик ошибок
+        """
+        if "README.md" not in repo.git_files:
+            error_reporter.error("Отсутствует файл README.md в проекте (должен быть под контролем версий)")
+            return
+
+        try:
+            content = file_access.read_text(repo.path / "README.md", self.MAX_FILE_SIZE).strip()
+            if not content:
+                error_reporter.error("Файл README.md не содержит описания проекта")
+        except FileNotFoundError:
+            error_reporter.error("Файл README.md отсутствует в рабочем каталоге (хотя есть в git)")
+        except Exception as e:
+            error_reporter.error(f"Ошибка при чтении файла README.md: {str(e)}")
+
+
+class LicenseChecker:
+    """Класс для проверки файла LICENSE"""
+
+    # Регулярные выражения для распознавания названий OpenSource лицензий
+    LICENSE_PATTERNS = [
+        (r"mit license", "MIT License"),
+        (r"the mit license", "MIT License"),
+        (r"apache license, version 2\.0", "Apache License, Version 2.0"),
+        (r"apache license 2\.0", "Apache License 2.0"),
+        (r"gnu (general|lesser) public license v?[0-9](\.[0-9])?", "GNU General/Lesser Public License"),
+        (r"gnu (affero )?general public license v?[0-9](\.[0-9])?", "GNU Affero General Public License"),
+        (r"bsd [23]-clause license", "BSD 2-Clause/3-Clause License"),
+        (r"bsd license", "BSD License"),
+        (r"mozilla public license 2\.0", "Mozilla Public License 2.0"),
+        (r"eclipse public license 2\.0", "Eclipse Public License 2.0"),
+        (r"creative commons attribution 4\.0 international", "Creative Commons Attribution 4.0 International"),
+        (r"creative commons zero v?1\.0", "Creative Commons Zero v1.0"),
+        (r"unlicense", "The Unlicense"),
+        (r"isc license", "ISC License"),
+    ]
+
+    CHECKER = "license"
+    VERSION = "2"
+    MAX_FILE_SIZE = 64 * 1024
+
+    def __init__(self, store: Optional[ResultStore] = None) -> None:
+        self.store = store if store is not None else ResultStore()
+
+    def check(self, repo: Repo, error_reporter: ErrorReporter) -> None:
+        """Проверить наличие и корректность файла LICENSE.
+
+        Результат зависит от текущего года, поэтому год входит в версию проверки
+        в общем хранилище результатов.
+
+        Args:
+            repo: Проверяемый репозиторий
+            error_reporter: Отчётчик ошибок
+        """
+        if "LICENSE" not in repo.git_files:
+            error_reporter.error("Отсутствует файл LICENSE в проекте (должен быть под контролем версий)")
+            return
+
+        try:
+            data = file_access.read_bytes(repo.path / "LICENSE", self.MAX_FILE_SIZE)
+        except Exception as e:
+            error_reporter.error(f"Ошибка при чтении файла LICENSE: {str(e)}")
+            return
+        version = f"{self.VERSION}:{datetime.datetime.now().year}"
+        replay_findings(stored_findings(self.store, self.CHECKER, version, data, self._check_content), error_reporter)
+
+    def _check_content(self, data: bytes, error_reporter: ErrorReporter) -> None:
+        try:
+            lines = file_access.decode_text(data, "LICENSE").splitlines()
+        except (UnicodeDecodeError, file_access.FileAccessError) as e:
+            error_reporter.error(f"Ошибка при чтении файла LICENSE: {str(e)}")
+            return
+
+        # Проверка первой непустой строки на название лицензии
+        first_non_empty = None
+        for line in lines:
+            stripped = line.strip()
+            if stripped:
+                first_non_empty = stripped
+                break
+
+        if first_non_empty is None:
+            error_reporter.error("Файл LICENSE пуст")
+            return
+
+        if not self._matches_license_pattern(first_non_empty):
+            error_reporter.error(
+                "Файл LICENSE не содержит узнаваемого названия OpenSource лицензии в первой непустой строке"
+            )
+
+        # Проверка наличия строки Copyright (c) ...
+        copyright_found = False
+        copyright_line = None
+        for line in lines:
+            lower = line.lower()
+            if "copyright" in lower and ("(c)" in lower or "(c)" in lower.replace("(c)", "(c)") or "©" in lower):
+                copyright_line = line
+                copyright_found = True
+                break
+
+        if not copyright_found:
+            error_reporter.error("Файл LICENSE не содержит строки с Copyright (c) ...")
+            return
+
+        # Проверка года в строке Copyright (безусловная, с разбором через регулярное выражение, захватывающее всю строку)
+        # Паттерны для строки копирайта с захватом года
+        copyright_patterns = [
+            r"(?i)copyright\s*\([cC]\)\s*(\d{4})",
+            r"(?i)copyright\s*©\s*(\d{4})",
+            r"(?i)copyright\s*(\d{4})\s*\([cC]\)",
+            r"(?i)copyright\s*(\d{4})\s*©",
+            r"(?i)\([cC]\)\s*(\d{4})",
+            r"(?i)©\s*(\d{4})",
+            r"(?i)copyright\s*(\d{4})",
+            r"(?i)(\d{4})\s*\([cC]\)",
+        ]
+        year = None
+        for pattern in copyright_patterns:
+            match = re.search(pattern, copyright_line)
+            if match:
+                year = int(match.group(1))
+                break
+        if year is None:
+            error_reporter.error(f"В строке Copyright отсутствует четырёхзначный номер года: {copyright_line}")
+        else:
+            current_year = datetime.datetime.now().year
+            if year < 2025 or year > current_year:
+                error_reporter.error(
+                    f"Год в строке Copyright должен быть числом на отрезке [2025; {current_year}], но указан год {year}"
+                )
+
+    def _matches_license_pattern(self, text: str) -> bool:
+        """Проверить, соответствует ли текст одному из шаблонов лицензий."""
+        text_lower = text.lower()
+        for pattern, _ in self.LICENSE_PATTERNS:
+            if re.search(pattern, text_lower, re.IGNORECASE):
+                return True
+        return False
+
+
+def check_project_structure(
+    path: Union[str, pathlib.Path, Repo],
+    store: Optional[ResultStore] = None,
+    timeout: Optional[float] = file_access.CHECK_TIMEOUT,
+) -> Report:
+    """Проверить структуру проекта.
+
+    Args:
+        path: Путь к корню проекта или Repo (его кэши переиспользуются другими проверками)
+        store: Общее хранилище результатов проверок файлов (по умолчанию — в памяти)
+        timeout: Ограничение времени каждой проверки в секундах (None — без ограничения);
+            прерванная проверка записывается в отчёт как ошибка. Вне главного потока
+            время проверяется только между блоками чтения файлов (file_access.time_limit)
+
+    Исключение в проверке записывается в отчёт как её ошибка, остальные проверки выполняются.
+
+    Returns:
+        Отчёт со списком найденных ошибок
+    """
+    repo = path if isinstance(path, Repo) else Repo(path)
+    error_reporter = ErrorReporter()
+    try:
+        git_files = repo.git_files
+        logging.debug(f"Найдено файлов под контролем версий: {len(git_files)}")
+    except Exception as e:
+        error_reporter.error(f"Не удалось получить список файлов под контролем версий: {str(e)}")
+        return error_reporter.report()
+
+    project_path = repo.path
+
+    # Создаем экземпляры классов проверки
+    store = store if store is not None else ResultStore()
+    csproj_checker = CsProjectChecker(store)
+    layering_checker = LayeringChecker()
+    namespace_checker = NamespaceChecker()
+    test_pairing_checker = TestPairingChecker()
+    generated_checker = GeneratedFilesChecker()
+    grammar_checker = GrammarChecker(store)
+    feature_checker = FeatureChecker()
+    lexicon_checker = LexiconChecker()
+    build_props_checker = BuildPropsChecker(store)
+    editorconfig_checker = EditorConfigChecker(store)
+    docs_checker = DocsDirectoryChecker()
+    markdown_link_checker = MarkdownLinkChecker(store)
+    ignore_checker = IgnoreChecker()
+    readme_checker = ReadmeChecker()
+    license_checker = LicenseChecker(store)
+
+    # Выполняем проверки в указанном порядке, каждую с ограничением времени
+    checks: List[Tuple[str, Callable[[], None]]] = [
+        ("CsProjectChecker", lambda: csproj_checker.check(project_path, git_files, error_reporter)),
+        ("LayeringChecker", lambda: layering_checker.check(project_path, csproj_checker.reference_graph, error_reporter)),
+        ("NamespaceChecker", lambda: namespace_checker.check(repo, error_reporter)),
+        (
+            "TestPairingChecker",
+            lambda: test_pairing_checker.check(project_path, git_files, csproj_checker.reference_graph, error_reporter),
+        ),
+        ("GeneratedFilesChecker", lambda: generated_checker.check(repo, error_reporter)),
+        ("GrammarChecker", lambda: grammar_checker.check(repo, error_reporter)),
+        ("FeatureChecker", lambda: feature_checker.check(repo, error_reporter)),
+        ("LexiconChecker", lambda: lexicon_checker.check(repo, error_reporter)),
+        ("BuildPropsChecker", lambda: build_props_checker.check(project_path, error_reporter)),
+        ("EditorConfigChecker", lambda: editorconfig_checker.check(project_path, error_reporter)),
+        ("DocsDirectoryChecker", lambda: docs_checker.check(git_files, error_reporter)),
+        ("MarkdownLinkChecker", lambda: markdown_link_checker.check(repo, error_reporter)),
+        ("IgnoreChecker", lambda: ignore_checker.check(git_files, error_reporter)),
+        ("ReadmeChecker", lambda: readme_checker.check(repo, error_reporter)),
+        ("LicenseChecker", lambda: license_checker.check(repo, error_reporter)),
+    ]
+    for name, run in checks:
+        try:
+            with file_access.time_limit(timeout):
+                run()
+        except file_access.CheckTimeoutError as e:
+            error_reporter.error(f"Проверка {name} прервана: превышено ограничение времени {e.seconds:g} с")
+        except Exception as e:
+            # Ошибка одной проверки не останавливает остальные
+            logging.debug(f"Проверка {name} завершилась с ошибкой", exc_info=True)
+            error_reporter.error(f"Проверка {name} завершилась с ошибкой: {e!r}")
+
+    return error_reporter.report()
+
+
+def log_similar(matches: List[similarity.Match], top: int) -> None:
+    """Выводит top пар репозиториев с наибольшей оценкой копирования и их совпавшие файлы"""
+    if not matches:
+        logging.info("Похожих файлов в репозиториях не найдено")
+    for rank, match in enumerate(matches[:top], 1):
+        logging.info(
+            f"{rank}. {match.left} и {match.right}: похожих файлов {len(match.files)}, скопировано около {match.score:.0f} лексем"
+        )
+        for pair in match.files:
+            logging.info(f"   {pair.similarity:4.0%}  {pair.left}  ~  {pair.right}")
+
+
+def main() -> None:
+    """Точка входа скрипта dushnila.py"""
+    args = parse_arguments()
+    setup_logging(args.verbose)
+
+    if args.similarity:
+        log_similar(similarity.find_similar(args.similarity, args.template), args.top)
+        sys.exit(0)
+
+    project_path = pathlib.Path(args.path).resolve()
+    if not project_path.exists():
+        raise Exception(f"Path does not exist: {project_path}")
+
+    if args.update_generated:
+        count = GeneratedFilesChecker().update_manifest(Repo(project_path))
+        logging.info(f"Updated {generated.MANIFEST_NAME}: {count} generated files")
+        sys.exit(0)
+
+    with ResultStore(args.result_store) as store:
+        report = check_project_structure(project_path, store, args.timeout)
+        if args.result_store:
+            logging.info(
+                f"Результатов проверок из хранилища: {store.hits} из {store.lookups} ({store.dedup_ratio:.0%})"
+            )
+    report.log_summary()
+    sys.exit(0 if report.ok else 1)
@@ -0,0 +1,83 @@
+"""
+Тесты упрощённых представлений диаграммы (repotools.analysis.DiagramViews):
+кластеры, свёртка кластеров и окрестность проекта.
+
+ИСПОЛЬЗОВАНИЕ:
+  python -m pytest scripts/tests
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from repotools.analysis import DiagramViews  # noqa: E402
+from repotools.solution import Project, Solution  # noqa: E402
+
+ROOT = Path("/repo")
+
+
+def make_solution(*projects: tuple) -> Solution:
+    """Решение из проектов (имя, папка решения); .csproj лежит в каталоге с именем папки"""
+    solution = Solution(ROOT / "compiler.sln", ROOT)
+    for name, folder in projects:
+        relative_path = f"{folder}/{name}/{name}.csproj"
+        solution.projects[name] = Project(name, ROOT / relative_path, relative_path, folder=folder)
+        solution.folders.setdefault(folder, []).append(name)
+    return solution
+
+
+class CollapsedViewsTest(unittest.TestCase):
+    def test_single_cluster_without_dependencies_is_kept(self) -> None:
+        solution = make_solution(("Ast", "src"), ("Lexer", "src"), ("Parser", "src"))
+        dependencies = {"Ast": [], "Lexer": [], "Parser": ["Ast", "Lexer"]}
+        for mode in ("folder", "directory"):
+            with self.subTest(mode=mode):
+                document = DiagramViews.build(solution, dependencies, mode, collapse=True)
+                self.assertEqual(document.nodes, ["src"])
+                self.assertEqual(document.edges, [])
+
+    def test_cluster_without_edges_to_others_is_kept(self) -> None:
+        solution = make_solution(("Ast", "src"), ("Parser", "src"), ("Lexer.UnitTests", "tests"))
+        dependencies = {"Ast": [], "Parser": ["Ast"], "Lexer.UnitTests": []}
+        document = DiagramViews.build(solution, dependencies, "folder", collapse=True)
+        self.assertEqual(document.nodes, ["src", "tests"])
+        self.assertEqual(document.edges, [])
+
+    def test_collapsed_edges_are_reduced_and_counted(self) -> None:
+        solution = make_solution(
+            ("Ast", "src"), ("Lexer", "lexer"), ("Parser", "parser"), ("Parser.UnitTests", "tests"),
+            ("Lexer.UnitTests", "tests"),
+        )
+        dependencies = {
+            "Ast": [],
+            "Lexer": ["Ast"],
+            "Parser": ["Lexer", "Ast"],
+            "Parser.UnitTests": ["Parser", "Lexer"],
+            "Lexer.UnitTests": ["Lexer", "Parser"],
+        }
+        document = DiagramViews.build(solution, dependencies, "folder", collapse=True)
+        self.assertEqual(document.nodes, ["lexer", "parser", "src", "tests"])
+        # tests -> lexer следует из tests -> parser -> lexer
+        self.assertEqual(document.edges, [("lexer", "src"), ("parser", "lexer"), ("tests", "parser")])
+        # Подпись ребра — число исходных зависимостей между кластерами
+        self.assertEqual(document.edge_labels, {("tests", "parser"): "2"})
+
+    def test_clusters_keep_projects_without_dependencies(self) -> None:
+        solution = make_solution(("Ast", "src"), ("Parser", "src"), ("Tool", "tools"))
+        dependencies = {"Ast": [], "Parser": ["Ast"], "Tool": []}
+        document = DiagramViews.build(solution, dependencies, "folder")
+        self.assertEqual(document.nodes, ["Ast", "Parser", "Tool"])
+        self.assertEqual(document.clusters, {"src": ["Ast", "Parser"], "tools": ["Tool"]})
+
+    def test_focus_limits_to_neighbourhood(self) -> None:
+        solution = make_solution(("Ast", "src"), ("Lexer", "src"), ("Parser", "src"), ("App", "src"))
+        dependencies = {"Ast": [], "Lexer": ["Ast"], "Parser": ["Lexer"], "App": ["Parser"]}
+        document = DiagramViews.build(solution, dependencies, focus="Lexer", depth=1)
+        self.assertEqual(document.nodes, ["Ast", "Lexer", "Parser"])
+        self.assertEqual(document.edges, [("Lexer", "Ast"), ("Parser", "Lexer")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Тесты экспорта графа (repotools.graph_export): выделение узлов и рёбер в форматах
+без стилей (JSON, GraphML, CSV).
+
+ИСПОЛЬЗОВАНИЕ:
+  python -m pytest scripts/tests
+"""
+
+import io
+import json
+import sys
+import unittest
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from repotools.graph_export import EXPORTERS, GraphDocument  # noqa: E402
+
+GRAPHML = "{http://graphml.graphdrawing.org/xmlns}"
+
+
+def diff_document() -> GraphDocument:
+    """Документ diff ревизий: добавленный проект C, удалённое ребро A -> B"""
+    return GraphDocument(
+        name="compiler",
+        nodes=["A", "B", "C"],
+        edges=[("A", "B"), ("B", "C")],
+        node_styles={"C": "added"},
+        edge_styles={("A", "B"): "removed", ("B", "C"): "added"},
+    )
+
+
+def export(document: GraphDocument, output_format: str) -> str:
+    out = io.StringIO()
+    EXPORTERS[output_format].write(document, out)
+    return out.getvalue()
+
+
+class ChangeAttributeTest(unittest.TestCase):
+    def test_json_nodes_and_links_carry_change(self) -> None:
+        graph = json.loads(export(diff_document(), "json"))
+        self.assertEqual(graph["nodes"], [{"id": "A"}, {"id": "B"}, {"id": "C", "change": "added"}])
+        self.assertEqual(
+            graph["links"],
+            [
+                {"source": "A", "target": "B", "change": "removed"},
+                {"source": "B", "target": "C", "change": "added"},
+            ],
+        )
+
+    def test_graphml_data_keys(self) -> None:
+        root = ET.fromstring(export(diff_document(), "graphml"))
+        keys = {key.get("id"): (key.get("for"), key.get("attr.name")) for key in root.iter(f"{GRAPHML}key")}
+        self.assertEqual(keys["change"], ("node", "change"))
+        self.assertEqual(keys["edge_change"], ("edge", "change"))
+        nodes = {
+            node.get("id"): {data.get("key"): data.text for data in node.iter(f"{GRAPHML}data")}
+            for node in root.iter(f"{GRAPHML}node")
+        }
+        self.assertEqual(nodes["C"], {"label": "C", "change": "added"})
+        self.assertNotIn("change", nodes["A"])
+        edges = {
+            (edge.get("source"), edge.get("target")): [data.text for data in edge.iter(f"{GRAPHML}data")]
+            for edge in root.iter(f"{GRAPHML}edge")
+        }
+        self.assertEqual(edges, {("A", "B"): ["removed"], ("B", "C"): ["added"]})
+
+    def test_csv_change_column_and_cells(self) -> None:
+        rows = export(diff_document(), "csv").splitlines()
+        self.assertEqual(rows, [",A,B,C,change", "A,0,removed,0,", "B,0,0,added,", "C,0,0,0,added"])
+
+    def test_plain_documents_are_unchanged(self) -> None:
+        document = GraphDocument(name="compiler", nodes=["A", "B"], edges=[("A", "B")])
+        self.assertEqual(export(document, "csv").splitlines(), [",A,B", "A,0,1", "B,0,0"])
+        self.assertNotIn("change", export(document, "json"))
+        self.assertNotIn("change", export(document, "graphml"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+"""
+Тесты чтения файлов репозитория (repotools.repo.Repo.read_text): ограничение
+размера, двоичные файлы и переводы строк.
+
+ИСПОЛЬЗОВАНИЕ:
+  python -m pytest scripts/tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from repotools import file_access  # noqa: E402
+from repotools.repo import Repo  # noqa: E402
+
+
+class ReadTextTest(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        self.repo = Repo(self.root)
+
+    def test_line_endings_are_normalized(self) -> None:
+        (self.root / "Program.cs").write_bytes(b"\xef\xbb\xbfclass A\r\n{\r}\n")
+        self.assertEqual(self.repo.read_text("Program.cs", encoding="utf-8-sig"), "class A\n{\n}\n")
+
+    def test_file_over_limit_is_rejected(self) -> None:
+        (self.root / "Big.cs").write_bytes(b"x" * 100)
+        with self.assertRaises(file_access.FileAccessError):
+            self.repo.read_text("Big.cs", limit=99)
+
+    def test_cached_text_respects_smaller_limit(self) -> None:
+        (self.root / "Big.cs").write_bytes(b"x" * 100)
+        self.assertEqual(self.repo.read_text("Big.cs", limit=100), "x" * 100)
+        with self.assertRaises(file_access.FileAccessError):
+            self.repo.read_text("Big.cs", limit=99)
+
+    def test_binary_file_is_rejected(self) -> None:
+        (self.root / "Image.cs").write_bytes(b"MZ\0\0")
+        with self.assertRaises(file_access.FileAccessError):
+            self.repo.read_text("Image.cs")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Тесты поиска похожих решений (repotools.similarity): независимые файлы одного
+устройства, файлы шаблона задания и скопированные с переименованием файлы.
+
+ИСПОЛЬЗОВАНИЕ:
+  python -m pytest scripts/tests
+"""
+
+import re
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from repotools import similarity  # noqa: E402
+from repotools.repo import Repo  # noqa: E402
+
+REPO_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+def source(relative_path: str) -> str:
+    return (REPO_DIR / relative_path).read_text(encoding="utf-8")
+
+
+def disguise(text: str) -> str:
+    """Копия с переименованными идентификаторами и другими числами"""
+    text = re.sub(r"\b([A-Z][a-z]+)([A-Z]\w*)", r"\2\1", text)
+    return re.sub(r"\b\d+\b", lambda match: str(int(match.group()) + 1), text)
+
+
+def make_repo(root: Path, files: dict) -> Path:
+    """Git репозиторий с файлами {путь: содержимое} в индексе"""
+    root.mkdir()
+    for relative_path, text in files.items():
+        path = root / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    subprocess.run(["git", "add", "."], cwd=root, check=True)
+    return root
+
+
+class IndependentFilesTest(unittest.TestCase):
+    def test_repository_split_across_students_has_no_ast_pairs(self) -> None:
+        """Узлы AST одинакового устройства, разложенные по разным репозиториям, — не копии"""
+        students = 4
+        paths = sorted(similarity.source_files(Repo(REPO_DIR)))
+        owners = [index % students for index in range(len(paths))]
+        signed = [similarity.sign_source(str(REPO_DIR / path)) for path in paths]
+        signatures = [signature for signature, _ in similarity.cohort_signatures(owners, signed, students)]
+        ast_pairs = [
+            (paths[left], paths[right])
+            for left in range(len(paths))
+            for right in range(left + 1, len(paths))
+            if owners[left] != owners[right] and signatures[left] and signatures[right]
+            and paths[left].startswith("src/Ast/") and paths[right].startswith("src/Ast/")
+            and similarity.estimate_similarity(signatures[left], signatures[right]) >= similarity.MIN_SIMILARITY
+        ]
+        self.assertEqual(ast_pairs, [])
+
+
+class FindSimilarTest(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        lexer, parser = source("src/Lexer/Lexer.cs"), source("src/Parser/Parser.cs")
+        # Файл шаблона есть у двух студентов из трёх — меньше порога общего каркаса
+        self.template = make_repo(self.root / "template", {"src/Lexer/Lexer.cs": lexer})
+        self.students = [
+            make_repo(self.root / "alice", {
+                "src/Lexer/Lexer.cs": lexer,
+                "src/Parser/Parser.cs": parser,
+                "src/Execution/Context.cs": source("src/Execution/Context.cs"),
+            }),
+            make_repo(self.root / "bob", {
+                "src/Lexer/Lexer.cs": lexer,
+                "src/Syntax/SyntaxReader.cs": disguise(parser),
+                "src/Execution/Builtins.cs": source("src/Execution/Builtins.cs"),
+            }),
+            make_repo(self.root / "carol", {
+                "src/Runtime/Value.cs": source("src/Runtime/Value.cs"),
+                "src/Execution/AstEvaluator.cs": source("src/Execution/AstEvaluator.cs"),
+            }),
+        ]
+
+    def test_template_files_are_dropped(self) -> None:
+        matches = similarity.find_similar(self.students, template=self.template)
+        self.assertEqual([(match.left, match.right) for match in matches], [(str(self.students[0]), str(self.students[1]))])
+        self.assertEqual(
+            [(pair.left, pair.right) for pair in matches[0].files],
+            [("src/Parser/Parser.cs", "src/Syntax/SyntaxReader.cs")],
+        )
+        self.assertGreater(matches[0].files[0].tokens, similarity.MIN_TOKENS)
+
+    def test_template_files_match_without_template(self) -> None:
+        matches = similarity.find_similar(self.students)
+        self.assertEqual(len(matches), 1)
+        self.assertEqual(
+            sorted((pair.left, pair.right) for pair in matches[0].files),
+            [("src/Lexer/Lexer.cs", "src/Lexer/Lexer.cs"), ("src/Parser/Parser.cs", "src/Syntax/SyntaxReader.cs")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Тесты разбора файлов решения (repotools.solution.SolutionParser): папки .slnx,
+ограничение размера и запрет DTD.
+
+ИСПОЛЬЗОВАНИЕ:
+  python -m pytest scripts/tests
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from repotools import file_access  # noqa: E402
+from repotools.solution import SolutionParser  # noqa: E402
+
+SLNX = """<Solution>
+  <Folder Name="/src/">
+    <Project Path="src/Lexer/Lexer.csproj" />
+    <Project Path="src/Ast/Ast.csproj" />
+  </Folder>
+  <Folder Name="/tests/">
+    <Project Path="tests/Lexer.UnitTests/Lexer.UnitTests.csproj" />
+  </Folder>
+  <Project Path="tools/Tool/Tool.csproj" />
+  <Project Path="docs/Docs.shproj" />
+</Solution>
+"""
+
+
+class SolutionParserTest(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        for relative_path in ("src/Lexer/Lexer.csproj", "src/Ast/Ast.csproj",
+                              "tests/Lexer.UnitTests/Lexer.UnitTests.csproj", "tools/Tool/Tool.csproj"):
+            (self.root / relative_path).parent.mkdir(parents=True)
+            (self.root / relative_path).write_text("<Project />\n", encoding="utf-8")
+
+    def write(self, name: str, text: str) -> Path:
+        path = self.root / name
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    def test_slnx_folders(self) -> None:
+        solution = SolutionParser.parse(self.write("compiler.slnx", SLNX))
+        self.assertEqual(sorted(solution.projects), ["Ast", "Lexer", "Lexer.UnitTests", "Tool"])
+        self.assertEqual(solution.folders, {"src": ["Ast", "Lexer"], "tests": ["Lexer.UnitTests"]})
+        self.assertIsNone(solution.projects["Tool"].folder)
+
+    def test_slnx_with_dtd_is_rejected(self) -> None:
+        text = '<!DOCTYPE Solution [<!ENTITY name "Lexer">]>\n' + SLNX
+        with self.assertRaises(file_access.FileAccessError):
+            SolutionParser.parse(self.write("compiler.slnx", text))
+
+    def test_oversized_solution_is_rejected(self) -> None:
+        padding = "# " + "x" * 1022 + "\n"
+        text = padding * (SolutionParser.MAX_SOLUTION_SIZE // len(padding) + 1)
+        with self.assertRaises(file_access.FileAccessError):
+            SolutionParser.parse(self.write("compiler.sln", text))
+
+
+if __name__ == "__main__":
+    unittest.main()